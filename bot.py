@@ -1,15 +1,20 @@
+import asyncio
+from contextlib import asynccontextmanager
 import textwrap
 from typing import Tuple
 
 import discord
 from discord import app_commands
 
+from cache_warmer import CacheWarmer
 from config import load_config
 from db import SqlLiteClient
+from deadlines import deadline
 from domain import (
     CompetitionResults,
     Contract,
     ContractInput,
+    DeadlineExceededException,
     HonorableMention,
     Participant,
     PlayerScore,
@@ -17,8 +22,16 @@ from domain import (
     ValidationException,
     WinReason,
 )
-from lodestone import LodestoneScraper
+from http_cache import HttpCache
+from lodestone import AsyncLodestoneScraper, LodestoneScraper
 import professionals
+from rate_limiting import AdaptiveRateLimiter
+from traffic_archive import TrafficArchive
+
+# Follow-up messages can be sent for 15 minutes after an interaction is created. Work is
+# abandoned a little before that, since its result could no longer reach the user.
+INTERACTION_TOKEN_LIFETIME = 15 * 60
+INTERACTION_DEADLINE_MARGIN = 10
 
 DUPLICATION_EXPLANATION = " *Note: Defaulted to highest rank listed and combined score between two ranks earned*"
 
@@ -26,6 +39,10 @@ PARTICIPANT_STATUS_TEMPLATE = (
     "You are a **{coach_or_player}** named **{first_name} {last_name}**."
 )
 CONTRACT_STATUS_TEMPLATE = "You have a contract to earn {amount} seals this week."
+STANDING_STATUS_TEMPLATE = (
+    "You are currently rank **{rank}** with **{seals:,}** seals this week."
+)
+UNRANKED_STATUS_TEMPLATE = "You are not in the top 500 this week yet."
 
 PARTICIPANT_RESULTS_TEMPLATE = """
 ## ✅ Participants
@@ -55,6 +72,15 @@ CONTRACTS_MESSAGE_TEMPLATE = """
 {}
 """.strip()
 
+UNVERIFIED_RANKS_TEMPLATE = (
+    "-# Note: ranks {} could not be fetched from the Lodestone, so players marked "
+    '"unverified" may have earned seals that are not counted here.'
+)
+
+DEPARTED_PARTICIPANTS_TEMPLATE = (
+    "{} left the Free Company and no longer take part in this week's competition."
+)
+
 CREDITS_TEMPLATE = "\n-# Special thanks to {} for maintaining our Discord bot, {}!"
 
 DRAWING_RESULTS_TEMPLATE = (
@@ -108,10 +134,47 @@ client = discord.Client(application_id=config.discord_application_id, intents=in
 tree = app_commands.CommandTree(client)
 guild: discord.Guild = discord.Object(id=config.discord_guild_id)
 professionals_channel: discord.TextChannel = None
+cache_warmer: CacheWarmer | None = None
+cache_warmer_task: asyncio.Task | None = None
+roster_sync_task: asyncio.Task | None = None
+
+
+def load_traffic_archive() -> TrafficArchive | None:
+    if config.lodestone_archive_mode == "off":
+        return None
+    if config.lodestone_archive_mode not in ("record", "replay"):
+        raise ValueError(
+            f"Unknown archive mode {config.lodestone_archive_mode}, "
+            "expected one of: off, record, replay"
+        )
+    return TrafficArchive(
+        config.lodestone_archive_file,
+        replay=config.lodestone_archive_mode == "replay",
+    )
 
 
 def run_bot():
-    professionals.initialize(SqlLiteClient(), LodestoneScraper(config.lodestone_url))
+    global cache_warmer
+    scraper = LodestoneScraper(
+        config.lodestone_url,
+        max_concurrency=config.lodestone_max_concurrency,
+        parser=config.lodestone_parser,
+        http_cache=HttpCache(config.lodestone_cache_file),
+        rate_limiter=AdaptiveRateLimiter(rate=config.lodestone_requests_per_second),
+        timeout=config.lodestone_timeout,
+        parse_processes=config.lodestone_parse_processes,
+        archive=load_traffic_archive(),
+    )
+    async_scraper = AsyncLodestoneScraper(scraper)
+    professionals.initialize(SqlLiteClient(), async_scraper)
+    if config.cache_warm_interval > 0:
+        cache_warmer = CacheWarmer(
+            async_scraper,
+            config.free_company_id,
+            config.world_name,
+            config.data_center,
+            config.cache_warm_interval,
+        )
     client.run(config.discord_token, root_logger=config.logger)
 
 
@@ -121,14 +184,42 @@ def find_channel(name: str) -> discord.TextChannel | None:
 
 @client.event
 async def on_ready():
-    global professionals_channel, guild
+    global professionals_channel, guild, cache_warmer_task, roster_sync_task
     professionals_channel = find_channel("professionals-signups")
     guild = client.get_guild(config.discord_guild_id)
 
+    # on_ready fires again after reconnects, but only one warmer should ever run.
+    if cache_warmer is not None and cache_warmer_task is None:
+        cache_warmer_task = asyncio.create_task(cache_warmer.run())
+    if config.roster_sync_interval > 0 and roster_sync_task is None:
+        roster_sync_task = asyncio.create_task(sync_roster_periodically())
+
     await tree.sync(guild=guild)
     config.logger.info("The bot has connected to Discord.")
 
 
+async def sync_roster_periodically():
+    # By default this runs on the warmer's cadence, so the roster it reads is usually
+    # already cached.
+    while True:
+        try:
+            diff, dropped = await professionals.sync_roster()
+            if diff.changed:
+                config.logger.info(
+                    f"FC roster changed: {len(diff.joined)} joined, {len(diff.left)} left, "
+                    f"{len(diff.rank_changed)} changed rank, {len(diff.renamed)} renamed"
+                )
+            if dropped and professionals_channel is not None:
+                await professionals_channel.send(
+                    DEPARTED_PARTICIPANTS_TEMPLATE.format(
+                        ", ".join(mention(p.discord_id) for p in dropped)
+                    )
+                )
+        except Exception as e:
+            config.logger.warning(f"Failed to sync the FC roster: {e}")
+        await asyncio.sleep(config.roster_sync_interval)
+
+
 def mention(user_id: int) -> str:
     return f"<@{user_id}>"
 
@@ -154,12 +245,25 @@ def present_validation_errors(ve: professionals.ValidationException) -> str:
     return textwrap.dedent(f"One or more fields were invalid:\n{lines}")
 
 
+@asynccontextmanager
+async def interaction_deadline(interaction: discord.Interaction):
+    age = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+    with deadline(INTERACTION_TOKEN_LIFETIME - INTERACTION_DEADLINE_MARGIN - age) as d:
+        async with asyncio.timeout(d.remaining()):
+            yield
+
+
 async def invoke_with_exception_handling(
     interaction: discord.Interaction, func, *args, **kwargs
 ):
     try:
-        result = await func(*args, **kwargs)
+        async with interaction_deadline(interaction):
+            result = await func(*args, **kwargs)
         return result
+    except (DeadlineExceededException, TimeoutError) as e:
+        # The user can no longer be told anything, so the error is only logged.
+        config.logger.warning(f"Abandoned {func.__name__} past its deadline: {e}")
+        raise e
     except ValidationException as ve:
         await follow_up_to_user(interaction, present_validation_errors(ve))
         raise ve
@@ -294,6 +398,23 @@ async def get_participation_status(interaction: discord.Interaction):
     if contract is not None:
         msg += " " + CONTRACT_STATUS_TEMPLATE.format(amount=contract.amount)
 
+    if participant is not None:
+        try:
+            async with interaction_deadline(interaction):
+                standing = await professionals.get_weekly_standing(participant)
+        except professionals.UserException as e:
+            msg += " " + e.user_message
+        except Exception as e:
+            # The status is still worth sending without the standing.
+            config.logger.warning(f"Failed to look up the weekly standing: {e}")
+        else:
+            if standing is None:
+                msg += " " + UNRANKED_STATUS_TEMPLATE
+            else:
+                msg += " " + STANDING_STATUS_TEMPLATE.format(
+                    rank=standing.rank, seals=standing.seals
+                )
+
     await interaction.followup.send(msg)
 
 
@@ -310,7 +431,9 @@ async def consume_results(interaction: discord.Interaction) -> CompetitionResult
 def format_participant_list(players: list[PlayerScore | HonorableMention]) -> str:
     lines = []
     for p in players:
-        if p.rank == -1 or p.seals_earned == 0:
+        if not getattr(p, "rank_verified", True):
+            line = f"Rank ???: {p.first_name} {p.last_name} - **???** *(unverified)*"
+        elif p.rank == -1 or p.seals_earned == 0:
             line = f"Rank ???: {p.first_name} {p.last_name} - **???**"
         else:
             line = f"Rank {p.rank}: {p.first_name} {p.last_name} - **{p.seals_earned:,}**"
@@ -351,6 +474,11 @@ def format_contracts(contracts: list[Contract]) -> str:
                     f"{cr.first_name} {cr.last_name}: {cr.amount:,} seals"
                     f" -- Payout: {cr.payout:,} gil"
                 )
+            elif cr.is_pending:
+                contract_line = italicize(
+                    f"{cr.first_name} {cr.last_name}: {cr.amount:,} seals"
+                    " -- Pending (rank unverified)"
+                )
             else:
                 contract_line = italicize(
                     f"{cr.first_name} {cr.last_name}: {cr.amount:,} seals"
@@ -370,7 +498,7 @@ def format_results_message(
     coaches_msg = format_coach_msg(coach_scores)
     honorable_mentions_msg = format_honorable_mentions_msg(results.honorable_mentions)
 
-    if results.competition_win_reason == WinReason.NO_ELIGIBLE_PLAYERS:
+    if results.competition_winner is None:
         winner_msg = None
     else:
         winner_msg = WINNER_RESULTS_TEMPLATE.format(
@@ -378,11 +506,17 @@ def format_results_message(
         )
 
     contracts_msg = format_contracts(results.contract_results)
+    if results.unverified_ranks:
+        unverified_msg = UNVERIFIED_RANKS_TEMPLATE.format(
+            ", ".join(f"{r.start}-{r.stop - 1}" for r in results.unverified_ranks)
+        )
+    else:
+        unverified_msg = None
     credits_msg = CREDITS_TEMPLATE.format(
         mention(interaction.user.id), mention(client.user.id)
     )
 
-    if results.drawing_win_reason == WinReason.NO_ELIGIBLE_PLAYERS:
+    if results.drawing_winner is None:
         drawing_msg = None
     else:
         drawing_msg = DRAWING_RESULTS_TEMPLATE.format(
@@ -394,6 +528,7 @@ def format_results_message(
         participant_msg,
         coaches_msg,
         honorable_mentions_msg,
+        unverified_msg,
         winner_msg,
         contracts_msg,
         drawing_msg,
@@ -417,6 +552,17 @@ async def post_competition_results(interaction: discord.Interaction):
     )
 
     msg = format_results_message(interaction, results)
+    if results.unverified_ranks:
+        # Partial results are only shown to the admin; nothing is posted until every
+        # ranking page has been fetched.
+        await follow_up_to_user(interaction, msg)
+        await follow_up_to_user(
+            interaction,
+            "Some Grand Company ranking pages could not be fetched, so these results "
+            "were not posted. Run this command again to retry only those pages.",
+        )
+        return
+
     await professionals_channel.send(msg)
 
 
@@ -429,7 +575,8 @@ async def post_competition_results(interaction: discord.Interaction):
 async def start_competition(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True, thinking=True)
 
-    last_week_seals = await professionals.start_new_competition()
+    async with interaction_deadline(interaction):
+        last_week_seals = await professionals.start_new_competition()
 
     msg = START_COMPETITION_TEMPLATE.format(
         total_points=last_week_seals,
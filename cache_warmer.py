@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import logging
+
+from lodestone import AsyncLodestoneScraper
+
+# The weekly Grand Company rankings roll over with the Tuesday 08:00 UTC weekly reset.
+# The Lodestone takes a few minutes to publish the new rankings after that.
+WEEKLY_RESET_WEEKDAY = 1
+WEEKLY_RESET_HOUR = 8
+RESET_PUBLISH_DELAY = timedelta(minutes=5)
+
+
+def next_weekly_reset(now: datetime) -> datetime:
+    """Returns the first time after now at which the new weekly rankings are published."""
+    reset = now.replace(hour=WEEKLY_RESET_HOUR, minute=0, second=0, microsecond=0)
+    reset += timedelta(days=(WEEKLY_RESET_WEEKDAY - now.weekday()) % 7)
+    reset += RESET_PUBLISH_DELAY
+    if reset <= now:
+        reset += timedelta(weeks=1)
+    return reset
+
+
+class CacheWarmer:
+    """Re-scrapes the results the bot's commands need before anyone asks for them.
+
+    The FC roster, the world's Grand Company ranking pages and the data center's FC
+    rankings are refreshed every interval seconds, and again just after the weekly
+    reset, when admins post results and players check standings. Every refresh
+    revalidates its pages with the Lodestone, so keeping the interval below the
+    scraper's cache TTL and the HTTP cache's max age means those commands always find
+    fresh cached pages and results.
+    """
+
+    def __init__(
+        self,
+        scraper: AsyncLodestoneScraper,
+        free_company_id: str,
+        world_name: str,
+        data_center: str,
+        interval: float,
+        now=lambda: datetime.now(timezone.utc),
+    ):
+        self._scraper = scraper
+        self._targets = [
+            ("get_free_company_members", free_company_id),
+            # The pages the competition results are scored from, also read one by one
+            # for standings.
+            ("get_grand_company_ranking_pages", world_name),
+            ("get_top_100_free_company_rankings", data_center),
+        ]
+        self._interval = interval
+        self._now = now
+
+    async def warm(self, after_reset: bool = False) -> None:
+        if after_reset:
+            # Pages stored just before the reset would otherwise still count as fresh.
+            await self._scraper.expire_http_cache()
+
+        for method, arg in self._targets:
+            try:
+                await self._scraper.refresh(method, arg)
+            except Exception as e:
+                logging.getLogger("ffxivbot").warning(
+                    f"Failed to warm the cache for {method}({arg}): {e}"
+                )
+
+    def next_run(self) -> tuple[float, bool]:
+        """Returns how long to wait before warming next, and if that is for the reset."""
+        now = self._now()
+        until_reset = (next_weekly_reset(now) - now).total_seconds()
+        if until_reset <= self._interval:
+            return until_reset, True
+        return self._interval, False
+
+    async def run(self) -> None:
+        await self.warm()
+        while True:
+            delay, after_reset = self.next_run()
+            await asyncio.sleep(delay)
+            await self.warm(after_reset)
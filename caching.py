@@ -0,0 +1,235 @@
+from concurrent.futures import Future
+from contextvars import copy_context
+import functools
+import logging
+import threading
+import time
+from typing import NamedTuple
+
+from cachetools import Cache, TTLCache
+from cachetools.keys import hashkey
+
+from deadlines import check_deadline, current_deadline, no_deadline
+from domain import DeadlineExceededException
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class _CountingTTLCache(TTLCache):
+    """TTLCache that counts the entries it drops, whether for space or for age."""
+
+    def __init__(self, maxsize, ttl, timer):
+        super().__init__(maxsize=maxsize, ttl=ttl, timer=timer)
+        self.evictions = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+    def expire(self, time=None):
+        # TTLCache.currsize expires entries itself, so the base property is read.
+        size = Cache.currsize.fget(self)
+        expired = super().expire(time)
+        self.evictions += size - Cache.currsize.fget(self)
+        return expired
+
+    def clear(self):
+        # Clearing pops every item, which is invalidation rather than eviction.
+        self.expire()
+        evictions = self.evictions
+        super().clear()
+        self.evictions = evictions
+
+
+class StaleWhileRevalidateCache:
+    """Result cache that keeps serving expired entries while they are refreshed.
+
+    An entry younger than ttl seconds is simply returned. Once it is older, it is
+    still returned immediately, but a background thread reloads it; at most one
+    reload per key runs at a time. Entries older than ttl + max_stale are dropped, so
+    a caller never sees data staler than that and instead waits for a fresh load.
+
+    Loads are single-flight: callers that miss on a key while it is already being
+    loaded wait for that load and share its result or exception. A shared load runs
+    on its own thread without any caller's deadline, and each caller only waits for
+    it until its own deadline passes.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, max_stale: float, timer=time.monotonic):
+        self._entries = _CountingTTLCache(maxsize, ttl + max_stale, timer)
+        self._ttl = ttl
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._loading: dict[object, Future] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, load):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._hits += 1
+            else:
+                self._misses += 1
+                # A caller out of time neither starts a load nor waits for one.
+                check_deadline()
+                loading = self._loading.get(key)
+                is_loader = loading is None
+                if is_loader:
+                    loading = self._loading[key] = Future()
+
+        if entry is not None:
+            value, loaded_at = entry
+            if self._timer() - loaded_at >= self._ttl:
+                self._refresh_in_background(key, load)
+            return value
+
+        if is_loader:
+            threading.Thread(
+                target=copy_context().run,
+                args=(self._load, key, load, loading),
+                name="cache-load",
+                daemon=True,
+            ).start()
+
+        deadline = current_deadline()
+        try:
+            return loading.result(None if deadline is None else deadline.remaining())
+        except TimeoutError as e:
+            raise DeadlineExceededException(
+                "The deadline passed while waiting for a cached result to load"
+            ) from e
+
+    def refresh(self, key, load):
+        """Loads a key again now and caches the result, even if the entry is fresh."""
+        value = load()
+        self._store(key, value)
+        return value
+
+    def invalidate(self, key) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            self._entries.expire()
+            return CacheStats(
+                self._hits, self._misses, self._entries.evictions, len(self._entries)
+            )
+
+    def _load(self, key, load, loading: Future) -> None:
+        try:
+            with no_deadline():
+                value = load()
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            loading.set_exception(e)
+        else:
+            with self._lock:
+                self._entries[key] = (value, self._timer())
+                del self._loading[key]
+            loading.set_result(value)
+
+    def _store(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = (value, self._timer())
+
+    def _refresh_in_background(self, key, load) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        threading.Thread(
+            target=self._refresh, args=(key, load), name="cache-refresh", daemon=True
+        ).start()
+
+    def _refresh(self, key, load) -> None:
+        try:
+            self._store(key, load())
+        except Exception as e:
+            # The stale value keeps being served until the next attempt or max_stale.
+            logging.getLogger("ffxivbot").warning(f"Background cache refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+
+class CacheManager:
+    """Owns the result caches of a scraper, one StaleWhileRevalidateCache per namespace.
+
+    Each namespace has its own size, ttl and max_stale, can be invalidated on its own,
+    and reports its own statistics. Scrapers sharing a manager share their results.
+    """
+
+    def __init__(self, timer=time.monotonic):
+        self._timer = timer
+        self._caches: dict[str, StaleWhileRevalidateCache] = {}
+
+    def register(
+        self, namespace: str, maxsize: int = 100, ttl: float = 300, max_stale: float = 0
+    ) -> None:
+        if namespace in self._caches:
+            raise ValueError(f"Cache namespace {namespace} is already registered")
+        self._caches[namespace] = StaleWhileRevalidateCache(
+            maxsize, ttl, max_stale, self._timer
+        )
+
+    def __getitem__(self, namespace: str) -> StaleWhileRevalidateCache:
+        return self._caches[namespace]
+
+    def __contains__(self, namespace: str) -> bool:
+        return namespace in self._caches
+
+    def invalidate(self, namespace: str, *args, **kwargs) -> None:
+        """Drops the entry for the given arguments, or every entry if there are none."""
+        if args or kwargs:
+            self._caches[namespace].invalidate(hashkey(*args, **kwargs))
+        else:
+            self._caches[namespace].clear()
+
+    def clear(self) -> None:
+        for cache in self._caches.values():
+            cache.clear()
+
+    def stats(self) -> dict[str, CacheStats]:
+        return {namespace: cache.stats() for namespace, cache in self._caches.items()}
+
+
+def cached_method(namespace: str):
+    """Decorator caching a method's results in a namespace of its instance's manager.
+
+    The instance must have a `caches` attribute holding a CacheManager. Keys are built
+    from the arguments after self, so instances sharing a manager share results. Like
+    the cache itself, `refresh(self, *args)` re-runs the method and replaces the
+    cached result.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            return self.caches[namespace].get(
+                hashkey(*args, **kwargs), lambda: method(self, *args, **kwargs)
+            )
+
+        def refresh(self, *args, **kwargs):
+            return self.caches[namespace].refresh(
+                hashkey(*args, **kwargs), lambda: method(self, *args, **kwargs)
+            )
+
+        wrapper.refresh = refresh
+        return wrapper
+
+    return decorator
@@ -0,0 +1,106 @@
+from enum import Enum
+import logging
+import threading
+import time
+from typing import Callable
+
+import requests
+
+from domain import CircuitOpenException
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """Stops sending requests to a Lodestone endpoint that keeps failing.
+
+    After failure_threshold consecutive server errors or timeouts the circuit opens:
+    calls fail immediately with CircuitOpenException instead of each waiting out the
+    outage. While open, a background thread re-sends the last failed request every
+    reset_timeout seconds (the circuit is half-open while that probe is in flight)
+    and closes the circuit as soon as one succeeds.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+        sleep=time.sleep,
+    ):
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def call(self, request: Callable[[], requests.Response]) -> requests.Response:
+        if self._state is not CircuitState.CLOSED:
+            raise CircuitOpenException(
+                f"The Lodestone {self.name} endpoint is unavailable, try again later"
+            )
+
+        try:
+            response = request()
+        except (requests.Timeout, requests.ConnectionError):
+            self._record_failure(request)
+            raise
+
+        if response.status_code >= 500:
+            self._record_failure(request)
+        else:
+            with self._lock:
+                self._failures = 0
+        return response
+
+    def _record_failure(self, request) -> None:
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state is not CircuitState.CLOSED
+                or self._failures < self._failure_threshold
+            ):
+                return
+            self._state = CircuitState.OPEN
+
+        logging.getLogger("ffxivbot").warning(
+            f"Circuit for the Lodestone {self.name} endpoint opened after "
+            f"{self._failures} consecutive failures"
+        )
+        threading.Thread(
+            target=self._probe,
+            args=(request,),
+            name=f"circuit-probe-{self.name}",
+            daemon=True,
+        ).start()
+
+    def _probe(self, request) -> None:
+        while True:
+            self._sleep(self._reset_timeout)
+            self._state = CircuitState.HALF_OPEN
+            try:
+                response = request()
+                response.close()
+                recovered = response.status_code < 500
+            except requests.RequestException:
+                recovered = False
+
+            if recovered:
+                with self._lock:
+                    self._failures = 0
+                    self._state = CircuitState.CLOSED
+                logging.getLogger("ffxivbot").info(
+                    f"Circuit for the Lodestone {self.name} endpoint closed"
+                )
+                return
+            self._state = CircuitState.OPEN
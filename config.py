@@ -23,6 +23,16 @@ def load_config() -> Config:
     free_company_id = os.getenv("FREE_COMPANY_ID", "")
     world_name = os.getenv("WORLD_NAME", "Siren")
     data_center = os.getenv("DATA_CENTER", "Aether")
+    lodestone_max_concurrency = int(os.getenv("LODESTONE_MAX_CONCURRENCY", "5"))
+    lodestone_parser = os.getenv("LODESTONE_PARSER", "lxml")
+    lodestone_cache_file = os.getenv("LODESTONE_CACHE_FILE", "lodestone_cache.db")
+    lodestone_requests_per_second = float(os.getenv("LODESTONE_REQUESTS_PER_SECOND", "5"))
+    lodestone_timeout = float(os.getenv("LODESTONE_TIMEOUT", "10"))
+    lodestone_parse_processes = int(os.getenv("LODESTONE_PARSE_PROCESSES", "0"))
+    lodestone_archive_file = os.getenv("LODESTONE_ARCHIVE_FILE", "lodestone_archive.db")
+    lodestone_archive_mode = os.getenv("LODESTONE_ARCHIVE_MODE", "off")
+    cache_warm_interval = float(os.getenv("CACHE_WARM_INTERVAL", "240"))
+    roster_sync_interval = float(os.getenv("ROSTER_SYNC_INTERVAL", "240"))
 
     # Create a logger that emits WARNING+ to stderr
     logger = logging.getLogger("ffxivbot")
@@ -42,6 +52,16 @@ def load_config() -> Config:
         free_company_id=free_company_id,
         data_center=data_center,
         world_name=world_name,
+        lodestone_max_concurrency=lodestone_max_concurrency,
+        lodestone_parser=lodestone_parser,
+        lodestone_cache_file=lodestone_cache_file,
+        lodestone_requests_per_second=lodestone_requests_per_second,
+        lodestone_timeout=lodestone_timeout,
+        lodestone_parse_processes=lodestone_parse_processes,
+        lodestone_archive_file=lodestone_archive_file,
+        lodestone_archive_mode=lodestone_archive_mode,
+        cache_warm_interval=cache_warm_interval,
+        roster_sync_interval=roster_sync_interval,
         logger=logger,
     )
     return _config
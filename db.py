@@ -1,6 +1,14 @@
 import sqlite3
 
-from domain import Contract, Participant
+from deadlines import deadline_expired
+from domain import (
+    Contract,
+    FCMember,
+    Participant,
+    RosterChange,
+    RosterChangeKind,
+    RosterDiff,
+)
 
 DB_FILE = "data.db"
 SCHEMA = """
@@ -17,12 +25,32 @@ CREATE TABLE IF NOT EXISTS contracts (
     amount INTEGER NOT NULL,
     PRIMARY KEY (discord_id)
 );
+
+CREATE TABLE IF NOT EXISTS fc_members (
+    fc_id TEXT NOT NULL,
+    ffxiv_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    rank TEXT NOT NULL,
+    PRIMARY KEY (fc_id, ffxiv_id)
+);
+
+CREATE TABLE IF NOT EXISTS fc_roster_changes (
+    fc_id TEXT NOT NULL,
+    ffxiv_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    previous_rank TEXT,
+    rank TEXT,
+    changed_at REAL NOT NULL
+);
 """
 
 
 class SqlLiteClient:
     def __init__(self, source: str = DB_FILE):
         self.connection = sqlite3.connect(source)
+        # Aborts statements still running once the caller's deadline has passed.
+        self.connection.set_progress_handler(deadline_expired, 1000)
         self.cursor = self.connection.cursor()
         self.cursor.executescript(SCHEMA)
         self.connection.commit()
@@ -134,3 +162,94 @@ class SqlLiteClient:
             """
         )
         self.connection.commit()
+
+    def get_fc_roster(self, fc_id: str) -> list[FCMember]:
+        self.cursor.execute(
+            """
+            SELECT ffxiv_id, name, rank
+            FROM fc_members
+            WHERE fc_id = ?
+            """,
+            (fc_id,),
+        )
+        rows = self.cursor.fetchall()
+        return [FCMember(*row) for row in rows]
+
+    def apply_roster_diff(self, fc_id: str, diff: RosterDiff, changed_at: float) -> None:
+        """Updates the stored roster by the diff alone and logs each change,
+        atomically."""
+        changes = (
+            [
+                (m.ffxiv_id, m.name, RosterChangeKind.JOINED, None, m.rank)
+                for m in diff.joined
+            ]
+            + [
+                (m.ffxiv_id, m.name, RosterChangeKind.LEFT, m.rank, None)
+                for m in diff.left
+            ]
+            + [
+                (
+                    c.member.ffxiv_id,
+                    c.member.name,
+                    RosterChangeKind.RANK_CHANGED,
+                    c.previous_rank,
+                    c.member.rank,
+                )
+                for c in diff.rank_changed
+            ]
+            + [
+                (
+                    c.member.ffxiv_id,
+                    c.member.name,
+                    RosterChangeKind.RENAMED,
+                    c.member.rank,
+                    c.member.rank,
+                )
+                for c in diff.renamed
+            ]
+        )
+        # A member both promoted and renamed is listed twice, and written the same way
+        # both times.
+        updated = [c.member for c in diff.rank_changed + diff.renamed]
+        with self.connection:
+            self.cursor.executemany(
+                """
+                INSERT OR REPLACE INTO fc_members (fc_id, ffxiv_id, name, rank)
+                VALUES (?, ?, ?, ?)
+                """,
+                [(fc_id, m.ffxiv_id, m.name, m.rank) for m in diff.joined + updated],
+            )
+            self.cursor.executemany(
+                """
+                DELETE FROM fc_members
+                WHERE fc_id = ? AND ffxiv_id = ?
+                """,
+                [(fc_id, m.ffxiv_id) for m in diff.left],
+            )
+            self.cursor.executemany(
+                """
+                INSERT INTO fc_roster_changes
+                    (fc_id, ffxiv_id, name, kind, previous_rank, rank, changed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (fc_id, ffxiv_id, name, kind.name, previous_rank, rank, changed_at)
+                    for ffxiv_id, name, kind, previous_rank, rank in changes
+                ],
+            )
+
+    def get_roster_changes(self, fc_id: str, since: float = 0) -> list[RosterChange]:
+        self.cursor.execute(
+            """
+            SELECT ffxiv_id, name, kind, previous_rank, rank, changed_at
+            FROM fc_roster_changes
+            WHERE fc_id = ? AND changed_at >= ?
+            ORDER BY rowid
+            """,
+            (fc_id, since),
+        )
+        rows = self.cursor.fetchall()
+        return [
+            RosterChange(ffxiv_id, name, RosterChangeKind[kind], previous_rank, rank, at)
+            for ffxiv_id, name, kind, previous_rank, rank, at in rows
+        ]
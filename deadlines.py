@@ -0,0 +1,81 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+from typing import Iterator
+
+from domain import DeadlineExceededException
+
+_current_deadline: ContextVar["Deadline | None"] = ContextVar(
+    "current_deadline", default=None
+)
+
+
+class Deadline:
+    """Point in time after which nobody is waiting for the result of some work."""
+
+    def __init__(self, expires_at: float, timer=time.monotonic):
+        self.expires_at = expires_at
+        self._timer = timer
+
+    @classmethod
+    def after(cls, seconds: float, timer=time.monotonic) -> "Deadline":
+        return cls(timer() + seconds, timer)
+
+    def remaining(self) -> float:
+        return max(self.expires_at - self._timer(), 0.0)
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[Deadline]:
+    """Runs the enclosed code, and anything it calls, under a deadline.
+
+    The deadline lives in a context variable, so it follows the code onto tasks and
+    asyncio.to_thread workers. A nested deadline can only shorten the outer one.
+    """
+    new_deadline = Deadline.after(seconds)
+    outer = _current_deadline.get()
+    if outer is not None and outer.expires_at < new_deadline.expires_at:
+        new_deadline = outer
+
+    token = _current_deadline.set(new_deadline)
+    try:
+        yield new_deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+@contextmanager
+def no_deadline() -> Iterator[None]:
+    """Runs the enclosed code without a deadline, for work that several callers share."""
+    token = _current_deadline.set(None)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Deadline | None:
+    return _current_deadline.get()
+
+
+def deadline_expired() -> bool:
+    current = _current_deadline.get()
+    return current is not None and current.expired()
+
+
+def check_deadline() -> None:
+    if deadline_expired():
+        raise DeadlineExceededException("The deadline for this request has passed")
+
+
+def remaining_time(limit: float) -> float:
+    """Returns how long the next step may take: limit, or less if the deadline is near.
+
+    Raises DeadlineExceededException when no time is left at all.
+    """
+    check_deadline()
+    current = _current_deadline.get()
+    return limit if current is None else min(limit, current.remaining())
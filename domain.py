@@ -1,6 +1,6 @@
 from enum import Enum
 from logging import Logger
-from typing import NamedTuple
+from typing import Iterable, NamedTuple
 
 
 class Config(NamedTuple):
@@ -11,6 +11,16 @@ class Config(NamedTuple):
     free_company_id: str
     data_center: str
     world_name: str
+    lodestone_max_concurrency: int
+    lodestone_parser: str
+    lodestone_cache_file: str
+    lodestone_requests_per_second: float
+    lodestone_timeout: float
+    lodestone_parse_processes: int
+    lodestone_archive_file: str
+    lodestone_archive_mode: str
+    cache_warm_interval: float
+    roster_sync_interval: float
     logger: Logger
 
 
@@ -34,12 +44,100 @@ class UserException(Exception):
         self.user_message = user_message
 
 
+class LodestoneScraperException(Exception):
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class LodestoneUnavailableException(LodestoneScraperException):
+    """Raised for failures that may go away on a retry: rate limiting, timeouts,
+    connection errors and server errors."""
+
+
+class CircuitOpenException(LodestoneUnavailableException):
+    """Raised without contacting the Lodestone while an endpoint's circuit is open."""
+
+
+class DeadlineExceededException(Exception):
+    """Raised when work continues past the point where its caller stopped waiting."""
+
+
 class FCMember(NamedTuple):
     ffxiv_id: str
     name: str
     rank: str
 
 
+class RankChange(NamedTuple):
+    member: FCMember
+    previous_rank: str
+
+
+class NameChange(NamedTuple):
+    member: FCMember
+    previous_name: str
+
+
+class RosterDiff(NamedTuple):
+    """How an FC roster changed between two snapshots."""
+
+    joined: list[FCMember]
+    left: list[FCMember]
+    rank_changed: list[RankChange]
+    renamed: list[NameChange] = []
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.joined or self.left or self.rank_changed or self.renamed)
+
+    @classmethod
+    def between(
+        cls, previous: Iterable[FCMember], current: Iterable[FCMember]
+    ) -> "RosterDiff":
+        """Compares two rosters by character ID, in time linear in their size."""
+        previous_by_id = {member.ffxiv_id: member for member in previous}
+        current_by_id = {member.ffxiv_id: member for member in current}
+        joined = [m for id, m in current_by_id.items() if id not in previous_by_id]
+        left = [m for id, m in previous_by_id.items() if id not in current_by_id]
+        rank_changed = [
+            RankChange(member, previous_by_id[id].rank)
+            for id, member in current_by_id.items()
+            if id in previous_by_id and previous_by_id[id].rank != member.rank
+        ]
+        renamed = [
+            NameChange(member, previous_by_id[id].name)
+            for id, member in current_by_id.items()
+            if id in previous_by_id and previous_by_id[id].name != member.name
+        ]
+        return cls(joined, left, rank_changed, renamed)
+
+
+class RosterChangeKind(Enum):
+    JOINED = 1
+    LEFT = 2
+    RANK_CHANGED = 3
+    # Logged under the new name; the previous entry for the character has the old one.
+    RENAMED = 4
+
+
+class RosterChange(NamedTuple):
+    ffxiv_id: str
+    name: str
+    kind: RosterChangeKind
+    previous_rank: str | None
+    rank: str | None
+    changed_at: float
+
+
+class CharacterProfile(NamedTuple):
+    ffxiv_id: str
+    name: str
+    world: str
+    data_center: str
+    free_company_id: str | None
+
+
 class GrandCompanyRanking(NamedTuple):
     character_id: str
     character_name: str
@@ -47,6 +145,34 @@ class GrandCompanyRanking(NamedTuple):
     seals: int
 
 
+GC_RANKINGS_PER_PAGE = 100
+TOP_FREE_COMPANY_RANKINGS = 100
+
+
+class GrandCompanyRankingPages(NamedTuple):
+    """Grand Company rankings from whichever ranking pages could be fetched."""
+
+    rankings: list[GrandCompanyRanking]
+    missing_pages: list[int]
+
+    @property
+    def complete(self) -> bool:
+        return len(self.missing_pages) == 0
+
+    def missing_ranks(self) -> list[range]:
+        return [
+            range((page - 1) * GC_RANKINGS_PER_PAGE + 1, page * GC_RANKINGS_PER_PAGE + 1)
+            for page in self.missing_pages
+        ]
+
+    def merge(self, retried: "GrandCompanyRankingPages") -> "GrandCompanyRankingPages":
+        """Adds the pages of a retry of this result's missing pages."""
+        return GrandCompanyRankingPages(
+            rankings=sorted(self.rankings + retried.rankings, key=lambda r: r.rank),
+            missing_pages=retried.missing_pages,
+        )
+
+
 class FreeCompanyRanking(NamedTuple):
     ffxiv_id: str
     name: str
@@ -86,6 +212,8 @@ class PlayerScore(NamedTuple):
     rank: int
     seals_earned: int
     is_coach: bool = False
+    # False when the player was not found but may be ranked on a page that failed.
+    rank_verified: bool = True
 
 
 class WinReason(Enum):
@@ -93,6 +221,8 @@ class WinReason(Enum):
     TIE_BREAKER = 2
     NO_ELIGIBLE_PLAYERS = 3
     RANDOM_DRAWING = 4
+    # Not decided yet, since some players' ranks could not be verified.
+    RANKINGS_INCOMPLETE = 5
 
 
 class ContractResult(NamedTuple):
@@ -102,6 +232,9 @@ class ContractResult(NamedTuple):
     amount: int
     is_completed: bool
     payout: int
+    # True when the player's rank could not be verified, so the contract is not
+    # evaluated yet.
+    is_pending: bool = False
 
 
 class HonorableMention(NamedTuple):
@@ -119,3 +252,4 @@ class CompetitionResults(NamedTuple):
     drawing_win_reason: WinReason
     contract_results: list[ContractResult]
     honorable_mentions: list[HonorableMention]
+    unverified_ranks: list[range] = []
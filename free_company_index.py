@@ -0,0 +1,49 @@
+from bisect import bisect_left
+from typing import Iterable
+
+from domain import FreeCompany
+
+# Discord shows at most this many autocomplete choices.
+MAX_COMPLETIONS = 25
+
+
+class FreeCompanyIndex:
+    """Every FC of a world, indexed by name for exact and prefix lookups.
+
+    Names are kept casefolded in a sorted list, so a lookup is a binary search instead
+    of a scan, and a prefix match is the contiguous run of names after the search
+    position. The index is immutable; a refresh builds a new one.
+    """
+
+    def __init__(self, free_companies: Iterable[FreeCompany]):
+        self.free_companies = list(free_companies)
+        entries = sorted(
+            (free_company.name.casefold(), free_company)
+            for free_company in self.free_companies
+        )
+        self._names = [name for name, _ in entries]
+        self._sorted = [free_company for _, free_company in entries]
+
+    def __len__(self) -> int:
+        return len(self.free_companies)
+
+    def lookup(self, name: str) -> list[FreeCompany]:
+        """Returns the FCs with exactly this name, ignoring case."""
+        name = name.casefold()
+        matches = []
+        for i in range(bisect_left(self._names, name), len(self._names)):
+            if self._names[i] != name:
+                break
+            matches.append(self._sorted[i])
+        return matches
+
+    def complete(self, prefix: str, limit: int = MAX_COMPLETIONS) -> list[FreeCompany]:
+        """Returns up to limit FCs whose names start with prefix, ignoring case, in
+        name order."""
+        prefix = prefix.casefold()
+        matches = []
+        for i in range(bisect_left(self._names, prefix), len(self._names)):
+            if len(matches) >= limit or not self._names[i].startswith(prefix):
+                break
+            matches.append(self._sorted[i])
+        return matches
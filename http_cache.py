@@ -0,0 +1,157 @@
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHE_DB_FILE = "lodestone_cache.db"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_responses (
+    url TEXT NOT NULL,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    date TEXT,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (url)
+);
+"""
+
+
+class CachedResponse(NamedTuple):
+    url: str
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    date: str | None
+    fetched_at: float
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self) -> requests.Response:
+        response = requests.Response()
+        response.url = self.url
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(
+            {
+                name: value
+                for name, value in [
+                    ("ETag", self.etag),
+                    ("Last-Modified", self.last_modified),
+                    ("Date", self.date),
+                ]
+                if value is not None
+            }
+        )
+        response._content = self.body
+        response._content_consumed = True
+        return response
+
+
+class HttpCache:
+    """Persistent store of Lodestone response bodies and their validators.
+
+    Bodies younger than max_age seconds are served without touching the network;
+    older ones are revalidated with a conditional GET, so an unchanged page costs a
+    304 instead of a full download. Because the store lives on disk, a freshly
+    restarted bot starts with a warm cache.
+    """
+
+    def __init__(
+        self, source: str = CACHE_DB_FILE, max_age: float = 300, timer=time.time
+    ):
+        self.connection = sqlite3.connect(source, check_same_thread=False)
+        self.cursor = self.connection.cursor()
+        self.cursor.executescript(SCHEMA)
+        self.connection.commit()
+        self._max_age = max_age
+        self._timer = timer
+        self._lock = threading.Lock()
+
+    def is_fresh(self, cached: CachedResponse) -> bool:
+        return self._timer() - cached.fetched_at < self._max_age
+
+    def get(self, url: str) -> CachedResponse | None:
+        with self._lock:
+            self.cursor.execute(
+                """
+                SELECT url, body, etag, last_modified, date, fetched_at
+                FROM http_responses
+                WHERE url = ?
+                """,
+                (url,),
+            )
+            row = self.cursor.fetchone()
+        return CachedResponse(*row) if row else None
+
+    def put(self, url: str, body: bytes, headers) -> None:
+        with self._lock:
+            self.cursor.execute(
+                """
+                INSERT OR REPLACE INTO http_responses
+                    (url, body, etag, last_modified, date, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    url,
+                    body,
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    headers.get("Date"),
+                    self._timer(),
+                ),
+            )
+            self.connection.commit()
+
+    def revalidated(self, url: str, headers) -> None:
+        """Records that the server confirmed the stored body is still current."""
+        with self._lock:
+            self.cursor.execute(
+                """
+                UPDATE http_responses
+                SET etag = COALESCE(?, etag),
+                    last_modified = COALESCE(?, last_modified),
+                    date = COALESCE(?, date),
+                    fetched_at = ?
+                WHERE url = ?
+                """,
+                (
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    headers.get("Date"),
+                    self._timer(),
+                    url,
+                ),
+            )
+            self.connection.commit()
+
+    def expire(self, url_prefix: str = "") -> None:
+        """Makes every stored body whose URL starts with url_prefix stale, so each one is
+        revalidated before reuse."""
+        with self._lock:
+            self.cursor.execute(
+                """
+                UPDATE http_responses
+                SET fetched_at = 0
+                WHERE substr(url, 1, ?) = ?
+                """,
+                (len(url_prefix), url_prefix),
+            )
+            self.connection.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.cursor.execute(
+                """
+                DELETE FROM http_responses
+                """
+            )
+            self.connection.commit()
@@ -1,40 +1,318 @@
-import re
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextvars import ContextVar, copy_context
+import logging
+import time
+from typing import AsyncIterator, Callable, Generator, Iterable, Iterator
 
-from bs4 import BeautifulSoup
-from cachetools import TTLCache, cached
 import requests
+from requests.adapters import HTTPAdapter
+
+from caching import CacheManager, CacheStats, cached_method
+from circuit_breaker import CircuitBreaker, CircuitState
+from deadlines import deadline_expired, remaining_time
+from domain import (
+    GC_RANKINGS_PER_PAGE,
+    TOP_FREE_COMPANY_RANKINGS,
+    CharacterProfile,
+    CircuitOpenException,
+    DeadlineExceededException,
+    FCMember,
+    FreeCompany,
+    FreeCompanyRanking,
+    GrandCompanyRanking,
+    GrandCompanyRankingPages,
+    LodestoneScraperException,
+    LodestoneUnavailableException,
+)
+from free_company_index import MAX_COMPLETIONS, FreeCompanyIndex
+from http_cache import HttpCache
+from parsing import (
+    FreeCompaniesPage,
+    MemoizedPageParser,
+    MemoStats,
+    ProcessPoolPageParser,
+    get_page_parser,
+)
+from rate_limiting import AdaptiveRateLimiter
+from traffic_archive import TrafficArchive
+
+_GC_RANKING_PAGES = 5
+_STREAM_CHUNK_SIZE = 16 * 1024
+
+# Results are fresh for five minutes and refreshed in the background after that. Rosters
+# and the FC directory barely change, so a stale copy may be served for up to an hour;
+# rankings feed competition results and are only allowed to lag by a few minutes.
+_RESULT_TTL = 300
+_ROSTER_MAX_STALE = 3600
+_RANKINGS_MAX_STALE = 300
+
+# Endpoints get separate circuit breakers, since one can fail while the others work.
+_MEMBERS_ENDPOINT = "members"
+_GC_RANKINGS_ENDPOINT = "gc-rankings"
+_FC_SEARCH_ENDPOINT = "fc-search"
+_FC_RANKINGS_ENDPOINT = "fc-rankings"
+_FC_PAGE_ENDPOINT = "fc-page"
+_CHARACTER_ENDPOINT = "character"
+
+# Results are cached per endpoint, under the same names, with these sizes and
+# max_stale values. Character profiles are looked up in batches of a whole roster or
+# ranking, so that cache holds far more entries.
+_RESULT_CACHES = {
+    _MEMBERS_ENDPOINT: (100, _ROSTER_MAX_STALE),
+    _GC_RANKINGS_ENDPOINT: (100, _RANKINGS_MAX_STALE),
+    _FC_SEARCH_ENDPOINT: (100, _ROSTER_MAX_STALE),
+    _FC_RANKINGS_ENDPOINT: (100, _RANKINGS_MAX_STALE),
+    _FC_PAGE_ENDPOINT: (100, _RANKINGS_MAX_STALE),
+    _CHARACTER_ENDPOINT: (2000, _ROSTER_MAX_STALE),
+}
+
+
+# Set while refreshing, so that pages the HTTP cache still holds as fresh are
+# revalidated with the Lodestone instead of being served as they are.
+_revalidating: ContextVar[bool] = ContextVar("revalidating", default=False)
 
-from domain import FCMember, FreeCompany, FreeCompanyRanking, GrandCompanyRanking
 
-_page_number_regex = re.compile("Page \d of (\d)")
-_character_link_regex = re.compile("/lodestone/character/(.+)/")
-_fc_link_regex = re.compile("/lodestone/freecompany/(.+)/")
+class LodestoneScraper:
+    def __init__(
+        self,
+        base_url: str,
+        pool_size: int = 10,
+        max_concurrency: int = 5,
+        parser: str = "lxml",
+        http_cache: HttpCache | None = None,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        timeout: float = 10,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+        parsed_page_memo_size: int = 256,
+        parse_processes: int = 0,
+        caches: CacheManager | None = None,
+        archive: TrafficArchive | None = None,
+    ):
+        self._base_url = base_url
+        # Scrapers given the same manager share their results; the first one to use it
+        # sets up the namespaces.
+        self.caches = caches if caches is not None else CacheManager()
+        for namespace, (maxsize, max_stale) in _RESULT_CACHES.items():
+            if namespace not in self.caches:
+                self.caches.register(namespace, maxsize, _RESULT_TTL, max_stale)
+        # With parse_processes set, complete pages are parsed in worker processes so
+        # that parsing does not hold the GIL while the bot needs it.
+        self._process_parser = (
+            ProcessPoolPageParser(parser, parse_processes)
+            if parse_processes > 0
+            else None
+        )
+        self._parser = MemoizedPageParser(
+            self._process_parser or get_page_parser(parser), parsed_page_memo_size
+        )
+        self._http_cache = http_cache
+        self._archive = archive
+        self._rate_limiter = rate_limiter
+        self._timeout = timeout
+        self._breakers = {
+            endpoint: CircuitBreaker(endpoint, failure_threshold, reset_timeout)
+            for endpoint in [
+                _MEMBERS_ENDPOINT,
+                _GC_RANKINGS_ENDPOINT,
+                _FC_SEARCH_ENDPOINT,
+                _FC_RANKINGS_ENDPOINT,
+                _FC_PAGE_ENDPOINT,
+                _CHARACTER_ENDPOINT,
+            ]
+        }
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="lodestone"
+        )
+        # Batch calls wait on page fetches from the executor above, so they run on
+        # their own threads to avoid taking up the workers they are waiting for.
+        self._batch_executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="lodestone-batch"
+        )
 
+        # A single long-lived session keeps connections to the Lodestone alive between
+        # pages instead of paying for a new TCP/TLS handshake on every request.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def close(self):
+        self._batch_executor.shutdown(wait=False, cancel_futures=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._process_parser is not None:
+            self._process_parser.close()
+        self._session.close()
+
+    def circuit_states(self) -> dict[str, CircuitState]:
+        return {endpoint: breaker.state for endpoint, breaker in self._breakers.items()}
+
+    def parsed_page_stats(self) -> MemoStats:
+        return self._parser.stats()
+
+    def cache_stats(self) -> dict[str, CacheStats]:
+        return self.caches.stats()
+
+    def invalidate_rankings(self) -> None:
+        """Drops the cached GC and FC rankings, so the next lookups scrape them again."""
+        self.caches.invalidate(_GC_RANKINGS_ENDPOINT)
+        self.caches.invalidate(_FC_RANKINGS_ENDPOINT)
+        self.caches.invalidate(_FC_PAGE_ENDPOINT)
+        if self._http_cache is not None:
+            # The FC page prefix also covers the member pages, which only costs them a
+            # revalidation.
+            for path in [
+                "/lodestone/ranking/gc/weekly",
+                "/lodestone/ranking/fc/weekly",
+                "/lodestone/freecompany/",
+            ]:
+                self._http_cache.expire(self._base_url + path)
+
+    def refresh(self, method: str, *args):
+        """Runs one of the get_* methods again, revalidating every page it reads with
+        the Lodestone, and replaces its cached result if it has one."""
+        fn = getattr(LodestoneScraper, method)
+        token = _revalidating.set(True)
+        try:
+            if hasattr(fn, "refresh"):
+                return fn.refresh(self, *args)
+            return fn(self, *args)
+        finally:
+            _revalidating.reset(token)
+
+    def expire_http_cache(self) -> None:
+        """Makes the next request for every page revalidate with the Lodestone."""
+        if self._http_cache is not None:
+            self._http_cache.expire()
+
+    # Worker threads do not inherit context variables, so these carry the caller's
+    # context, and with it any deadline, over to the executor explicitly.
+    def _submit(self, fn: Callable, *args) -> Future:
+        return self._executor.submit(copy_context().run, fn, *args)
+
+    def _submit_each(self, fn: Callable, targets: Iterable[str]) -> dict[str, Future]:
+        return {
+            target: self._batch_executor.submit(copy_context().run, fn, target)
+            for target in dict.fromkeys(targets)
+        }
+
+    def _for_each(self, fn: Callable, targets: Iterable[str]) -> dict:
+        results = self._submit_each(fn, targets)
+        # Every target finishes before the first failure, in target order, is raised,
+        # so no scrape is left running after its batch has already failed.
+        wait(results.values())
+        return {target: result.result() for target, result in results.items()}
+
+    def _map(self, fn: Callable, items: Iterable) -> Iterator:
+        contexts_and_items = [(copy_context(), item) for item in items]
+        return self._executor.map(
+            lambda context_and_item: context_and_item[0].run(fn, context_and_item[1]),
+            contexts_and_items,
+        )
 
-class LodestoneScraperException(Exception):
-    def __init__(self, message: str, status_code: int = None):
-        super().__init__(message)
-        self.status_code = status_code
+    def _send(
+        self, endpoint: str, url: str, stream: bool, headers: dict = None
+    ) -> requests.Response:
+        def request():
+            # Each attempt only gets the time left before the caller's deadline.
+            try:
+                return self._session.get(
+                    url,
+                    stream=stream,
+                    headers=headers,
+                    timeout=remaining_time(self._timeout),
+                )
+            except requests.Timeout as e:
+                if deadline_expired():
+                    raise DeadlineExceededException(
+                        "The deadline passed while waiting for the Lodestone"
+                    ) from e
+                raise
+
+        def limited_request():
+            if self._rate_limiter is None:
+                return request()
+            return self._rate_limiter.send(request)
+
+        try:
+            return self._breakers[endpoint].call(limited_request)
+        except requests.Timeout as e:
+            raise LodestoneUnavailableException(
+                "The Lodestone did not respond in time"
+            ) from e
+        except requests.ConnectionError as e:
+            raise LodestoneUnavailableException(
+                "Unable to connect to the Lodestone"
+            ) from e
+
+    def _get(self, endpoint: str, url: str, stream: bool = False) -> requests.Response:
+        if self._archive is None:
+            return self._fetch(endpoint, url, stream)
+        if self._archive.replay:
+            return self._archive.replay_response(url)
+
+        start = time.perf_counter()
+        response = self._fetch(endpoint, url, stream)
+        self._archive.record(url, response, time.perf_counter() - start)
+        return response
 
+    def _fetch(self, endpoint: str, url: str, stream: bool) -> requests.Response:
+        if self._http_cache is None:
+            return self._send(endpoint, url, stream)
+
+        cached = self._http_cache.get(url)
+        if (
+            cached is not None
+            and self._http_cache.is_fresh(cached)
+            and not _revalidating.get()
+        ):
+            return cached.to_response()
+
+        headers = {} if cached is None else cached.conditional_headers()
+        try:
+            response = self._send(endpoint, url, stream, headers)
+        except CircuitOpenException:
+            # While the Lodestone is down the last good copy beats no answer at all.
+            if cached is None:
+                raise
+            return cached.to_response()
+
+        if response.status_code == 304 and cached is not None:
+            response.close()
+            self._http_cache.revalidated(url, response.headers)
+            return cached.to_response()
+
+        # Streamed bodies are not stored, since that would mean holding them in memory.
+        if response.status_code == 200 and not stream:
+            self._http_cache.put(url, response.content, response.headers)
 
-class LodestoneScraper:
-    def __init__(self, base_url: str):
-        self._base_url = base_url
+        return response
 
-    def _get_fc_members_page(self, fc_id: str, page_num: int = None):
+    def _stream_rows(self, response: requests.Response, iter_page) -> Generator:
+        """Feeds a streamed response body to a page parser generator chunk by chunk."""
+        try:
+            chunks = response.iter_content(chunk_size=_STREAM_CHUNK_SIZE)
+            return (yield from iter_page(chunks))
+        finally:
+            response.close()
+
+    def _get_fc_members_page(
+        self, fc_id: str, page_num: int = None, stream: bool = False
+    ):
         if page_num is None:
             url = f"{self._base_url}/lodestone/freecompany/{fc_id}/member"
         else:
             url = f"{self._base_url}/lodestone/freecompany/{fc_id}/member?page={page_num}"
 
-        response = requests.get(url)
+        response = self._get(_MEMBERS_ENDPOINT, url, stream=stream)
 
         if response.status_code == 404:
             raise LodestoneScraperException(
                 f"Free Company {fc_id} could not be found", response.status_code
             )
         elif response.status_code == 429:
-            raise LodestoneScraperException(
+            raise LodestoneUnavailableException(
                 f"Unable to fetch Free Company members due to Lodestone rate limiting"
             )
         elif response.status_code >= 400 and response.status_code < 500:
@@ -43,7 +321,7 @@ class LodestoneScraper:
                 response.status_code,
             )
         elif response.status_code >= 500:
-            raise LodestoneScraperException(
+            raise LodestoneUnavailableException(
                 "The Lodestone appears to be down", response.status_code
             )
         elif response.status_code != 200:
@@ -54,117 +332,217 @@ class LodestoneScraper:
 
         return response
 
-    def _scrape_members_from_page(self, page: BeautifulSoup):
-        fc_members = []
-
-        member_list_items_tags = page.find_all("li", class_="entry")
-        for member_tag in member_list_items_tags:
-            character_link_tag = member_tag.find("a", class_="entry__bg")
-            character_link = character_link_tag["href"]
-            lodestone_id_match = _character_link_regex.fullmatch(character_link)
-            if lodestone_id_match is None:
-                raise LodestoneScraperException(
-                    f"Unable to parse character lodestone ID from following: {character_link}"
-                )
-            lodestone_id = lodestone_id_match.group(1)
-
-            member_name = member_tag.find("p", class_="entry__name").string
+    def _fetch_members_page(self, fc_id: str, page_num: int) -> list[FCMember]:
+        response = self._get_fc_members_page(fc_id, page_num)
+        return self._parser.parse_members_page(response.content).members
 
-            member_fc_info_tag = member_tag.find("ul", class_="entry__freecompany__info")
-            member_rank = member_fc_info_tag.find("li").find("span").string
+    @cached_method(_MEMBERS_ENDPOINT)
+    def get_free_company_members(self, fc_id: str) -> list[FCMember]:
+        response = self._get_fc_members_page(fc_id)
+        members, num_pages = self._parser.parse_members_page(response.content)
+        if num_pages is None:
+            raise LodestoneScraperException(
+                f"Unable to find the page count for FC {fc_id} members"
+            )
 
-            fc_members.append(FCMember(lodestone_id, member_name, member_rank))
+        # Once the page count is known the remaining pages are independent, so they are
+        # fetched concurrently; map() still yields them back in page order.
+        remaining_pages = self._map(
+            lambda page_num: self._fetch_members_page(fc_id, page_num),
+            range(2, num_pages + 1),
+        )
+        for page_members in remaining_pages:
+            members += page_members
 
-        return fc_members
+        return members
 
-    @cached(cache=TTLCache(maxsize=100, ttl=300))
-    def get_free_company_members(self, fc_id: str) -> list[FCMember]:
-        response = self._get_fc_members_page(fc_id)
-        page = BeautifulSoup(response.content, "html.parser")
+    def _get_gc_rankings_page(self, world: str, page_num: int, stream: bool = False):
+        response = self._get(
+            _GC_RANKINGS_ENDPOINT,
+            f"{self._base_url}/lodestone/ranking/gc/weekly?page={page_num}&worldname={world}",
+            stream=stream,
+        )
 
-        page_number_tag = page.find("li", class_="btn__pager__current")
-        match = _page_number_regex.fullmatch(page_number_tag.string)
-        if match is None:
+        if response.status_code == 404:
+            raise LodestoneScraperException(
+                f"Could not find Grand Company rankings for {world}",
+                response.status_code,
+            )
+        elif response.status_code == 429:
+            raise LodestoneUnavailableException(
+                f"Unable to fetch Grand Company rankings due to Lodestone rate limiting"
+            )
+        elif response.status_code >= 400 and response.status_code < 500:
+            raise LodestoneScraperException(
+                f"Could not find Grand Company rankings due to an unknown client error",
+                response.status_code,
+            )
+        elif response.status_code >= 500:
+            raise LodestoneUnavailableException(
+                "The Lodestone appears to be down", response.status_code
+            )
+        elif response.status_code != 200:
             raise LodestoneScraperException(
-                f"Unable to parse page number from following: {page_number_tag.string}"
+                f"Could not find Grand Company rankings due to an unknown issue",
+                response.status_code,
             )
-        num_pages = int(match.group(1))
 
-        members = self._scrape_members_from_page(page)
-        for page_num in range(2, num_pages + 1):
-            response = self._get_fc_members_page(fc_id, page_num)
-            page = BeautifulSoup(response.content, "html.parser")
-            members += self._scrape_members_from_page(page)
+        return response
 
-        return members
+    def _fetch_gc_rankings_page(
+        self, world: str, page_num: int
+    ) -> list[GrandCompanyRanking]:
+        response = self._get_gc_rankings_page(world, page_num)
+        return self._parser.parse_gc_rankings_page(response.content)
 
-    @cached(cache=TTLCache(maxsize=100, ttl=300))
+    @cached_method(_GC_RANKINGS_ENDPOINT)
     def get_grand_company_rankings(self, world: str) -> list[GrandCompanyRanking]:
-        rankings = []
+        # The ranking pages do not depend on each other, so all of them are requested at
+        # once and concatenated in page (and therefore rank) order.
+        pages = self._map(
+            lambda page_num: self._fetch_gc_rankings_page(world, page_num),
+            range(1, _GC_RANKING_PAGES + 1),
+        )
 
-        for page_num in range(1, 6):
-            response = requests.get(
-                f"{self._base_url}/lodestone/ranking/gc/weekly?page={page_num}&worldname={world}"
-            )
+        rankings = []
+        for page_rankings in pages:
+            rankings += page_rankings
 
-            if response.status_code == 404:
-                raise LodestoneScraperException(
-                    f"Could not find Grand Company rankings for {world}",
-                    response.status_code,
-                )
-            elif response.status_code == 429:
-                raise LodestoneScraperException(
-                    f"Unable to fetch Grand Company rankings due to Lodestone rate limiting"
-                )
-            elif response.status_code >= 400 and response.status_code < 500:
-                raise LodestoneScraperException(
-                    f"Could not find Grand Company rankings due to an unknown client error",
-                    response.status_code,
-                )
-            elif response.status_code >= 500:
-                raise LodestoneScraperException(
-                    "The Lodestone appears to be down", response.status_code
-                )
-            elif response.status_code != 200:
-                raise LodestoneScraperException(
-                    f"Could not find Grand Company rankings due to an unknown issue",
-                    response.status_code,
-                )
+        return rankings
 
-            page = BeautifulSoup(response.content, "html.parser")
+    def get_grand_company_rankings_for_worlds(
+        self, worlds: Iterable[str]
+    ) -> dict[str, list[GrandCompanyRanking]]:
+        """Batch variant of get_grand_company_rankings, scraping the worlds concurrently.
+
+        All worlds share the scraper's connection pool, rate limiter and caches. Once
+        every world has finished, the first one in the given order that failed raises
+        its exception.
+        """
+        return self._for_each(self.get_grand_company_rankings, worlds)
+
+    def get_grand_company_ranking_pages(
+        self, world: str, pages: Iterable[int] | None = None
+    ) -> GrandCompanyRankingPages:
+        """Degraded-mode variant of get_grand_company_rankings.
+
+        A ranking page that cannot be fetched for now (timeouts, connection errors,
+        rate limiting, server errors or an open circuit) is reported in missing_pages
+        instead of failing the whole scrape, and a retry can pass just those pages back
+        in. Any other failure, such as a 404, still raises, and so does a scrape where
+        no page could be fetched at all. The result is not cached, since a partial
+        result must not be served as a whole.
+        """
+        if pages is None:
+            pages = range(1, _GC_RANKING_PAGES + 1)
+        pages = sorted(pages)
+        fetches = [
+            self._submit(self._fetch_gc_rankings_page, world, page_num)
+            for page_num in pages
+        ]
 
-            ranking_table_row_tags = page.select("tbody tr")
-            for ranking_row_tag in ranking_table_row_tags:
-                id = str(ranking_row_tag["data-href"]).split("/")[3]
-                name = str(ranking_row_tag.find("h4").contents[0]).strip()
-                ranking = int(
-                    str(
-                        ranking_row_tag.select(".ranking-character__number")[0].text
-                    ).strip()
-                )
-                seals = int(
-                    str(
-                        ranking_row_tag.find(
-                            "td", {"class": "ranking-character__value"}
-                        ).text
-                    ).strip()
+        rankings = []
+        missing_pages = []
+        last_error = None
+        for page_num, fetch in zip(pages, fetches):
+            try:
+                rankings += fetch.result()
+            except LodestoneUnavailableException as e:
+                logging.getLogger("ffxivbot").warning(
+                    f"Grand Company ranking page {page_num} for {world} is missing: {e}"
                 )
-                rankings.append(GrandCompanyRanking(id, name, ranking, seals))
+                missing_pages.append(page_num)
+                last_error = e
+
+        if pages and len(missing_pages) == len(pages):
+            raise LodestoneUnavailableException(
+                f"None of the Grand Company ranking pages for {world} could be fetched"
+            ) from last_error
+        return GrandCompanyRankingPages(rankings, missing_pages)
+
+    def find_grand_company_rankings(
+        self, world: str, character_ids: Iterable[str]
+    ) -> list[GrandCompanyRanking]:
+        """Targeted variant of get_grand_company_rankings for a few characters.
+
+        Pages are fetched in rank order, and the scan stops as soon as every character
+        has been found, or after a page that is not full, since no ranks follow it.
+        A character ranked twice (after switching Grand Company mid-week) may
+        therefore be missing its lower row.
+        """
+        wanted = set(character_ids)
+        not_found = set(wanted)
+        rankings = []
+        for page_num in range(1, _GC_RANKING_PAGES + 1):
+            if not not_found:
+                break
+            page_rankings = self._fetch_gc_rankings_page(world, page_num)
+            for ranking in page_rankings:
+                if ranking.character_id in wanted:
+                    rankings.append(ranking)
+                    not_found.discard(ranking.character_id)
+            if len(page_rankings) < GC_RANKINGS_PER_PAGE:
+                break
 
         return rankings
 
-    @cached(cache=TTLCache(maxsize=100, ttl=300))
-    def search_free_companies(self, world: str) -> list[FreeCompany]:
-        response = requests.get(
-            f"{self._base_url}/lodestone/freecompany?worldname={world}"
+    def iter_free_company_members(self, fc_id: str) -> Iterator[FCMember]:
+        """Streaming variant of get_free_company_members.
+
+        Members on the first page are yielded while it downloads; the remaining pages
+        are fetched concurrently in the meantime and yielded in order afterwards.
+        """
+        response = self._get_fc_members_page(fc_id, stream=True)
+        num_pages = yield from self._stream_rows(response, self._parser.iter_members_page)
+        if num_pages is None:
+            raise LodestoneScraperException(
+                f"Unable to find the page count for FC {fc_id} members"
+            )
+
+        remaining_pages = self._map(
+            lambda page_num: self._fetch_members_page(fc_id, page_num),
+            range(2, num_pages + 1),
         )
+        for page_members in remaining_pages:
+            yield from page_members
+
+    def iter_grand_company_rankings(self, world: str) -> Iterator[GrandCompanyRanking]:
+        """Streaming variant of get_grand_company_rankings.
+
+        Rankings on the first page are yielded while it downloads, with the other
+        pages already being fetched concurrently, so rows are produced in rank order.
+        The competition results do not use this: they need the pages that failed, from
+        get_grand_company_ranking_pages, and streamed bodies skip the HTTP cache.
+        """
+        remaining_pages = [
+            self._submit(self._fetch_gc_rankings_page, world, page_num)
+            for page_num in range(2, _GC_RANKING_PAGES + 1)
+        ]
+        try:
+            response = self._get_gc_rankings_page(world, 1, stream=True)
+            yield from self._stream_rows(response, self._parser.iter_gc_rankings_page)
+
+            for page in remaining_pages:
+                yield from page.result()
+        finally:
+            for page in remaining_pages:
+                page.cancel()
+
+    def _fetch_free_companies_page(
+        self, world: str, page_num: int = None
+    ) -> FreeCompaniesPage:
+        if page_num is None:
+            url = f"{self._base_url}/lodestone/freecompany?worldname={world}"
+        else:
+            url = f"{self._base_url}/lodestone/freecompany?worldname={world}&page={page_num}"
+        response = self._get(_FC_SEARCH_ENDPOINT, url)
 
         if response.status_code == 404:
             raise LodestoneScraperException(
                 f"Could not find Free Companies for {world}", response.status_code
             )
         elif response.status_code == 429:
-            raise LodestoneScraperException(
+            raise LodestoneUnavailableException(
                 f"Unable to fetch Free Companies due to Lodestone rate limiting"
             )
         elif response.status_code >= 400 and response.status_code < 500:
@@ -173,7 +551,7 @@ class LodestoneScraper:
                 response.status_code,
             )
         elif response.status_code >= 500:
-            raise LodestoneScraperException(
+            raise LodestoneUnavailableException(
                 "The Lodestone appears to be down", response.status_code
             )
         elif response.status_code != 200:
@@ -182,24 +560,43 @@ class LodestoneScraper:
                 response.status_code,
             )
 
-        page = BeautifulSoup(response.content, "html.parser")
-        fc_entry_tags = page.find_all("div", class_="entry")
-        free_companies = []
-        for fc_entry in fc_entry_tags:
-            fc_link_tag = fc_entry.find("a", class_="entry__block")
-            lodestone_id_match = _fc_link_regex.fullmatch(fc_link_tag["href"])
-            lodestone_id = lodestone_id_match.group(1)
-            free_company_name = fc_entry.find("p", class_="entry__name").string
-            free_companies.append(FreeCompany(lodestone_id, free_company_name))
+        return self._parser.parse_free_companies_page(response.content)
+
+    @cached_method(_FC_SEARCH_ENDPOINT)
+    def get_free_company_index(self, world: str) -> FreeCompanyIndex:
+        """Crawls every page of the world's FC search and indexes the FCs by name.
+
+        The index is cached like the other results, so it is rebuilt in the background
+        once it is older than the result TTL while lookups keep using the old one.
+        """
+        free_companies, num_pages = self._fetch_free_companies_page(world)
+        remaining_pages = self._map(
+            lambda page_num: self._fetch_free_companies_page(world, page_num),
+            range(2, (num_pages or 1) + 1),
+        )
+        for page in remaining_pages:
+            free_companies += page.free_companies
+
+        return FreeCompanyIndex(free_companies)
+
+    def search_free_companies(self, world: str) -> list[FreeCompany]:
+        return list(self.get_free_company_index(world).free_companies)
+
+    def find_free_companies(self, world: str, name: str) -> list[FreeCompany]:
+        return self.get_free_company_index(world).lookup(name)
 
-        return free_companies
+    def complete_free_company_names(
+        self, world: str, prefix: str, limit: int = MAX_COMPLETIONS
+    ) -> list[FreeCompany]:
+        return self.get_free_company_index(world).complete(prefix, limit)
 
-    @cached(cache=TTLCache(maxsize=100, ttl=300))
+    @cached_method(_FC_RANKINGS_ENDPOINT)
     def get_top_100_free_company_rankings(
         self, data_center: str
     ) -> list[FreeCompanyRanking]:
-        response = requests.get(
-            f"{self._base_url}/lodestone/ranking/fc/weekly?filter=1&dcgroup={data_center}&dcGroup={data_center}"
+        response = self._get(
+            _FC_RANKINGS_ENDPOINT,
+            f"{self._base_url}/lodestone/ranking/fc/weekly?filter=1&dcgroup={data_center}&dcGroup={data_center}",
         )
 
         if response.status_code == 404:
@@ -208,7 +605,7 @@ class LodestoneScraper:
                 response.status_code,
             )
         elif response.status_code == 429:
-            raise LodestoneScraperException(
+            raise LodestoneUnavailableException(
                 f"Unable to fetch Free Company rankings due to Lodestone rate limiting"
             )
         elif response.status_code >= 400 and response.status_code < 500:
@@ -217,7 +614,7 @@ class LodestoneScraper:
                 response.status_code,
             )
         elif response.status_code >= 500:
-            raise LodestoneScraperException(
+            raise LodestoneUnavailableException(
                 "The Lodestone appears to be down", response.status_code
             )
         elif response.status_code != 200:
@@ -226,18 +623,244 @@ class LodestoneScraper:
                 response.status_code,
             )
 
-        page = BeautifulSoup(response.content, "html.parser")
-        ranking_table_row_tags = page.find("table", class_="ranking-character").find_all(
-            "tr"
+        return self._parser.parse_fc_rankings_page(response.content)
+
+    @cached_method(_CHARACTER_ENDPOINT)
+    def get_character_profile(self, character_id: str) -> CharacterProfile:
+        response = self._get(
+            _CHARACTER_ENDPOINT,
+            f"{self._base_url}/lodestone/character/{character_id}/",
         )
-        rankings = []
-        for ranking_row_tag in ranking_table_row_tags:
-            id = str(ranking_row_tag["data-href"]).split("/")[3]
-            name = str(ranking_row_tag.find("h4").contents[0]).strip()
-            ranking = int(ranking_row_tag.select(".ranking-character__number")[0].text)
-            seals_earned = int(
-                ranking_row_tag.find("td", {"class": "ranking-character__value"}).text
+
+        if response.status_code == 404:
+            raise LodestoneScraperException(
+                f"Character {character_id} could not be found", response.status_code
+            )
+        elif response.status_code == 429:
+            raise LodestoneUnavailableException(
+                f"Unable to fetch character {character_id} due to Lodestone rate limiting"
+            )
+        elif response.status_code >= 400 and response.status_code < 500:
+            raise LodestoneScraperException(
+                f"Failed to access character {character_id} due to an unknown client error",
+                response.status_code,
+            )
+        elif response.status_code >= 500:
+            raise LodestoneUnavailableException(
+                "The Lodestone appears to be down", response.status_code
+            )
+        elif response.status_code != 200:
+            raise LodestoneScraperException(
+                f"Failed to access character {character_id} due to an unknown issue",
+                response.status_code,
             )
-            rankings.append(FreeCompanyRanking(id, name, ranking, seals_earned))
 
-        return rankings
+        return CharacterProfile(
+            character_id, *self._parser.parse_character_page(response.content)
+        )
+
+    def get_character_profiles(
+        self, character_ids: Iterable[str]
+    ) -> dict[str, CharacterProfile]:
+        """Batch variant of get_character_profile, scraping the profiles concurrently.
+
+        At most max_concurrency profiles are requested at once, all through the shared
+        rate limiter, and profiles cached earlier are not requested again. A profile
+        that cannot be fetched is logged and left out of the result instead of failing
+        the whole batch.
+        """
+        fetches = self._submit_each(self.get_character_profile, character_ids)
+        profiles = {}
+        for character_id, fetch in fetches.items():
+            try:
+                profiles[character_id] = fetch.result()
+            except LodestoneScraperException as e:
+                logging.getLogger("ffxivbot").warning(
+                    f"Character {character_id} is left out of the batch: {e}"
+                )
+        return profiles
+
+    @cached_method(_FC_PAGE_ENDPOINT)
+    def get_free_company_weekly_rank(self, fc_id: str) -> int | None:
+        """Returns the weekly rank shown on the FC's own page, or None if it is unranked."""
+        response = self._get(
+            _FC_PAGE_ENDPOINT, f"{self._base_url}/lodestone/freecompany/{fc_id}/"
+        )
+
+        if response.status_code == 404:
+            raise LodestoneScraperException(
+                f"Free Company {fc_id} could not be found", response.status_code
+            )
+        elif response.status_code == 429:
+            raise LodestoneUnavailableException(
+                f"Unable to fetch Free Company {fc_id} due to Lodestone rate limiting"
+            )
+        elif response.status_code >= 400 and response.status_code < 500:
+            raise LodestoneScraperException(
+                f"Failed to access FC {fc_id} due to an unknown client error",
+                response.status_code,
+            )
+        elif response.status_code >= 500:
+            raise LodestoneUnavailableException(
+                "The Lodestone appears to be down", response.status_code
+            )
+        elif response.status_code != 200:
+            raise LodestoneScraperException(
+                f"Failed to access FC {fc_id} due to an unknown issue",
+                response.status_code,
+            )
+
+        return self._parser.parse_fc_weekly_rank(response.content)
+
+    def get_free_company_standing(
+        self, fc_id: str, data_center: str
+    ) -> FreeCompanyRanking | None:
+        """Returns the FC's weekly ranking, or None if it is outside the top 100.
+
+        The FC's page shows its weekly rank but not its seals, which only the ranking
+        table has. An FC outside the top 100 is therefore recognized from its small
+        page alone, and for one inside it the table row is picked by rank.
+        """
+        rank = self.get_free_company_weekly_rank(fc_id)
+        if rank is None or rank > TOP_FREE_COMPANY_RANKINGS:
+            return None
+
+        rankings = self.get_top_100_free_company_rankings(data_center)
+        if rank <= len(rankings) and rankings[rank - 1].ffxiv_id == fc_id:
+            return rankings[rank - 1]
+        # The page and the table are cached separately and may be a refresh apart.
+        return next((r for r in rankings if r.ffxiv_id == fc_id), None)
+
+    def get_top_100_free_company_rankings_for_data_centers(
+        self, data_centers: Iterable[str]
+    ) -> dict[str, list[FreeCompanyRanking]]:
+        """Batch variant of get_top_100_free_company_rankings, like the one for worlds."""
+        return self._for_each(self.get_top_100_free_company_rankings, data_centers)
+
+
+async def _iterate_in_thread(iterator: Iterator) -> AsyncIterator:
+    """Steps a blocking iterator on worker threads so the event loop stays free."""
+    done = object()
+    try:
+        while (item := await asyncio.to_thread(next, iterator, done)) is not done:
+            yield item
+    finally:
+        await asyncio.to_thread(iterator.close)
+
+
+class AsyncLodestoneScraper:
+    """Awaitable front-end for a LodestoneScraper.
+
+    Each call runs on a worker thread so that scraping never blocks the event loop,
+    while all calls share the wrapped scraper's connection pool and caches.
+    """
+
+    def __init__(self, scraper: LodestoneScraper):
+        self._scraper = scraper
+
+    def close(self):
+        self._scraper.close()
+
+    def circuit_states(self) -> dict[str, CircuitState]:
+        return self._scraper.circuit_states()
+
+    def parsed_page_stats(self) -> MemoStats:
+        return self._scraper.parsed_page_stats()
+
+    async def refresh(self, method: str, *args):
+        return await asyncio.to_thread(self._scraper.refresh, method, *args)
+
+    def cache_stats(self) -> dict[str, CacheStats]:
+        return self._scraper.cache_stats()
+
+    def invalidate_rankings(self) -> None:
+        self._scraper.invalidate_rankings()
+
+    async def expire_http_cache(self) -> None:
+        await asyncio.to_thread(self._scraper.expire_http_cache)
+
+    async def get_free_company_members(self, fc_id: str) -> list[FCMember]:
+        return await asyncio.to_thread(self._scraper.get_free_company_members, fc_id)
+
+    async def get_grand_company_rankings(self, world: str) -> list[GrandCompanyRanking]:
+        return await asyncio.to_thread(self._scraper.get_grand_company_rankings, world)
+
+    async def get_grand_company_rankings_for_worlds(
+        self, worlds: Iterable[str]
+    ) -> dict[str, list[GrandCompanyRanking]]:
+        return await asyncio.to_thread(
+            self._scraper.get_grand_company_rankings_for_worlds, worlds
+        )
+
+    async def get_grand_company_ranking_pages(
+        self, world: str, pages: Iterable[int] | None = None
+    ) -> GrandCompanyRankingPages:
+        return await asyncio.to_thread(
+            self._scraper.get_grand_company_ranking_pages, world, pages
+        )
+
+    async def find_grand_company_rankings(
+        self, world: str, character_ids: Iterable[str]
+    ) -> list[GrandCompanyRanking]:
+        return await asyncio.to_thread(
+            self._scraper.find_grand_company_rankings, world, character_ids
+        )
+
+    def iter_free_company_members(self, fc_id: str) -> AsyncIterator[FCMember]:
+        return _iterate_in_thread(self._scraper.iter_free_company_members(fc_id))
+
+    def iter_grand_company_rankings(
+        self, world: str
+    ) -> AsyncIterator[GrandCompanyRanking]:
+        return _iterate_in_thread(self._scraper.iter_grand_company_rankings(world))
+
+    async def get_free_company_index(self, world: str) -> FreeCompanyIndex:
+        return await asyncio.to_thread(self._scraper.get_free_company_index, world)
+
+    async def search_free_companies(self, world: str) -> list[FreeCompany]:
+        return await asyncio.to_thread(self._scraper.search_free_companies, world)
+
+    async def find_free_companies(self, world: str, name: str) -> list[FreeCompany]:
+        return await asyncio.to_thread(self._scraper.find_free_companies, world, name)
+
+    async def complete_free_company_names(
+        self, world: str, prefix: str, limit: int = MAX_COMPLETIONS
+    ) -> list[FreeCompany]:
+        return await asyncio.to_thread(
+            self._scraper.complete_free_company_names, world, prefix, limit
+        )
+
+    async def get_top_100_free_company_rankings(
+        self, data_center: str
+    ) -> list[FreeCompanyRanking]:
+        return await asyncio.to_thread(
+            self._scraper.get_top_100_free_company_rankings, data_center
+        )
+
+    async def get_character_profile(self, character_id: str) -> CharacterProfile:
+        return await asyncio.to_thread(self._scraper.get_character_profile, character_id)
+
+    async def get_character_profiles(
+        self, character_ids: Iterable[str]
+    ) -> dict[str, CharacterProfile]:
+        return await asyncio.to_thread(
+            self._scraper.get_character_profiles, character_ids
+        )
+
+    async def get_free_company_weekly_rank(self, fc_id: str) -> int | None:
+        return await asyncio.to_thread(self._scraper.get_free_company_weekly_rank, fc_id)
+
+    async def get_free_company_standing(
+        self, fc_id: str, data_center: str
+    ) -> FreeCompanyRanking | None:
+        return await asyncio.to_thread(
+            self._scraper.get_free_company_standing, fc_id, data_center
+        )
+
+    async def get_top_100_free_company_rankings_for_data_centers(
+        self, data_centers: Iterable[str]
+    ) -> dict[str, list[FreeCompanyRanking]]:
+        return await asyncio.to_thread(
+            self._scraper.get_top_100_free_company_rankings_for_data_centers,
+            data_centers,
+        )
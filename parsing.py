@@ -0,0 +1,678 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import logging
+import multiprocessing
+import re
+import threading
+from typing import Any, Generator, Iterable, NamedTuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+from cachetools import LRUCache
+
+from domain import (
+    FCMember,
+    FreeCompany,
+    FreeCompanyRanking,
+    GrandCompanyRanking,
+    LodestoneScraperException,
+)
+
+_page_number_regex = re.compile(r"Page \d+ of (\d+)")
+_character_link_regex = re.compile("/lodestone/character/(.+)/")
+_fc_link_regex = re.compile("/lodestone/freecompany/(.+)/")
+_home_world_regex = re.compile(r"\s*(\S+)\s*\[(\S+)\]\s*")
+# An empty or maintenance page has no rankings table, which is not the same as an
+# empty top 100.
+_MISSING_FC_RANKINGS_MESSAGE = "Unable to find the Free Company rankings table"
+# Unranked FCs show "--" instead of a number.
+_weekly_rank_regex = re.compile(r"Weekly Rank\s*[:：]\s*(\d+|--)")
+
+
+def _class_token_regex(*class_names: str) -> re.Pattern:
+    # Strainers may see the raw, unsplit class attribute, so match whole tokens in it.
+    return re.compile(rf"(?:^|\s)(?:{'|'.join(class_names)})(?:\s|$)")
+
+
+# Only these subtrees carry data; the navigation, scripts and footer around them are
+# never turned into Python objects.
+_members_strainer = SoupStrainer(
+    "li", class_=_class_token_regex("entry", "btn__pager__current")
+)
+_gc_rankings_strainer = SoupStrainer("tbody")
+_free_companies_strainer = SoupStrainer(
+    ["div", "li"], class_=_class_token_regex("entry", "btn__pager__current")
+)
+_fc_rankings_strainer = SoupStrainer(
+    "table", class_=_class_token_regex("ranking-character")
+)
+_character_strainer = SoupStrainer(
+    ["p", "div"],
+    class_=_class_token_regex(
+        "frame__chara__name", "frame__chara__world", "character__freecompany__name"
+    ),
+)
+_fc_standing_strainer = SoupStrainer(
+    "table", class_=_class_token_regex("character__ranking__data")
+)
+
+
+class MembersPage(NamedTuple):
+    members: list[FCMember]
+    num_pages: int | None
+
+
+class FreeCompaniesPage(NamedTuple):
+    free_companies: list[FreeCompany]
+    num_pages: int | None
+
+
+class CharacterPage(NamedTuple):
+    name: str
+    world: str
+    data_center: str
+    free_company_id: str | None
+
+
+def _parse_page_count(pager_text: str | None) -> int | None:
+    if pager_text is None:
+        return None
+    match = _page_number_regex.fullmatch(pager_text)
+    if match is None:
+        raise LodestoneScraperException(
+            f"Unable to parse page number from following: {pager_text}"
+        )
+    return int(match.group(1))
+
+
+def _parse_character_id(character_link: str) -> str:
+    lodestone_id_match = _character_link_regex.fullmatch(character_link)
+    if lodestone_id_match is None:
+        raise LodestoneScraperException(
+            f"Unable to parse character lodestone ID from following: {character_link}"
+        )
+    return lodestone_id_match.group(1)
+
+
+def _parse_weekly_rank(cell_texts: Iterable[str]) -> int | None:
+    for text in cell_texts:
+        match = _weekly_rank_regex.search(text)
+        if match is not None:
+            return None if match.group(1) == "--" else int(match.group(1))
+    raise LodestoneScraperException("Unable to find the weekly rank of the Free Company")
+
+
+def _character_page(
+    name: str | None, home_world: str | None, fc_link: str | None
+) -> CharacterPage:
+    if name is None or home_world is None:
+        raise LodestoneScraperException("Unable to find the character name and world")
+    home_world_match = _home_world_regex.fullmatch(home_world)
+    if home_world_match is None:
+        raise LodestoneScraperException(
+            f"Unable to parse home world from following: {home_world}"
+        )
+    fc_id_match = None if fc_link is None else _fc_link_regex.fullmatch(fc_link)
+    return CharacterPage(
+        name.strip(),
+        home_world_match.group(1),
+        home_world_match.group(2),
+        None if fc_id_match is None else fc_id_match.group(1),
+    )
+
+
+def _drain(rows: Generator) -> tuple[list, Any]:
+    """Collects every row of a page generator along with its return value."""
+    collected = []
+    while True:
+        try:
+            collected.append(next(rows))
+        except StopIteration as stop:
+            return collected, stop.value
+
+
+class PageParser(ABC):
+    """Extracts Lodestone records from raw page bodies.
+
+    Each page type has an iter_* generator that consumes the body as a sequence of
+    chunks and yields records as they are found, and a parse_* method that does the
+    same for a complete body. Every backend must produce identical records for the
+    same page, so that the choice of backend only affects speed.
+    """
+
+    name: str
+
+    @abstractmethod
+    def iter_members_page(
+        self, chunks: Iterable[bytes]
+    ) -> Generator[FCMember, None, int | None]:
+        """Yields the members on the page and returns the total page count, if the
+        page has a pager."""
+
+    @abstractmethod
+    def iter_gc_rankings_page(
+        self, chunks: Iterable[bytes]
+    ) -> Generator[GrandCompanyRanking, None, None]:
+        """Yields the rankings on the page, in rank order."""
+
+    @abstractmethod
+    def iter_free_companies_page(
+        self, chunks: Iterable[bytes]
+    ) -> Generator[FreeCompany, None, int | None]:
+        """Yields the FCs on the page and returns the total page count, if the page
+        has a pager."""
+
+    @abstractmethod
+    def iter_fc_rankings_page(
+        self, chunks: Iterable[bytes]
+    ) -> Generator[FreeCompanyRanking, None, None]:
+        """Yields the rankings on the page, in rank order, and raises when the page has
+        no rankings table at all."""
+
+    def parse_members_page(self, body: bytes) -> MembersPage:
+        return MembersPage(*_drain(self.iter_members_page([body])))
+
+    def parse_gc_rankings_page(self, body: bytes) -> list[GrandCompanyRanking]:
+        return list(self.iter_gc_rankings_page([body]))
+
+    def parse_free_companies_page(self, body: bytes) -> FreeCompaniesPage:
+        return FreeCompaniesPage(*_drain(self.iter_free_companies_page([body])))
+
+    def parse_fc_rankings_page(self, body: bytes) -> list[FreeCompanyRanking]:
+        return list(self.iter_fc_rankings_page([body]))
+
+    @abstractmethod
+    def parse_fc_weekly_rank(self, body: bytes) -> int | None:
+        """Returns the weekly rank shown on a Free Company's own page, or None when the
+        FC is not ranked this week."""
+
+    @abstractmethod
+    def parse_character_page(self, body: bytes) -> CharacterPage:
+        """Returns the name, home world and FC shown on a character's profile."""
+
+
+class HtmlParserBackend(PageParser):
+    """Pure Python backend built on BeautifulSoup and the standard library parser.
+
+    BeautifulSoup cannot build a tree incrementally, so this backend buffers the whole
+    body before yielding any records.
+    """
+
+    name = "html.parser"
+
+    def iter_members_page(
+        self, chunks: Iterable[bytes]
+    ) -> Generator[FCMember, None, int | None]:
+        page = BeautifulSoup(
+            b"".join(chunks), "html.parser", parse_only=_members_strainer
+        )
+
+        page_number_tag = page.find("li", class_="btn__pager__current")
+        num_pages = _parse_page_count(
+            None if page_number_tag is None else page_number_tag.string
+        )
+
+        for member_tag in page.find_all("li", class_="entry"):
+            character_link_tag = member_tag.find("a", class_="entry__bg")
+            lodestone_id = _parse_character_id(character_link_tag["href"])
+
+            member_name = member_tag.find("p", class_="entry__name").string
+
+            member_fc_info_tag = member_tag.find("ul", class_="entry__freecompany__info")
+            member_rank = member_fc_info_tag.find("li").find("span").string
+
+            yield FCMember(lodestone_id, member_name, member_rank)
+
+        return num_pages
+
+    def iter_gc_rankings_page(
+        self, chunks: Iterable[bytes]
+    ) -> Generator[GrandCompanyRanking, None, None]:
+        page = BeautifulSoup(
+            b"".join(chunks), "html.parser", parse_only=_gc_rankings_strainer
+        )
+
+        for ranking_row_tag in page.select("tbody tr"):
+            id = str(ranking_row_tag["data-href"]).split("/")[3]
+            name = str(ranking_row_tag.find("h4").contents[0]).strip()
+            ranking = int(
+                str(ranking_row_tag.select(".ranking-character__number")[0].text).strip()
+            )
+            seals = int(
+                str(
+                    ranking_row_tag.find("td", {"class": "ranking-character__value"}).text
+                ).strip()
+            )
+            yield GrandCompanyRanking(id, name, ranking, seals)
+
+    def iter_free_companies_page(
+        self, chunks: Iterable[bytes]
+    ) -> Generator[FreeCompany, None, int | None]:
+        page = BeautifulSoup(
+            b"".join(chunks), "html.parser", parse_only=_free_companies_strainer
+        )
+
+        page_number_tag = page.find("li", class_="btn__pager__current")
+        num_pages = _parse_page_count(
+            None if page_number_tag is None else page_number_tag.string
+        )
+
+        for fc_entry in page.find_all("div", class_="entry"):
+            fc_link_tag = fc_entry.find("a", class_="entry__block")
+            lodestone_id_match = _fc_link_regex.fullmatch(fc_link_tag["href"])
+            lodestone_id = lodestone_id_match.group(1)
+            free_company_name = fc_entry.find("p", class_="entry__name").string
+            yield FreeCompany(lodestone_id, free_company_name)
+
+        return num_pages
+
+    def iter_fc_rankings_page(
+        self, chunks: Iterable[bytes]
+    ) -> Generator[FreeCompanyRanking, None, None]:
+        page = BeautifulSoup(
+            b"".join(chunks), "html.parser", parse_only=_fc_rankings_strainer
+        )
+
+        ranking_table_tag = page.find("table", class_="ranking-character")
+        if ranking_table_tag is None:
+            raise LodestoneScraperException(_MISSING_FC_RANKINGS_MESSAGE)
+        for ranking_row_tag in ranking_table_tag.find_all("tr"):
+            id = str(ranking_row_tag["data-href"]).split("/")[3]
+            name = str(ranking_row_tag.find("h4").contents[0]).strip()
+            ranking = int(ranking_row_tag.select(".ranking-character__number")[0].text)
+            seals_earned = int(
+                ranking_row_tag.find("td", {"class": "ranking-character__value"}).text
+            )
+            yield FreeCompanyRanking(id, name, ranking, seals_earned)
+
+    def parse_fc_weekly_rank(self, body: bytes) -> int | None:
+        page = BeautifulSoup(body, "html.parser", parse_only=_fc_standing_strainer)
+        return _parse_weekly_rank(cell.get_text() for cell in page.find_all("th"))
+
+    def parse_character_page(self, body: bytes) -> CharacterPage:
+        page = BeautifulSoup(body, "html.parser", parse_only=_character_strainer)
+        name_tag = page.find("p", class_="frame__chara__name")
+        world_tag = page.find("p", class_="frame__chara__world")
+        fc_tag = page.find("div", class_="character__freecompany__name")
+        fc_link_tag = None if fc_tag is None else fc_tag.find("a")
+        return _character_page(
+            None if name_tag is None else name_tag.get_text(),
+            None if world_tag is None else world_tag.get_text(),
+            None if fc_link_tag is None else fc_link_tag.get("href"),
+        )
+
+
+def _has_class(tag: str, class_name: str) -> str:
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+def _first(element, path: str):
+    return element.xpath(path)[0]
+
+
+def _classes(element) -> list[str]:
+    return element.get("class", "").split()
+
+
+def _release(element):
+    """Frees a processed element and the already processed siblings before it."""
+    element.clear(keep_tail=True)
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+class LxmlBackend(PageParser):
+    """C-accelerated backend built on libxml2.
+
+    Chunks are fed to a pull parser that only reports the row-level tags, so each
+    record is yielded as soon as its row closes and the row is released right after,
+    and no XPath query ever has to walk the full document.
+    """
+
+    name = "lxml"
+
+    def __init__(self):
+        from lxml import etree
+
+        self._etree = etree
+
+    def _iter_closed_tags(self, chunks: Iterable[bytes], tag: str | tuple[str, ...]):
+        # The Lodestone is served as UTF-8; being explicit keeps libxml2 from guessing.
+        parser = self._etree.HTMLPullParser(events=("end",), tag=tag, encoding="utf-8")
+
+        received_data = False
+        for chunk in chunks:
+            if not chunk:
+                continue
+            received_data = True
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                yield element
+
+        # libxml2 refuses to close a parser that was never fed anything.
+        if not received_data:
+            return
+        parser.close()
+        for _, element in parser.read_events():
+            yield element
+
+    def iter_members_page(
+        self, chunks: Iterable[bytes]
+    ) -> Generator[FCMember, None, int | None]:
+        num_pages = None
+
+        for li_tag in self._iter_closed_tags(chunks, "li"):
+            classes = _classes(li_tag)
+            if "btn__pager__current" in classes and num_pages is None:
+                num_pages = _parse_page_count(li_tag.text)
+            elif "entry" in classes:
+                character_link_tag = _first(li_tag, ".//" + _has_class("a", "entry__bg"))
+                lodestone_id = _parse_character_id(character_link_tag.get("href"))
+
+                member_name = _first(li_tag, ".//" + _has_class("p", "entry__name")).text
+
+                member_fc_info_tag = _first(
+                    li_tag, ".//" + _has_class("ul", "entry__freecompany__info")
+                )
+                member_rank = _first(_first(member_fc_info_tag, ".//li"), ".//span").text
+
+                _release(li_tag)
+                yield FCMember(lodestone_id, member_name, member_rank)
+
+        return num_pages
+
+    def iter_gc_rankings_page(
+        self, chunks: Iterable[bytes]
+    ) -> Generator[GrandCompanyRanking, None, None]:
+        for ranking_row_tag in self._iter_closed_tags(chunks, "tr"):
+            if next(ranking_row_tag.iterancestors("tbody"), None) is None:
+                continue
+
+            id = ranking_row_tag.get("data-href").split("/")[3]
+            name = (_first(ranking_row_tag, ".//h4").text or "").strip()
+            ranking_tag = _first(
+                ranking_row_tag, ".//" + _has_class("*", "ranking-character__number")
+            )
+            seals_tag = _first(
+                ranking_row_tag, ".//" + _has_class("td", "ranking-character__value")
+            )
+            ranking = int(ranking_tag.xpath("string()").strip())
+            seals = int(seals_tag.xpath("string()").strip())
+
+            _release(ranking_row_tag)
+            yield GrandCompanyRanking(id, name, ranking, seals)
+
+    def iter_free_companies_page(
+        self, chunks: Iterable[bytes]
+    ) -> Generator[FreeCompany, None, int | None]:
+        num_pages = None
+
+        for fc_entry in self._iter_closed_tags(chunks, ("div", "li")):
+            classes = _classes(fc_entry)
+            if fc_entry.tag == "li":
+                if "btn__pager__current" in classes and num_pages is None:
+                    num_pages = _parse_page_count(fc_entry.text)
+                continue
+            if "entry" not in classes:
+                continue
+
+            fc_link_tag = _first(fc_entry, ".//" + _has_class("a", "entry__block"))
+            lodestone_id_match = _fc_link_regex.fullmatch(fc_link_tag.get("href"))
+            lodestone_id = lodestone_id_match.group(1)
+            free_company_name = _first(
+                fc_entry, ".//" + _has_class("p", "entry__name")
+            ).text
+
+            _release(fc_entry)
+            yield FreeCompany(lodestone_id, free_company_name)
+
+        return num_pages
+
+    def iter_fc_rankings_page(
+        self, chunks: Iterable[bytes]
+    ) -> Generator[FreeCompanyRanking, None, None]:
+        found_table = False
+        for tag in self._iter_closed_tags(chunks, ("tr", "table")):
+            if tag.tag == "table":
+                found_table = found_table or "ranking-character" in _classes(tag)
+                continue
+            ranking_row_tag = tag
+            table_tag = next(ranking_row_tag.iterancestors("table"), None)
+            if table_tag is None or "ranking-character" not in _classes(table_tag):
+                continue
+
+            id = ranking_row_tag.get("data-href").split("/")[3]
+            name = (_first(ranking_row_tag, ".//h4").text or "").strip()
+            ranking_tag = _first(
+                ranking_row_tag, ".//" + _has_class("*", "ranking-character__number")
+            )
+            seals_tag = _first(
+                ranking_row_tag, ".//" + _has_class("td", "ranking-character__value")
+            )
+            ranking = int(ranking_tag.xpath("string()"))
+            seals_earned = int(seals_tag.xpath("string()"))
+
+            _release(ranking_row_tag)
+            yield FreeCompanyRanking(id, name, ranking, seals_earned)
+
+        if not found_table:
+            raise LodestoneScraperException(_MISSING_FC_RANKINGS_MESSAGE)
+
+    def parse_fc_weekly_rank(self, body: bytes) -> int | None:
+        cell_texts = []
+        for th_tag in self._iter_closed_tags([body], "th"):
+            table_tag = next(th_tag.iterancestors("table"), None)
+            if table_tag is not None and "character__ranking__data" in _classes(
+                table_tag
+            ):
+                cell_texts.append(th_tag.xpath("string()"))
+        return _parse_weekly_rank(cell_texts)
+
+    def parse_character_page(self, body: bytes) -> CharacterPage:
+        name = home_world = fc_link = None
+        for tag in self._iter_closed_tags([body], ("p", "div")):
+            classes = _classes(tag)
+            if "frame__chara__name" in classes and name is None:
+                name = tag.xpath("string()")
+            elif "frame__chara__world" in classes and home_world is None:
+                home_world = tag.xpath("string()")
+            elif "character__freecompany__name" in classes and fc_link is None:
+                fc_link = next(iter(tag.xpath(".//a/@href")), None)
+        return _character_page(name, home_world, fc_link)
+
+
+class MemoStats(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+
+class MemoizedPageParser(PageParser):
+    """Remembers the records parsed from recent page bodies, keyed by a content hash.
+
+    A byte-identical page, such as a ranking page that has not changed since it was
+    last fetched, skips parsing entirely. The streaming iter_* methods are passed
+    straight through, since their body is not known up front.
+    """
+
+    def __init__(self, parser: PageParser, maxsize: int = 256):
+        self.name = parser.name
+        self._parser = parser
+        self._memo = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self) -> MemoStats:
+        with self._lock:
+            return MemoStats(self._hits, self._misses, len(self._memo))
+
+    def _parse(self, kind: str, body: bytes, parse) -> tuple:
+        key = (kind, hashlib.blake2b(body, digest_size=16).digest())
+        with self._lock:
+            records = self._memo.get(key)
+            if records is not None:
+                self._hits += 1
+                return records
+            self._misses += 1
+
+        records = parse(body)
+        with self._lock:
+            self._memo[key] = records
+        return records
+
+    def iter_members_page(self, chunks):
+        return self._parser.iter_members_page(chunks)
+
+    def iter_gc_rankings_page(self, chunks):
+        return self._parser.iter_gc_rankings_page(chunks)
+
+    def iter_free_companies_page(self, chunks):
+        return self._parser.iter_free_companies_page(chunks)
+
+    def iter_fc_rankings_page(self, chunks):
+        return self._parser.iter_fc_rankings_page(chunks)
+
+    # Records are memoized as tuples and handed out as new lists, so that callers can
+    # extend the lists they get without changing the memoized records.
+    def parse_members_page(self, body: bytes) -> MembersPage:
+        members, num_pages = self._parse("members", body, self._parse_members_page)
+        return MembersPage(list(members), num_pages)
+
+    def _parse_members_page(self, body: bytes) -> tuple:
+        members, num_pages = self._parser.parse_members_page(body)
+        return tuple(members), num_pages
+
+    def parse_gc_rankings_page(self, body: bytes) -> list[GrandCompanyRanking]:
+        return list(
+            self._parse(
+                "gc-rankings",
+                body,
+                lambda body: tuple(self._parser.parse_gc_rankings_page(body)),
+            )
+        )
+
+    def parse_free_companies_page(self, body: bytes) -> FreeCompaniesPage:
+        free_companies, num_pages = self._parse(
+            "free-companies", body, self._parse_free_companies_page
+        )
+        return FreeCompaniesPage(list(free_companies), num_pages)
+
+    def _parse_free_companies_page(self, body: bytes) -> tuple:
+        free_companies, num_pages = self._parser.parse_free_companies_page(body)
+        return tuple(free_companies), num_pages
+
+    def parse_fc_rankings_page(self, body: bytes) -> list[FreeCompanyRanking]:
+        return list(
+            self._parse(
+                "fc-rankings",
+                body,
+                lambda body: tuple(self._parser.parse_fc_rankings_page(body)),
+            )
+        )
+
+    def parse_character_page(self, body: bytes) -> CharacterPage:
+        return self._parse("character", body, self._parser.parse_character_page)
+
+    def parse_fc_weekly_rank(self, body: bytes) -> int | None:
+        # Wrapped in a tuple, since None marks a memo miss.
+        (rank,) = self._parse(
+            "fc-weekly-rank",
+            body,
+            lambda body: (self._parser.parse_fc_weekly_rank(body),),
+        )
+        return rank
+
+
+PARSER_BACKENDS: dict[str, type[PageParser]] = {
+    HtmlParserBackend.name: HtmlParserBackend,
+    LxmlBackend.name: LxmlBackend,
+}
+
+
+def get_page_parser(name: str) -> PageParser:
+    if name not in PARSER_BACKENDS:
+        raise ValueError(
+            f"Unknown parser backend {name}, expected one of: {', '.join(PARSER_BACKENDS)}"
+        )
+
+    try:
+        return PARSER_BACKENDS[name]()
+    except ImportError:
+        logging.getLogger("ffxivbot").warning(
+            f"Parser backend {name} is not installed, falling back to html.parser"
+        )
+        return HtmlParserBackend()
+
+
+# The parser used by each process pool worker, created once when the worker starts.
+_worker_parser: PageParser | None = None
+
+
+def _init_worker(name: str) -> None:
+    global _worker_parser
+    _worker_parser = get_page_parser(name)
+
+
+def _parse_in_worker(method: str, body: bytes):
+    return getattr(_worker_parser, method)(body)
+
+
+class ProcessPoolPageParser(PageParser):
+    """Parses complete page bodies in a pool of worker processes.
+
+    Parsing is CPU-bound and holds the GIL, so on threads it competes with the Discord
+    gateway for the interpreter. Workers get the raw bytes and send back lists of
+    records, letting page parsing use every core. Streaming iter_* calls cannot be
+    split across processes and are parsed in this process.
+    """
+
+    def __init__(self, name: str, processes: int):
+        self._parser = get_page_parser(name)
+        self.name = self._parser.name
+        # Forking a process that is running threads can copy held locks into the
+        # child, so workers are started fresh.
+        self._pool = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.name,),
+        )
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _parse(self, method: str, body: bytes):
+        return self._pool.submit(_parse_in_worker, method, body).result()
+
+    def iter_members_page(self, chunks):
+        return self._parser.iter_members_page(chunks)
+
+    def iter_gc_rankings_page(self, chunks):
+        return self._parser.iter_gc_rankings_page(chunks)
+
+    def iter_free_companies_page(self, chunks):
+        return self._parser.iter_free_companies_page(chunks)
+
+    def iter_fc_rankings_page(self, chunks):
+        return self._parser.iter_fc_rankings_page(chunks)
+
+    def parse_members_page(self, body: bytes) -> MembersPage:
+        return MembersPage(*self._parse("parse_members_page", body))
+
+    def parse_gc_rankings_page(self, body: bytes) -> list[GrandCompanyRanking]:
+        return self._parse("parse_gc_rankings_page", body)
+
+    def parse_free_companies_page(self, body: bytes) -> FreeCompaniesPage:
+        return FreeCompaniesPage(*self._parse("parse_free_companies_page", body))
+
+    def parse_fc_rankings_page(self, body: bytes) -> list[FreeCompanyRanking]:
+        return self._parse("parse_fc_rankings_page", body)
+
+    def parse_fc_weekly_rank(self, body: bytes) -> int | None:
+        return self._parse("parse_fc_weekly_rank", body)
+
+    def parse_character_page(self, body: bytes) -> CharacterPage:
+        return self._parse("parse_character_page", body)
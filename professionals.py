@@ -1,20 +1,31 @@
 import random
 import sqlite3
+import time
 from typing import AsyncGenerator, Tuple
 
 from config import load_config
 from db import SqlLiteClient
+from deadlines import check_deadline
 from domain import *
-from lodestone import LodestoneScraper
+from lodestone import AsyncLodestoneScraper
 
 _db = None
 _lodestone = None
 _config = load_config()
+# Rankings from a results run that could not fetch every page, kept so that the next
+# run only has to fetch the missing pages.
+_partial_gc_rankings: GrandCompanyRankingPages | None = None
+_partial_gc_rankings_fetched_at = 0.0
+# Past this many seconds the kept pages are refetched instead, since a player who moved
+# across a page boundary in the meantime would otherwise be counted twice.
+PARTIAL_GC_RANKINGS_MAX_AGE = 5 * 60
 
 
-def _verify_fc_membership(first_name: str, last_name: str) -> None:
+async def _verify_fc_membership(first_name: str, last_name: str) -> None:
     try:
-        members = _lodestone.get_free_company_members(_config.free_company_id)
+        members = await _lodestone.get_free_company_members(_config.free_company_id)
+    except DeadlineExceededException:
+        raise
     except Exception as e:
         raise UserException(
             log_message=f"Failed to verify FC membership for {first_name} {last_name}: {e}",
@@ -30,10 +41,11 @@ def _verify_fc_membership(first_name: str, last_name: str) -> None:
         )
 
 
-def initialize(db: SqlLiteClient, scraper: LodestoneScraper):
-    global _db, _lodestone
+def initialize(db: SqlLiteClient, scraper: AsyncLodestoneScraper):
+    global _db, _lodestone, _partial_gc_rankings
     _db = db
     _lodestone = scraper
+    _partial_gc_rankings = None
 
 
 def validate_discord_id(discord_id) -> list[ValidationError]:
@@ -72,7 +84,8 @@ async def participate_as_player(discord_id: int, first_name: str, last_name: str
     )
     if len(errors := validate_participant(participant)) > 0:
         raise ValidationException(errors)
-    _verify_fc_membership(first_name, last_name)
+    await _verify_fc_membership(first_name, last_name)
+    check_deadline()
 
     try:
         _db.insert_participant(participant)
@@ -92,7 +105,8 @@ async def participate_as_coach(discord_id: int, first_name: str, last_name: str)
     )
     if len(errors := validate_participant(participant)) > 0:
         raise ValidationException(errors)
-    _verify_fc_membership(first_name, last_name)
+    await _verify_fc_membership(first_name, last_name)
+    check_deadline()
 
     try:
         _db.insert_participant(participant)
@@ -176,7 +190,8 @@ async def create_contract(input: ContractInput):
             is_coach=False,
         )
 
-    _verify_fc_membership(participant.first_name, participant.last_name)
+    await _verify_fc_membership(participant.first_name, participant.last_name)
+    check_deadline()
 
     try:
         _db.insert_participant(participant)
@@ -212,10 +227,42 @@ async def get_participation_status(
     return participant, contract
 
 
+async def get_weekly_standing(participant: Participant) -> GrandCompanyRanking | None:
+    """Looks up a participant's current Grand Company ranking, or None if they are not
+    ranked. Raises UserException when their character is not in the FC.
+
+    Only the ranking pages up to the participant's row are fetched. A participant who
+    switched Grand Company mid-week can have a second, lower row that is not reached,
+    so their seals may be under-counted compared to the competition results.
+    """
+    members = await _lodestone.get_free_company_members(_config.free_company_id)
+    full_name = f"{participant.first_name} {participant.last_name}"
+    member = next((m for m in members if m.name == full_name), None)
+    if member is None:
+        raise UserException(
+            log_message=f"{full_name} has no weekly standing, not being an FC member.",
+            user_message="Your character is not in the Free Company, so it has no "
+            "weekly standing.",
+        )
+
+    rankings = await _lodestone.find_grand_company_rankings(
+        _config.world_name, [member.ffxiv_id]
+    )
+    if not rankings:
+        return None
+    return GrandCompanyRanking(
+        character_id=member.ffxiv_id,
+        character_name=full_name,
+        rank=min(r.rank for r in rankings),
+        seals=sum(r.seals for r in rankings),
+    )
+
+
 def score_players_and_honorable_mentions(
     fc_members: list[FCMember],
     participants: list[Participant],
     gc_rankings: list[GrandCompanyRanking],
+    rankings_complete: bool = True,
 ) -> tuple[list[PlayerScore], list[HonorableMention]]:
     player_scores = []
     honorable_mentions = []
@@ -253,6 +300,7 @@ def score_players_and_honorable_mentions(
                     rank=best_ranking,
                     seals_earned=sum_of_seals,
                     is_coach=participant.is_coach,
+                    rank_verified=rankings_complete or bool(rankings),
                 )
             )
         elif best_ranking != -1 and sum_of_seals > 0:
@@ -302,6 +350,7 @@ def evaluate_contracts(
 
         is_completed = ps.seals_earned >= contract.amount
         payout = amounts_to_payouts.get(contract.amount, 0) if is_completed else 0
+        is_pending = not is_completed and not ps.rank_verified
 
         completed_contracts.append(
             ContractResult(
@@ -311,6 +360,7 @@ def evaluate_contracts(
                 amount=contract.amount,
                 is_completed=is_completed,
                 payout=payout,
+                is_pending=is_pending,
             )
         )
 
@@ -324,27 +374,39 @@ async def get_competition_results(
     participants = _db.get_all_participants()
 
     yield "Fetching Free Company members..."
-    fc_members = _lodestone.get_free_company_members(_config.free_company_id)
+    fc_members = await _lodestone.get_free_company_members(_config.free_company_id)
 
-    yield "Fetching Grand Company rankings..."
-    gc_rankings = _lodestone.get_grand_company_rankings(_config.world_name)
+    if _fresh_partial_gc_rankings() is None:
+        yield "Fetching Grand Company rankings..."
+    else:
+        yield "Retrying the Grand Company ranking pages that could not be fetched..."
+    gc_rankings = await _get_gc_rankings()
 
+    check_deadline()
     players, honorable_mentions = score_players_and_honorable_mentions(
-        fc_members, participants, gc_rankings
+        fc_members, participants, gc_rankings.rankings, gc_rankings.complete
     )
 
     eligible_players = [p for p in players if not p.is_coach and p.seals_earned > 0]
-    competition_winner, competition_win_reason = find_competition_winner(eligible_players)
+    if gc_rankings.complete:
+        competition_winner, competition_win_reason = find_competition_winner(
+            eligible_players
+        )
 
-    eligible_for_drawing = [
-        p for p in eligible_players if p.discord_id != competition_winner.discord_id
-    ]
-    drawing_winner = choose_random_drawing_winner(eligible_for_drawing)
-    drawing_win_reason = (
-        WinReason.RANDOM_DRAWING
-        if drawing_winner is not None
-        else WinReason.NO_ELIGIBLE_PLAYERS
-    )
+        eligible_for_drawing = [
+            p for p in eligible_players if p.discord_id != competition_winner.discord_id
+        ]
+        drawing_winner = choose_random_drawing_winner(eligible_for_drawing)
+        drawing_win_reason = (
+            WinReason.RANDOM_DRAWING
+            if drawing_winner is not None
+            else WinReason.NO_ELIGIBLE_PLAYERS
+        )
+    else:
+        # An unverified player may have earned more seals than anyone counted here, so
+        # the winners are only picked once every page has been fetched.
+        competition_winner = drawing_winner = None
+        competition_win_reason = drawing_win_reason = WinReason.RANKINGS_INCOMPLETE
 
     yield "Evaluating contracts..."
     contracts = _db.get_all_contracts()
@@ -358,19 +420,79 @@ async def get_competition_results(
         drawing_win_reason=drawing_win_reason,
         contract_results=contract_results,
         honorable_mentions=honorable_mentions,
+        unverified_ranks=gc_rankings.missing_ranks(),
     )
 
 
+def _fresh_partial_gc_rankings() -> GrandCompanyRankingPages | None:
+    if _partial_gc_rankings is None:
+        return None
+    if time.monotonic() - _partial_gc_rankings_fetched_at > PARTIAL_GC_RANKINGS_MAX_AGE:
+        return None
+    return _partial_gc_rankings
+
+
+async def _get_gc_rankings() -> GrandCompanyRankingPages:
+    global _partial_gc_rankings, _partial_gc_rankings_fetched_at
+    partial = _fresh_partial_gc_rankings()
+    if partial is None:
+        fetched_at = time.monotonic()
+        gc_rankings = await _lodestone.get_grand_company_ranking_pages(_config.world_name)
+    else:
+        # The merged result is as old as its oldest pages.
+        fetched_at = _partial_gc_rankings_fetched_at
+        retried = await _lodestone.get_grand_company_ranking_pages(
+            _config.world_name, partial.missing_pages
+        )
+        gc_rankings = partial.merge(retried)
+
+    _partial_gc_rankings = None if gc_rankings.complete else gc_rankings
+    _partial_gc_rankings_fetched_at = fetched_at
+    return gc_rankings
+
+
 async def start_new_competition():
-    fc_ranks = _lodestone.get_top_100_free_company_rankings(_config.data_center)
-    our_fc_ranking = next(
-        (r for r in fc_ranks if r.ffxiv_id == _config.free_company_id), None
+    global _partial_gc_rankings
+    # Rankings cached during the last competition must not count towards this one.
+    _lodestone.invalidate_rankings()
+    our_fc_ranking = await _lodestone.get_free_company_standing(
+        _config.free_company_id, _config.data_center
     )
+    check_deadline()
+    _partial_gc_rankings = None
     _db.delete_all_contracts()
     _db.delete_all_participants()
     return our_fc_ranking.seals_earned if our_fc_ranking else 0
 
 
+async def sync_roster() -> Tuple[RosterDiff, list[Participant]]:
+    """Records how the FC roster changed since the last sync, and drops participants
+    whose character has left the FC, along with their contracts.
+
+    Only the changes are written, so a sync of an unchanged roster writes nothing.
+    Returns the changes and the participants that were dropped.
+    """
+    fc_id = _config.free_company_id
+    members = await _lodestone.get_free_company_members(fc_id)
+    diff = RosterDiff.between(_db.get_fc_roster(fc_id), members)
+    if not diff.changed:
+        return diff, []
+
+    check_deadline()
+    _db.apply_roster_diff(fc_id, diff, time.time())
+
+    departed_names = {member.name for member in diff.left}
+    dropped = [
+        participant
+        for participant in _db.get_all_participants()
+        if f"{participant.first_name} {participant.last_name}" in departed_names
+    ]
+    for participant in dropped:
+        _db.delete_participant(participant.discord_id)
+        _db.delete_contract(participant.discord_id)
+    return diff, dropped
+
+
 async def get_all_participants() -> list[Participant]:
     return _db.get_all_participants()
 
@@ -0,0 +1,145 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import random
+import threading
+import time
+from typing import Callable
+
+import requests
+
+from deadlines import current_deadline
+from domain import DeadlineExceededException
+
+# 503 is what the Lodestone sends during maintenance, but also when it sheds load, so
+# it is treated as throttling alongside 429.
+_THROTTLED_STATUSES = {429, 503}
+
+
+def parse_retry_after(value: str | None, now: datetime | None = None) -> float | None:
+    """Reads a Retry-After header given either as seconds or as an HTTP date."""
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = now or datetime.now(timezone.utc)
+    return max((retry_at - now).total_seconds(), 0.0)
+
+
+class AdaptiveRateLimiter:
+    """Token bucket in front of all Lodestone traffic that adapts to throttling.
+
+    Requests draw a token each; tokens refill at `rate` per second up to `burst`.
+    Whenever the Lodestone throttles us the rate is halved, and every successful
+    request gives a little of it back (up to max_rate), so the limiter settles just
+    below the rate the Lodestone tolerates. Throttled and failed requests are retried
+    with jittered exponential backoff, or after Retry-After when the server says so;
+    the pause applies to every request, not just the retried one. One limiter is
+    meant to be shared by everything that talks to the Lodestone.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5,
+        burst: int = 10,
+        min_rate: float = 0.5,
+        max_rate: float | None = None,
+        rate_increase: float = 0.1,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        max_backoff: float = 30,
+        timer=time.monotonic,
+        sleep=time.sleep,
+        jitter=random.uniform,
+    ):
+        self._rate = rate
+        self._burst = burst
+        self._min_rate = min_rate
+        self._max_rate = rate if max_rate is None else max_rate
+        self._rate_increase = rate_increase
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._max_backoff = max_backoff
+        self._timer = timer
+        self._sleep = sleep
+        self._jitter = jitter
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._refilled_at = timer()
+        self._blocked_until = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def acquire(self) -> None:
+        """Blocks until a request may be sent."""
+        while True:
+            with self._lock:
+                now = self._timer()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self._rate
+
+            deadline = current_deadline()
+            if deadline is not None and wait >= deadline.remaining():
+                raise DeadlineExceededException(
+                    "The deadline would pass before the Lodestone may be contacted"
+                )
+            self._sleep(wait)
+
+    def throttled(self) -> None:
+        with self._lock:
+            self._refill(self._timer())
+            self._rate = max(self._rate / 2, self._min_rate)
+            self._tokens = min(self._tokens, 0.0)
+
+    def pause(self, seconds: float) -> None:
+        """Holds back every request for the given time, capped at max_backoff."""
+        with self._lock:
+            self._blocked_until = max(
+                self._blocked_until, self._timer() + min(seconds, self._max_backoff)
+            )
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self._refill(self._timer())
+            self._rate = min(self._rate + self._rate_increase, self._max_rate)
+
+    def send(self, request: Callable[[], requests.Response]) -> requests.Response:
+        """Sends a request through the limiter, retrying throttling and server errors.
+
+        The last response is returned once retries run out, so callers still see and
+        report the final error status themselves.
+        """
+        for attempt in range(self._max_retries + 1):
+            self.acquire()
+            response = request()
+
+            if response.status_code < 500 and response.status_code != 429:
+                self.succeeded()
+                return response
+            if response.status_code in _THROTTLED_STATUSES:
+                self.throttled()
+            if attempt == self._max_retries:
+                return response
+
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = self._jitter(0, self._backoff_base * 2**attempt)
+            self.pause(delay)
+            response.close()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(now - self._refilled_at, 0.0)
+        self._tokens = min(self._tokens + elapsed * self._rate, float(self._burst))
+        self._refilled_at = now
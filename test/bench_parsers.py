@@ -0,0 +1,81 @@
+"""Compares the speed of the page parser backends on Lodestone-sized pages.
+
+Run with `python -m test.bench_parsers`. Every backend must return records identical
+to the html.parser reference, otherwise the benchmark fails before timing anything.
+Peak memory is measured with tracemalloc and so only covers Python allocations.
+"""
+
+import argparse
+from test.fake_pages import *
+import timeit
+import tracemalloc
+
+from domain import FCMember, FreeCompany, FreeCompanyRanking, GrandCompanyRanking
+from parsing import PARSER_BACKENDS, HtmlParserBackend, get_page_parser
+
+
+def build_pages(rows: int) -> dict[str, bytes]:
+    members = [FCMember(str(i), f"Member Number{i}", "Member") for i in range(rows)]
+    gc_rankings = [
+        GrandCompanyRanking(str(i), f"Ranked Player{i}", i + 1, 1000000 - i)
+        for i in range(rows)
+    ]
+    free_companies = [FreeCompany(str(i), f"Free Company {i}") for i in range(rows)]
+    fc_rankings = [
+        FreeCompanyRanking(str(i), f"Free Company {i}", i + 1, 5000000 - i)
+        for i in range(rows)
+    ]
+    pages = {
+        "parse_members_page": fake_members_page(members, max_pages=10),
+        "parse_gc_rankings_page": fake_gc_rankings_page(gc_rankings),
+        "parse_free_companies_page": fake_free_companies_page(
+            free_companies, "Siren", max_pages=10
+        ),
+        "parse_fc_rankings_page": fake_fc_rankings_page(fc_rankings),
+    }
+    return {
+        method: fake_lodestone_document(content).encode()
+        for method, content in pages.items()
+    }
+
+
+def peak_memory_kib(parse, body: bytes) -> float:
+    tracemalloc.start()
+    parse(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=100)
+    arg_parser.add_argument("--repeat", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    pages = build_pages(args.rows)
+    reference = HtmlParserBackend()
+    parsers = [get_page_parser(name) for name in PARSER_BACKENDS]
+
+    for method, body in pages.items():
+        expected = getattr(reference, method)(body)
+        for parser in parsers:
+            actual = getattr(parser, method)(body)
+            if actual != expected:
+                raise AssertionError(f"{parser.name} disagrees on {method}")
+
+    print(f"{'page':<28}" + "".join(f"{parser.name:>24}" for parser in parsers))
+    for method, body in pages.items():
+        columns = []
+        for parser in parsers:
+            parse = getattr(parser, method)
+            seconds = timeit.timeit(lambda: parse(body), number=args.repeat)
+            columns.append(
+                f"{seconds / args.repeat * 1000:>10.2f}ms"
+                f"{peak_memory_kib(parse, body):>10.0f}KiB"
+            )
+        print(f"{method:<28}" + "".join(columns))
+
+
+if __name__ == "__main__":
+    main()
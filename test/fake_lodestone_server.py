@@ -0,0 +1,275 @@
+"""A local stand-in for the Lodestone, for benchmarking the scraper offline.
+
+Run with `python -m test.fake_lodestone_server`. It serves FC member, Grand Company
+ranking, FC search, FC profile, FC ranking and character pages built from the
+fake_pages generators, with as many members and ranked players as asked for, and can
+add latency and answer some requests with 429 or 5xx errors. With --bench, it scrapes
+itself and prints timings instead of serving until interrupted.
+"""
+
+import argparse
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import random
+from test.fake_pages import *
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+from domain import (
+    GC_RANKINGS_PER_PAGE,
+    CharacterProfile,
+    FCMember,
+    FreeCompany,
+    FreeCompanyRanking,
+    GrandCompanyRanking,
+)
+
+MEMBERS_PER_PAGE = 50
+FREE_COMPANIES_PER_PAGE = 20
+GC_RANKING_PAGES = 5
+FC_RANKINGS = 100
+
+
+class FakeLodestone:
+    """Generates the pages of a made-up Lodestone and decides how to answer requests.
+
+    Every FC has `members` members, every world has `ranked_players` players in its
+    GC rankings and `free_companies` FCs in its search results, and every data center
+    has a full top 100. Pages are rendered on first request and then reused.
+    """
+
+    def __init__(
+        self,
+        members: int = 200,
+        ranked_players: int = GC_RANKINGS_PER_PAGE * GC_RANKING_PAGES,
+        free_companies: int = 50,
+        latency: float = 0,
+        latency_jitter: float = 0,
+        throttle_rate: float = 0,
+        error_rate: float = 0,
+        retry_after: int = 1,
+        seed: int | None = None,
+    ):
+        self.members = members
+        self.ranked_players = ranked_players
+        self.free_companies = free_companies
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+
+    def respond(self, path: str, query: dict[str, str]) -> tuple[int, dict, bytes]:
+        """Returns the status, headers and body to answer a request with."""
+        with self._lock:
+            self.requests += 1
+            roll = self._random.random()
+            delay = self.latency + self._random.uniform(0, self.latency_jitter)
+            if roll < self.throttle_rate:
+                self.throttled += 1
+                status = 429
+            elif roll < self.throttle_rate + self.error_rate:
+                self.errors += 1
+                status = 503
+            else:
+                status = 200
+
+        time.sleep(delay)
+        if status == 429:
+            return 429, {"Retry-After": str(self.retry_after)}, b""
+        if status != 200:
+            return status, {}, b""
+
+        content = self._page(path, tuple(sorted(query.items())))
+        if content is None:
+            return 404, {}, b""
+        return 200, {"Content-Type": "text/html; charset=utf-8"}, content
+
+    @lru_cache(maxsize=1024)
+    def _page(self, path: str, query: tuple) -> bytes | None:
+        query = dict(query)
+        parts = path.strip("/").split("/")
+        if parts[:2] == ["lodestone", "freecompany"] and len(parts) == 4:
+            content = self._members_page(parts[2], int(query.get("page", 1)))
+        elif parts[:2] == ["lodestone", "character"] and len(parts) == 3:
+            content = fake_character_page(
+                CharacterProfile(
+                    parts[2], f"Ranked Player{parts[2]}", "Siren", "Aether", "1"
+                )
+            )
+        elif parts[:2] == ["lodestone", "freecompany"] and len(parts) == 3:
+            # Every FC is ranked first in its data center's top 100.
+            content = fake_free_company_page(f"Free Company {parts[2]}", weekly_rank=1)
+        elif parts == ["lodestone", "freecompany"]:
+            content = self._free_companies_page(
+                query.get("worldname", ""), int(query.get("page", 1))
+            )
+        elif parts == ["lodestone", "ranking", "gc", "weekly"]:
+            content = self._gc_rankings_page(
+                query.get("worldname", ""), int(query.get("page", 1))
+            )
+        elif parts == ["lodestone", "ranking", "fc", "weekly"]:
+            content = self._fc_rankings_page(query.get("dcgroup", ""))
+        else:
+            return None
+        return fake_lodestone_document(content).encode()
+
+    def _members_page(self, fc_id: str, page: int) -> str:
+        max_pages = max((self.members + MEMBERS_PER_PAGE - 1) // MEMBERS_PER_PAGE, 1)
+        first = (page - 1) * MEMBERS_PER_PAGE
+        members = [
+            FCMember(f"{fc_id}{i}", f"Member Number{i}", "Member")
+            for i in range(first, min(first + MEMBERS_PER_PAGE, self.members))
+        ]
+        return fake_members_page(members, page=page, max_pages=max_pages)
+
+    def _gc_rankings_page(self, world: str, page: int) -> str:
+        first = (page - 1) * GC_RANKINGS_PER_PAGE + 1
+        last = min(page * GC_RANKINGS_PER_PAGE, self.ranked_players)
+        return fake_gc_rankings_page(
+            GrandCompanyRanking(
+                f"{world}{rank}", f"Ranked Player{rank}", rank, 10**7 - rank
+            )
+            for rank in range(first, last + 1)
+        )
+
+    def _free_companies_page(self, world: str, page: int) -> str:
+        max_pages = max(
+            (self.free_companies + FREE_COMPANIES_PER_PAGE - 1)
+            // FREE_COMPANIES_PER_PAGE,
+            1,
+        )
+        first = (page - 1) * FREE_COMPANIES_PER_PAGE
+        free_companies = [
+            FreeCompany(f"{world}{i}", f"Free Company {i}")
+            for i in range(
+                first, min(first + FREE_COMPANIES_PER_PAGE, self.free_companies)
+            )
+        ]
+        return fake_free_companies_page(
+            free_companies, world, page=page, max_pages=max_pages
+        )
+
+    def _fc_rankings_page(self, data_center: str) -> str:
+        return fake_fc_rankings_page(
+            FreeCompanyRanking(
+                f"{data_center}{rank}", f"Free Company {rank}", rank, 10**8 - rank
+            )
+            for rank in range(1, FC_RANKINGS + 1)
+        )
+
+
+def serve(lodestone: FakeLodestone, port: int = 0) -> ThreadingHTTPServer:
+    """Starts serving the fake Lodestone on a background thread.
+
+    The returned server's `server_address` has the port actually used; call its
+    shutdown() to stop it.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            status, headers, body = lodestone.respond(url.path, query)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="fake-lodestone", daemon=True
+    ).start()
+    return server
+
+
+def benchmark(base_url: str, repeat: int, max_concurrency: int) -> None:
+    from lodestone import LodestoneScraper
+    from rate_limiting import AdaptiveRateLimiter
+
+    targets = [
+        ("get_free_company_members", "1"),
+        ("get_grand_company_rankings", "Siren"),
+        ("search_free_companies", "Siren"),
+        ("get_top_100_free_company_rankings", "Aether"),
+    ]
+    for method, arg in targets:
+        # A new scraper each time, so that its result caches do not hide requests.
+        seconds = 0.0
+        for _ in range(repeat):
+            scraper = LodestoneScraper(
+                base_url,
+                max_concurrency=max_concurrency,
+                rate_limiter=AdaptiveRateLimiter(rate=1000, burst=100),
+            )
+            start = time.perf_counter()
+            getattr(scraper, method)(arg)
+            seconds += time.perf_counter() - start
+            scraper.close()
+        print(f"{method:<36}{seconds / repeat * 1000:>10.1f}ms")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--port", type=int, default=8080)
+    arg_parser.add_argument("--members", type=int, default=200)
+    arg_parser.add_argument(
+        "--ranked-players", type=int, default=GC_RANKINGS_PER_PAGE * GC_RANKING_PAGES
+    )
+    arg_parser.add_argument("--free-companies", type=int, default=50)
+    arg_parser.add_argument("--latency", type=float, default=0, help="seconds")
+    arg_parser.add_argument("--latency-jitter", type=float, default=0, help="seconds")
+    arg_parser.add_argument("--throttle-rate", type=float, default=0)
+    arg_parser.add_argument("--error-rate", type=float, default=0)
+    arg_parser.add_argument("--retry-after", type=int, default=1)
+    arg_parser.add_argument("--bench", action="store_true")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--max-concurrency", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    lodestone = FakeLodestone(
+        members=args.members,
+        ranked_players=args.ranked_players,
+        free_companies=args.free_companies,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+    )
+    server = serve(lodestone, 0 if args.bench else args.port)
+    host, port = server.server_address
+    base_url = f"http://{host}:{port}"
+
+    try:
+        if args.bench:
+            benchmark(base_url, args.repeat, args.max_concurrency)
+            print(
+                f"{lodestone.requests} requests, {lodestone.throttled} throttled, "
+                f"{lodestone.errors} failed"
+            )
+        else:
+            print(f"Serving a fake Lodestone at {base_url}")
+            threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""HTML generators that mimic the shape of real Lodestone pages."""
+
+from domain import CharacterProfile, FreeCompany, FreeCompanyRanking, GrandCompanyRanking
+
+
+def fake_member_entry(member):
+    return f"""
+    <li class='entry'><a href='/lodestone/character/{member.ffxiv_id}/' class='entry__bg'>
+      <div class='entry__flex'>
+        <div class='entry__freecompany__center'><p class='entry__name'>{member.name}</p>
+          <ul class='entry__freecompany__info'>
+            <li><img src='img-url' width='20'
+                    height='20' alt=''><span>{member.rank}</span></li>
+          </ul>
+        </div>
+      </div>
+    </a></li>
+  """
+
+
+def fake_members_page(members, page=1, max_pages=1):
+    member_entries = "\n".join(fake_member_entry(member) for member in members)
+    return f"""
+    <body>
+      <ul class='btn__pager'>
+        <li class='btn__pager__current'>Page {page} of {max_pages}</li>
+      </ul>
+      <ul>
+        {member_entries}
+      </ul>
+    </body>
+    """
+
+
+def fake_gc_ranking_row(ranking: GrandCompanyRanking):
+    return f"""
+    <tr data-href='/lodestone/character/{ranking.character_id}/' class='clickable'>
+      <td class='ranking-character__number											'> {ranking.rank} </td>
+      <td class='ranking-character__face'> <img
+          src='https://img2.finalfantasyxiv.com/f/ba64ef52323ad0c23edaa3bafc9f4e82_58a84e851e55175d22158ca97af58a1ffc0_96x96.jpg?1702063037'
+          width='50' height='50' alt=''> </td>
+      <td class='ranking-character__info'>
+        <h4>{ranking.character_name}</h4>
+        <p><i class='xiv-lds xiv-lds-home-world js__tooltip' data-tooltip='Home World'></i>Siren [Aether]</p>
+      </td>
+      <td class='ranking-character__gcrank'> <img
+          src='https://lds-img.finalfantasyxiv.com/h/V/tKlwWMAtNLAumnqjI8iNPnMKHc.png' width='32' height='32'
+          alt='Immortal Flames/Flame Captain' class='js__tooltip' data-tooltip='Immortal Flames/Flame Captain'> </td>
+      <td class='ranking-character__value'> {ranking.seals} </td>
+    </tr>
+  """
+
+
+def fake_gc_rankings_page(rankings):
+    ranking_rows = "\n".join(fake_gc_ranking_row(ranking) for ranking in rankings)
+    return f"""
+      <table>
+        <tbody>
+          {ranking_rows}
+        </tbody>
+      </table>
+    """
+
+
+def fake_free_company_entry(free_company: FreeCompany, world):
+    return f"""
+      <div class='entry'>
+        <a href='/lodestone/freecompany/{free_company.id}/' class='entry__block'>
+          <div class='entry__freecompany__inner'>
+            <div class='entry__freecompany__box'>
+              <p class='entry__world'>Maelstrom</p>
+              <p class='entry__name'>{free_company.name}</p>
+              <p class='entry__world'><i class='xiv-lds xiv-lds-home-world js__tooltip' data-tooltip='Home World'></i>{world}
+                [Aether]</p>
+            </div>
+          </div>
+          <ul class='entry__freecompany__fc-data clearix'>
+            <li class='entry__freecompany__fc-member'>35</li>
+            <li class='entry__freecompany__fc-housing'>Estate Built</li>
+            <li class='entry__freecompany__fc-day'><span id='datetime-f106dabe182'>09/20/2021</span>
+              <script>document.getElementById('datetime-f106dabe182').innerHTML = ldst_strftime(1632175472, 'YMD');</script>
+            </li>
+            <li class='entry__freecompany__fc-active'>Active: Always</li>
+            <li class='entry__freecompany__fc-active'>Recruitment: Open</li>
+          </ul>
+        </a>
+      </div>
+    """
+
+
+def fake_free_companies_page(fcs, world, page=1, max_pages=None):
+    fc_html_elems = [fake_free_company_entry(free_company, world) for free_company in fcs]
+    pager = (
+        ""
+        if max_pages is None
+        else f"""
+      <ul class='btn__pager'>
+        <li class='btn__pager__current'>Page {page} of {max_pages}</li>
+      </ul>"""
+    )
+    return f"""
+    <div>{pager}
+      {''.join(fc_html_elems)}
+    </div>
+  """
+
+
+def fake_fc_ranking_row(ranking: FreeCompanyRanking):
+    return f"""
+    <tr data-href='/lodestone/freecompany/{ranking.ffxiv_id}/' class='clickable'>
+      <td class="ranking-character__number ranking-character__up">{ranking.rank}</td>
+      <td class='ranking-character__info ranking-character__info-freecompany'>
+        <h4>{ranking.name}</h4>
+      </td>
+      <td class='ranking-character__value'>{ranking.seals_earned}</td>
+    </tr>
+  """
+
+
+def fake_fc_rankings_page(rankings):
+    ranking_rows = "\n".join(fake_fc_ranking_row(ranking) for ranking in rankings)
+    return f"""
+          <table class="ranking-character ranking-character__freecompany js--ranking" cellpadding="0" cellspacing="0">
+            <tbody>
+              {ranking_rows}
+              </tr>
+            </tbody>
+          </table>
+        """
+
+
+def fake_free_company_page(name, weekly_rank=None, monthly_rank=None):
+    def rank(value):
+        return "--" if value is None else value
+
+    return f"""
+    <div class='ldst__window'>
+      <h2 class='heading--lead'>Company Profile</h2>
+      <p class='freecompany__text__name'>{name}</p>
+      <h3 class='heading--lead'>Ranking</h3>
+      <table class='character__ranking__data parts__space--reset'>
+        <tr><th>Weekly Rank：{rank(weekly_rank)} (Previous Week：--)</th></tr>
+        <tr><th>Monthly Rank：{rank(monthly_rank)} (Previous Month：--)</th></tr>
+      </table>
+      <table class='ranking-character__summary'><tr><th>Rank：8</th></tr></table>
+    </div>
+    """
+
+
+def fake_character_page(profile: CharacterProfile, fc_name="Free Company"):
+    free_company = (
+        ""
+        if profile.free_company_id is None
+        else f"""
+      <div class='character__freecompany__name'>
+        <p>Free Company</p>
+        <h4><a href='/lodestone/freecompany/{profile.free_company_id}/'>{fc_name}</a></h4>
+      </div>"""
+    )
+    return f"""
+    <div class='frame__chara__box'>
+      <p class='frame__chara__title'>Warrior of Light</p>
+      <p class='frame__chara__name'>{profile.name}</p>
+      <p class='frame__chara__world'><i class='xiv-lds xiv-lds-home-world js__tooltip'
+          data-tooltip='Home World'></i>{profile.world} [{profile.data_center}]</p>
+    </div>
+    <div class='character__profile__data'>
+      <div class='character-block__box'>
+        <p class='character-block__title'>Grand Company</p>
+        <p class='character-block__name'>Immortal Flames / Flame Captain</p>
+      </div>{free_company}
+    </div>
+    """
+
+
+def fake_lodestone_document(content, nav_links=200):
+    """Wraps page content in the kind of navigation, script and footer markup that
+    surrounds the data on a real Lodestone page."""
+    nav_items = "\n".join(
+        f"<li class='nav__item'><a href='/lodestone/topics/{i}/'>Topic {i}</a></li>"
+        for i in range(nav_links)
+    )
+    return f"""
+    <html>
+      <head>
+        <meta charset='utf-8'>
+        <script>var ldst = {{ {", ".join(f"k{i}: {i}" for i in range(nav_links))} }};</script>
+      </head>
+      <body>
+        <nav><ul class='nav'>{nav_items}</ul></nav>
+        <div class='ldst__contents'>{content}</div>
+        <footer>
+          <table class='footer__links'><tr><td>Terms</td><td>Privacy</td></tr></table>
+          <ul class='footer__nav'>{nav_items}</ul>
+        </footer>
+      </body>
+    </html>
+    """
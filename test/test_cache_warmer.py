@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+import unittest
+
+from cache_warmer import *
+
+
+class FakeScraper:
+    def __init__(self, failing_method: str = None):
+        self.calls = []
+        self.failing_method = failing_method
+
+    async def refresh(self, method: str, *args):
+        self.calls.append((method, *args))
+        if method == self.failing_method:
+            raise RuntimeError("The Lodestone appears to be down")
+
+    async def expire_http_cache(self):
+        self.calls.append(("expire_http_cache",))
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+class TestNextWeeklyReset(unittest.TestCase):
+    def test_later_in_the_week(self):
+        # Saturday 2024-10-05
+        self.assertEqual(next_weekly_reset(utc(2024, 10, 5, 12)), utc(2024, 10, 8, 8, 5))
+
+    def test_same_day_before_the_reset(self):
+        self.assertEqual(next_weekly_reset(utc(2024, 10, 8, 7)), utc(2024, 10, 8, 8, 5))
+
+    def test_same_day_after_the_reset(self):
+        self.assertEqual(
+            next_weekly_reset(utc(2024, 10, 8, 8, 5)), utc(2024, 10, 15, 8, 5)
+        )
+
+
+class TestCacheWarmer(unittest.IsolatedAsyncioTestCase):
+    def warmer(self, scraper, now=utc(2024, 10, 5, 12)):
+        return CacheWarmer(scraper, "fc_id", "Siren", "Aether", 240, now=lambda: now)
+
+    async def test_warm_refreshes_every_target(self):
+        scraper = FakeScraper()
+        await self.warmer(scraper).warm()
+        self.assertEqual(
+            scraper.calls,
+            [
+                ("get_free_company_members", "fc_id"),
+                ("get_grand_company_ranking_pages", "Siren"),
+                ("get_top_100_free_company_rankings", "Aether"),
+            ],
+        )
+
+    async def test_warm_after_reset_expires_stored_pages_first(self):
+        scraper = FakeScraper()
+        await self.warmer(scraper).warm(after_reset=True)
+        self.assertEqual(scraper.calls[0], ("expire_http_cache",))
+        self.assertEqual(len(scraper.calls), 4)
+
+    async def test_failures_are_logged_and_do_not_stop_warming(self):
+        scraper = FakeScraper(failing_method="get_free_company_members")
+        with self.assertLogs("ffxivbot", level="WARNING"):
+            await self.warmer(scraper).warm()
+        self.assertEqual(len(scraper.calls), 3)
+
+    def test_next_run_follows_the_interval(self):
+        self.assertEqual(self.warmer(FakeScraper()).next_run(), (240, False))
+
+    def test_next_run_lands_on_the_reset(self):
+        warmer = self.warmer(FakeScraper(), now=utc(2024, 10, 8, 8, 2))
+        self.assertEqual(warmer.next_run(), (180, True))
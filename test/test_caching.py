@@ -0,0 +1,278 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import unittest
+
+from caching import *
+from deadlines import current_deadline, deadline
+from domain import DeadlineExceededException
+
+
+class FakeTimer:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Loader:
+    """Returns 1, 2, 3, ... on successive loads, optionally blocking until released."""
+
+    def __init__(self, block: bool = False):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self) -> int:
+        self.calls += 1
+        self.started.set()
+        self.release.wait(timeout=5)
+        return self.calls
+
+
+class TestStaleWhileRevalidateCache(unittest.TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.cache = StaleWhileRevalidateCache(
+            maxsize=10, ttl=60, max_stale=600, timer=self.timer
+        )
+
+    def wait_for_refresh(self):
+        for thread in threading.enumerate():
+            if thread.name == "cache-refresh":
+                thread.join(timeout=5)
+
+    def test_should_load_on_miss_and_serve_fresh_hits(self):
+        load = Loader()
+        self.assertEqual(self.cache.get("key", load), 1)
+        self.timer.now += 59
+        self.assertEqual(self.cache.get("key", load), 1)
+        self.assertEqual(load.calls, 1)
+
+    def test_should_serve_stale_value_without_waiting_for_refresh(self):
+        load = Loader()
+        self.cache.get("key", load)
+        self.timer.now += 60
+
+        slow_load = Loader(block=True)
+        self.assertEqual(self.cache.get("key", slow_load), 1)
+        self.assertTrue(slow_load.started.wait(timeout=5))
+        slow_load.release.set()
+        self.wait_for_refresh()
+
+        self.assertEqual(self.cache.get("key", load), 1)
+        self.assertEqual(load.calls, 1)
+        self.assertEqual(slow_load.calls, 1)
+
+    def test_should_refresh_each_key_once_at_a_time(self):
+        self.cache.get("key", Loader())
+        self.timer.now += 60
+
+        slow_load = Loader(block=True)
+        for _ in range(5):
+            self.cache.get("key", slow_load)
+        self.assertTrue(slow_load.started.wait(timeout=5))
+        slow_load.release.set()
+        self.wait_for_refresh()
+        self.assertEqual(slow_load.calls, 1)
+
+    def test_should_wait_for_a_load_past_max_stale(self):
+        self.cache.get("key", Loader())
+        self.timer.now += 660
+
+        load = Loader()
+        load.calls = 41
+        self.assertEqual(self.cache.get("key", load), 42)
+
+    def test_failed_refresh_should_keep_serving_stale_value(self):
+        self.cache.get("key", Loader())
+        self.timer.now += 60
+
+        def failing_load():
+            raise RuntimeError("The Lodestone appears to be down")
+
+        with self.assertLogs("ffxivbot", level="WARNING"):
+            self.assertEqual(self.cache.get("key", failing_load), 1)
+            self.wait_for_refresh()
+
+        load = Loader()
+        load.calls = 9
+        self.assertEqual(self.cache.get("key", load), 1)
+        self.wait_for_refresh()
+        self.assertEqual(self.cache.get("key", load), 10)
+
+    def test_refresh_replaces_a_fresh_entry(self):
+        self.cache.get("key", Loader())
+        load = Loader()
+        load.calls = 4
+        self.assertEqual(self.cache.refresh("key", load), 5)
+        self.assertEqual(self.cache.get("key", Loader()), 5)
+
+    def test_clear(self):
+        self.cache.get("key", Loader())
+        self.cache.clear()
+        load = Loader()
+        load.calls = 6
+        self.assertEqual(self.cache.get("key", load), 7)
+
+
+class TestSingleFlightLoads(unittest.TestCase):
+    def setUp(self):
+        self.cache = StaleWhileRevalidateCache(maxsize=10, ttl=60, max_stale=0)
+
+    def test_concurrent_misses_should_share_one_load(self):
+        load = Loader(block=True)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = [executor.submit(self.cache.get, "key", load) for _ in range(8)]
+            self.assertTrue(load.started.wait(timeout=5))
+            load.release.set()
+            self.assertEqual([result.result() for result in results], [1] * 8)
+        self.assertEqual(load.calls, 1)
+
+    def test_concurrent_misses_should_share_one_failure(self):
+        calls = []
+        release = threading.Event()
+
+        def failing_load():
+            calls.append(1)
+            release.wait(timeout=5)
+            raise RuntimeError("The Lodestone appears to be down")
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = [
+                executor.submit(self.cache.get, "key", failing_load) for _ in range(4)
+            ]
+            release.set()
+            for result in results:
+                with self.assertRaises(RuntimeError):
+                    result.result()
+        self.assertEqual(len(calls), 1)
+
+    def test_a_waiter_should_not_share_the_loaders_deadline(self):
+        load = Loader(block=True)
+
+        def get_within(seconds):
+            with deadline(seconds):
+                return self.cache.get("key", load)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(get_within, 0.1)
+            self.assertTrue(load.started.wait(timeout=5))
+            second = executor.submit(get_within, 60)
+            with self.assertRaises(DeadlineExceededException):
+                first.result()
+            load.release.set()
+            self.assertEqual(second.result(), 1)
+        self.assertEqual(load.calls, 1)
+
+    def test_a_waiter_should_stop_waiting_at_its_own_deadline(self):
+        load = Loader(block=True)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            first = executor.submit(self.cache.get, "key", load)
+            self.assertTrue(load.started.wait(timeout=5))
+            with deadline(0.05):
+                with self.assertRaises(DeadlineExceededException):
+                    self.cache.get("key", load)
+            load.release.set()
+            self.assertEqual(first.result(), 1)
+
+    def test_loads_should_run_without_a_deadline(self):
+        deadlines = []
+
+        def load():
+            deadlines.append(current_deadline())
+            return 1
+
+        with deadline(60):
+            self.cache.get("key", load)
+        self.assertEqual(deadlines, [None])
+
+    def test_should_load_again_after_a_failure(self):
+        def failing_load():
+            raise RuntimeError("The Lodestone appears to be down")
+
+        with self.assertRaises(RuntimeError):
+            self.cache.get("key", failing_load)
+        self.assertEqual(self.cache.get("key", Loader()), 1)
+
+    def test_different_keys_should_load_independently(self):
+        self.assertEqual(self.cache.get("Siren", Loader()), 1)
+        self.assertEqual(self.cache.get("Gilgamesh", Loader()), 1)
+
+
+class TestCacheStats(unittest.TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.cache = StaleWhileRevalidateCache(
+            maxsize=2, ttl=60, max_stale=0, timer=self.timer
+        )
+
+    def test_hits_and_misses(self):
+        self.cache.get("Siren", Loader())
+        self.cache.get("Siren", Loader())
+        self.cache.get("Gilgamesh", Loader())
+        self.assertEqual(self.cache.stats(), CacheStats(1, 2, 0, 2))
+
+    def test_evictions_count_full_and_expired_entries(self):
+        for world in ["Siren", "Gilgamesh", "Cactuar"]:
+            self.cache.get(world, Loader())
+        self.assertEqual(self.cache.stats().evictions, 1)
+        self.timer.now += 60
+        self.assertEqual(self.cache.stats(), CacheStats(0, 3, 3, 0))
+
+    def test_clearing_is_not_an_eviction(self):
+        self.cache.get("Siren", Loader())
+        self.cache.clear()
+        self.assertEqual(self.cache.stats(), CacheStats(0, 1, 0, 0))
+
+
+class Scraper:
+    def __init__(self, caches: CacheManager):
+        self.caches = caches
+        self.calls = []
+
+    @cached_method("rankings")
+    def lookup(self, world, page=1):
+        self.calls.append((world, page))
+        return f"{world}:{page}"
+
+
+class TestCacheManager(unittest.TestCase):
+    def setUp(self):
+        self.caches = CacheManager()
+        self.caches.register("rankings", ttl=60)
+        self.caches.register("members", ttl=60)
+        self.scraper = Scraper(self.caches)
+
+    def test_should_key_on_arguments_after_self(self):
+        self.assertEqual(self.scraper.lookup("Siren"), "Siren:1")
+        self.assertEqual(self.scraper.lookup("Siren"), "Siren:1")
+        self.assertEqual(self.scraper.lookup("Siren", page=2), "Siren:2")
+        self.assertEqual(Scraper(self.caches).lookup("Siren"), "Siren:1")
+        self.assertEqual(self.scraper.calls, [("Siren", 1), ("Siren", 2)])
+
+    def test_refresh(self):
+        self.scraper.lookup("Siren")
+        self.assertEqual(Scraper.lookup.refresh(self.scraper, "Siren"), "Siren:1")
+        self.assertEqual(len(self.scraper.calls), 2)
+
+    def test_invalidate_one_entry(self):
+        self.scraper.lookup("Siren")
+        self.scraper.lookup("Gilgamesh")
+        self.caches.invalidate("rankings", "Siren")
+        self.scraper.lookup("Siren")
+        self.scraper.lookup("Gilgamesh")
+        self.assertEqual(len(self.scraper.calls), 3)
+
+    def test_invalidate_a_namespace(self):
+        self.caches["members"].get("key", Loader())
+        self.scraper.lookup("Siren")
+        self.caches.invalidate("rankings")
+        self.assertEqual(self.caches.stats()["rankings"].size, 0)
+        self.assertEqual(self.caches.stats()["members"].size, 1)
+
+    def test_namespaces_are_registered_once(self):
+        with self.assertRaises(ValueError):
+            self.caches.register("rankings")
@@ -0,0 +1,107 @@
+import io
+import threading
+import time
+import unittest
+
+import requests
+
+from circuit_breaker import *
+
+
+def fake_response(status_code: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(b"")
+    return response
+
+
+class ControlledSleep:
+    """Lets a test decide when the background probe wakes up."""
+
+    def __init__(self):
+        self.sleeping = threading.Semaphore(0)
+        self.wake = threading.Semaphore(0)
+
+    def __call__(self, seconds: float) -> None:
+        self.sleeping.release()
+        self.wake.acquire(timeout=5)
+
+    def next_probe(self) -> None:
+        self.wait_until_sleeping()
+        self.wake.release()
+
+    def wait_until_sleeping(self) -> None:
+        if not self.sleeping.acquire(timeout=5):
+            raise AssertionError("the probe never went to sleep")
+
+
+class Endpoint:
+    def __init__(self, *statuses: int):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def __call__(self) -> requests.Response:
+        self.calls += 1
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if status == 0:
+            raise requests.Timeout()
+        return fake_response(status)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.sleep = ControlledSleep()
+        self.breaker = CircuitBreaker("members", failure_threshold=3, sleep=self.sleep)
+
+    def trip(self):
+        endpoint = Endpoint(500)
+        for _ in range(3):
+            self.breaker.call(endpoint)
+        self.sleep.wait_until_sleeping()
+
+    def test_successes_keep_the_circuit_closed(self):
+        endpoint = Endpoint(200, 500, 500, 200, 500, 500)
+        for _ in range(6):
+            self.breaker.call(endpoint)
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    def test_client_errors_are_not_failures(self):
+        for _ in range(5):
+            self.breaker.call(Endpoint(404))
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    def test_consecutive_failures_open_the_circuit(self):
+        self.trip()
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+    def test_timeouts_count_as_failures(self):
+        endpoint = Endpoint(0)
+        for _ in range(3):
+            with self.assertRaises(requests.Timeout):
+                self.breaker.call(endpoint)
+        self.sleep.wait_until_sleeping()
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+    def test_open_circuit_fails_fast(self):
+        self.trip()
+        endpoint = Endpoint(200)
+        with self.assertRaises(CircuitOpenException):
+            self.breaker.call(endpoint)
+        self.assertEqual(endpoint.calls, 0)
+
+    def test_successful_probe_closes_the_circuit(self):
+        endpoint = Endpoint(500, 500, 500, 500, 200)
+        for _ in range(3):
+            self.breaker.call(endpoint)
+
+        self.sleep.next_probe()
+        self.sleep.wait_until_sleeping()
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+        self.sleep.wake.release()
+        for _ in range(100):
+            if self.breaker.state is CircuitState.CLOSED:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+        self.assertEqual(self.breaker.call(Endpoint(200)).status_code, 200)
@@ -135,3 +135,66 @@ class TestContracts(unittest.TestCase):
         self.db_client.delete_all_contracts()
         result = self.db_client.get_all_contracts()
         self.assertEqual(len(result), 0)
+
+
+class TestFcRoster(unittest.TestCase):
+    def setUp(self):
+        self.db_client = SqlLiteClient(":memory:")
+        self.leader = FCMember("1", "Kiryuin Satsuki", "Big Boss")
+        self.officer = FCMember("2", "Y'shtola Rhul", "Officer")
+
+    def test_should_apply_diffs_to_the_stored_roster(self):
+        self.db_client.apply_roster_diff(
+            "fc", RosterDiff.between([], [self.leader, self.officer]), 100
+        )
+        promoted = self.officer._replace(rank="Big Boss")
+        self.db_client.apply_roster_diff(
+            "fc", RosterDiff.between([self.leader, self.officer], [promoted]), 200
+        )
+
+        self.assertEqual(self.db_client.get_fc_roster("fc"), [promoted])
+        self.assertEqual(self.db_client.get_fc_roster("other fc"), [])
+
+    def test_should_log_each_change(self):
+        self.db_client.apply_roster_diff("fc", RosterDiff.between([], [self.leader]), 100)
+        self.db_client.apply_roster_diff(
+            "fc", RosterDiff.between([self.leader], [self.officer]), 200
+        )
+
+        self.assertEqual(
+            self.db_client.get_roster_changes("fc"),
+            [
+                RosterChange(
+                    "1", "Kiryuin Satsuki", RosterChangeKind.JOINED, None, "Big Boss", 100
+                ),
+                RosterChange(
+                    "2", "Y'shtola Rhul", RosterChangeKind.JOINED, None, "Officer", 200
+                ),
+                RosterChange(
+                    "1", "Kiryuin Satsuki", RosterChangeKind.LEFT, "Big Boss", None, 200
+                ),
+            ],
+        )
+        self.assertEqual(len(self.db_client.get_roster_changes("fc", since=150)), 2)
+
+    def test_should_store_new_names(self):
+        renamed = self.leader._replace(name="Kiryuin Ragyo")
+        self.db_client.apply_roster_diff("fc", RosterDiff.between([], [self.leader]), 100)
+        self.db_client.apply_roster_diff(
+            "fc", RosterDiff.between([self.leader], [renamed]), 200
+        )
+
+        self.assertEqual(self.db_client.get_fc_roster("fc"), [renamed])
+        self.assertEqual(
+            self.db_client.get_roster_changes("fc", since=150),
+            [
+                RosterChange(
+                    "1",
+                    "Kiryuin Ragyo",
+                    RosterChangeKind.RENAMED,
+                    "Big Boss",
+                    "Big Boss",
+                    200,
+                )
+            ],
+        )
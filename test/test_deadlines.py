@@ -0,0 +1,92 @@
+from test.request_mocking import register_fc_members
+import unittest
+
+import responses
+
+from deadlines import *
+from lodestone import AsyncLodestoneScraper, LodestoneScraper
+
+HOSTNAME = "some.lodestone.url.com"
+FC_ID = "fc_id"
+
+
+class TestDeadline(unittest.TestCase):
+    def test_no_deadline_by_default(self):
+        self.assertIsNone(current_deadline())
+        self.assertFalse(deadline_expired())
+        self.assertEqual(remaining_time(10), 10)
+
+    def test_remaining_time_is_capped_by_the_deadline(self):
+        with deadline(5):
+            self.assertLessEqual(remaining_time(10), 5)
+            self.assertEqual(remaining_time(1), 1)
+        self.assertIsNone(current_deadline())
+
+    def test_nested_deadlines_can_only_shorten(self):
+        with deadline(5) as outer:
+            with deadline(60) as inner:
+                self.assertIs(inner, outer)
+            with deadline(1) as inner:
+                self.assertLessEqual(inner.remaining(), 1)
+            self.assertIs(current_deadline(), outer)
+
+    def test_expired_deadline_raises(self):
+        with deadline(0):
+            self.assertTrue(deadline_expired())
+            with self.assertRaises(DeadlineExceededException):
+                check_deadline()
+            with self.assertRaises(DeadlineExceededException):
+                remaining_time(10)
+
+
+class TestScrapingUnderDeadline(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.scraper = LodestoneScraper("https://" + HOSTNAME)
+
+    def tearDown(self):
+        self.scraper.close()
+
+    @responses.activate
+    def test_expired_deadline_sends_no_request(self):
+        register_fc_members(HOSTNAME, FC_ID, [])
+        with deadline(0):
+            with self.assertRaises(DeadlineExceededException):
+                self.scraper.get_free_company_members(FC_ID)
+        self.assertEqual(len(responses.calls), 0)
+
+    @responses.activate
+    def test_cached_loads_run_without_the_callers_deadline(self):
+        seen = []
+
+        def page(request):
+            seen.append(current_deadline())
+            return 200, {}, ""
+
+        responses.add_callback(
+            responses.GET,
+            f"https://{HOSTNAME}/lodestone/ranking/gc/weekly",
+            callback=page,
+        )
+
+        with deadline(30):
+            self.scraper.get_grand_company_rankings("Siren")
+        self.assertEqual(seen, [None] * 5)
+
+    @responses.activate
+    async def test_deadline_reaches_page_workers(self):
+        seen = []
+
+        def page(request):
+            seen.append(current_deadline())
+            return 200, {}, ""
+
+        responses.add_callback(
+            responses.GET,
+            f"https://{HOSTNAME}/lodestone/ranking/gc/weekly",
+            callback=page,
+        )
+
+        scraper = AsyncLodestoneScraper(self.scraper)
+        with deadline(30) as expected:
+            await scraper.get_grand_company_ranking_pages("Siren")
+        self.assertEqual(seen, [expected] * 5)
@@ -0,0 +1,35 @@
+from test.fake_lodestone_server import FakeLodestone, serve
+import unittest
+
+from lodestone import LodestoneScraper
+from rate_limiting import AdaptiveRateLimiter
+
+
+class TestFakeLodestoneServer(unittest.TestCase):
+    def start(self, lodestone: FakeLodestone) -> LodestoneScraper:
+        server = serve(lodestone)
+        self.addCleanup(server.shutdown)
+        host, port = server.server_address
+        scraper = LodestoneScraper(
+            f"http://{host}:{port}",
+            rate_limiter=AdaptiveRateLimiter(rate=1000, burst=100, max_backoff=0),
+        )
+        self.addCleanup(scraper.close)
+        return scraper
+
+    def test_scraper_reads_every_page(self):
+        scraper = self.start(FakeLodestone(members=120, ranked_players=250))
+
+        members = scraper.get_free_company_members("42")
+        self.assertEqual([m.ffxiv_id for m in members], [f"42{i}" for i in range(120)])
+        rankings = scraper.get_grand_company_rankings("Siren")
+        self.assertEqual([r.rank for r in rankings], list(range(1, 251)))
+        self.assertEqual(len(scraper.get_top_100_free_company_rankings("Aether")), 100)
+        self.assertEqual(len(scraper.search_free_companies("Siren")), 50)
+
+    def test_injected_throttling_is_retried(self):
+        lodestone = FakeLodestone(throttle_rate=0.5, retry_after=0, seed=1)
+        scraper = self.start(lodestone)
+
+        self.assertEqual(len(scraper.get_top_100_free_company_rankings("Aether")), 100)
+        self.assertGreater(lodestone.throttled, 0)
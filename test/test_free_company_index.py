@@ -0,0 +1,35 @@
+import unittest
+
+from domain import FreeCompany
+from free_company_index import *
+
+
+class TestFreeCompanyIndex(unittest.TestCase):
+    def setUp(self):
+        self.free_companies = [
+            FreeCompany("1", "Moogle Mail"),
+            FreeCompany("2", "moogle mail"),
+            FreeCompany("3", "Moogles"),
+            FreeCompany("4", "Mog Station"),
+            FreeCompany("5", "Scions"),
+        ]
+        self.index = FreeCompanyIndex(self.free_companies)
+
+    def test_keeps_the_search_order(self):
+        self.assertEqual(self.index.free_companies, self.free_companies)
+        self.assertEqual(len(self.index), 5)
+
+    def test_lookup_ignores_case(self):
+        self.assertEqual(
+            self.index.lookup("MOOGLE MAIL"),
+            [self.free_companies[0], self.free_companies[1]],
+        )
+        self.assertEqual(self.index.lookup("Moogle"), [])
+
+    def test_complete_returns_names_in_order(self):
+        self.assertEqual([fc.id for fc in self.index.complete("moog")], ["1", "2", "3"])
+        self.assertEqual([fc.id for fc in self.index.complete("m", limit=2)], ["4", "1"])
+        self.assertEqual(self.index.complete("x"), [])
+
+    def test_empty_prefix_completes_everything(self):
+        self.assertEqual(len(self.index.complete("")), 5)
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+from http_cache import *
+
+
+class FakeTimer:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestHttpCache(unittest.TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.cache = HttpCache(":memory:", max_age=60, timer=self.timer)
+
+    def test_should_return_none_for_unknown_url(self):
+        self.assertIsNone(self.cache.get("https://lodestone/missing"))
+
+    def test_should_store_body_and_validators(self):
+        self.cache.put(
+            "https://lodestone/page",
+            b"<html></html>",
+            {"ETag": '"abc"', "Last-Modified": "Tue, 01 Oct 2024 00:00:00 GMT"},
+        )
+        cached = self.cache.get("https://lodestone/page")
+        self.assertEqual(cached.body, b"<html></html>")
+        self.assertEqual(
+            cached.conditional_headers(),
+            {
+                "If-None-Match": '"abc"',
+                "If-Modified-Since": "Tue, 01 Oct 2024 00:00:00 GMT",
+            },
+        )
+
+    def test_should_build_a_readable_response(self):
+        self.cache.put("https://lodestone/page", b"body", {"ETag": '"abc"'})
+        response = self.cache.get("https://lodestone/page").to_response()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"body")
+        self.assertEqual(response.headers["etag"], '"abc"')
+        self.assertEqual(b"".join(response.iter_content(2)), b"body")
+
+    def test_should_expire_after_max_age(self):
+        self.cache.put("https://lodestone/page", b"body", {})
+        self.assertTrue(self.cache.is_fresh(self.cache.get("https://lodestone/page")))
+        self.timer.now += 60
+        self.assertFalse(self.cache.is_fresh(self.cache.get("https://lodestone/page")))
+
+    def test_revalidation_should_refresh_and_keep_validators(self):
+        self.cache.put("https://lodestone/page", b"body", {"ETag": '"abc"'})
+        self.timer.now += 120
+        self.cache.revalidated("https://lodestone/page", {})
+        cached = self.cache.get("https://lodestone/page")
+        self.assertTrue(self.cache.is_fresh(cached))
+        self.assertEqual(cached.etag, '"abc"')
+        self.assertEqual(cached.body, b"body")
+
+    def test_expire_keeps_body_and_validators(self):
+        self.cache.put("https://lodestone/page", b"body", {"ETag": '"abc"'})
+        self.cache.expire()
+        cached = self.cache.get("https://lodestone/page")
+        self.assertFalse(self.cache.is_fresh(cached))
+        self.assertEqual(cached.etag, '"abc"')
+
+    def test_expire_only_matching_urls(self):
+        self.cache.put("https://lodestone/ranking?page=1", b"body", {})
+        self.cache.put("https://lodestone/members", b"body", {})
+        self.cache.expire("https://lodestone/ranking")
+        self.assertFalse(
+            self.cache.is_fresh(self.cache.get("https://lodestone/ranking?page=1"))
+        )
+        self.assertTrue(self.cache.is_fresh(self.cache.get("https://lodestone/members")))
+
+    def test_clear(self):
+        self.cache.put("https://lodestone/page", b"body", {})
+        self.cache.clear()
+        self.assertIsNone(self.cache.get("https://lodestone/page"))
+
+    def test_should_persist_across_instances(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.db")
+            HttpCache(path).put("https://lodestone/page", b"body", {})
+            self.assertEqual(HttpCache(path).get("https://lodestone/page").body, b"body")
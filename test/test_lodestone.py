@@ -1,10 +1,23 @@
+import re
 from test.request_mocking import *
+import threading
+import time
 import unittest
 
+import requests
 import responses
+from responses import matchers
 
-from domain import FreeCompanyRanking
+from domain import (
+    GC_RANKINGS_PER_PAGE,
+    CharacterProfile,
+    FreeCompanyRanking,
+    GrandCompanyRankingPages,
+)
+from http_cache import HttpCache
 from lodestone import *
+from rate_limiting import AdaptiveRateLimiter
+from traffic_archive import TrafficArchive
 
 HOSTNAME = "some.lodestone.url.com"
 FC_ID = "fc_id"
@@ -73,6 +86,98 @@ class TestGetFreeCompanyMembers(LodestoneScraperTestCase):
             page1_members + page2_members + page3_members,
         )
 
+    @responses.activate
+    def test_more_than_nine_pages(self):
+        pages = [[FCMember(f"id{p}", f"Member {p}", "Member")] for p in range(1, 13)]
+        for page_num, page_members in enumerate(pages, start=1):
+            register_fc_members(
+                HOSTNAME, FC_ID, page_members, page=page_num, max_pages=len(pages)
+            )
+
+        self.assertListEqual(
+            self.scraper.get_free_company_members(FC_ID),
+            [member for page_members in pages for member in page_members],
+        )
+
+    @responses.activate
+    def test_remaining_pages_respect_concurrency_cap(self):
+        scraper = LodestoneScraper("https://" + HOSTNAME, max_concurrency=2)
+        lock = threading.Lock()
+        in_flight = 0
+        max_in_flight = 0
+
+        def delayed_page(request):
+            nonlocal in_flight, max_in_flight
+            page_num = int(request.params["page"])
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            response = mock_fc_members_response(
+                HOSTNAME,
+                200,
+                FC_ID,
+                members=[FCMember(f"id{page_num}", f"Member {page_num}", "Member")],
+                page=page_num,
+                max_pages=6,
+            )
+            return 200, {}, response.body
+
+        register_fc_members(
+            HOSTNAME, FC_ID, [FCMember("id1", "Member 1", "Member")], max_pages=6
+        )
+        responses.add_callback(
+            responses.GET,
+            re.compile(
+                f"https://{HOSTNAME}/lodestone/freecompany/{FC_ID}/member\\?page="
+            ),
+            callback=delayed_page,
+        )
+
+        members = scraper.get_free_company_members(FC_ID)
+        self.assertEqual([m.ffxiv_id for m in members], [f"id{p}" for p in range(1, 7)])
+        self.assertLessEqual(max_in_flight, 2)
+
+    @responses.activate
+    def test_refresh_replaces_the_cached_result(self):
+        members = [FCMember("id", "Kiryuin Satsuki", "Big Boss")]
+        register_fc_members(HOSTNAME, FC_ID, [])
+        register_fc_members(HOSTNAME, FC_ID, members)
+
+        self.assertListEqual(self.scraper.get_free_company_members(FC_ID), [])
+        self.assertListEqual(
+            self.scraper.refresh("get_free_company_members", FC_ID), members
+        )
+        self.assertListEqual(self.scraper.get_free_company_members(FC_ID), members)
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_concurrent_callers_share_one_scrape(self):
+        members = [FCMember("id", "Kiryuin Satsuki", "Big Boss")]
+        body = mock_fc_members_response(HOSTNAME, 200, FC_ID, members=members).body
+
+        def slow_page(request):
+            time.sleep(0.05)
+            return 200, {}, body
+
+        responses.add_callback(
+            responses.GET,
+            f"https://{HOSTNAME}/lodestone/freecompany/{FC_ID}/member",
+            callback=slow_page,
+        )
+
+        callers = [
+            threading.Thread(target=self.scraper.get_free_company_members, args=(FC_ID,))
+            for _ in range(8)
+        ]
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join()
+        self.assertEqual(len(responses.calls), 1)
+
     @responses.activate
     def test_error_states(self):
         for status_code in [400, 404, 429, 500]:
@@ -124,6 +229,36 @@ class TestGetGrandCompanyRankings(LodestoneScraperTestCase):
             page1_rankings + page2_rankings + page3_rankings,
         )
 
+    @responses.activate
+    def test_pages_are_merged_in_rank_order_regardless_of_completion_order(self):
+        scraper = LodestoneScraper("https://" + HOSTNAME, max_concurrency=5)
+        page_rankings = {
+            page_num: [
+                GrandCompanyRanking(f"id{page_num}", f"Ranking {page_num}", page_num, 100)
+            ]
+            for page_num in range(1, 6)
+        }
+
+        def delayed_page(request):
+            page_num = int(request.params["page"])
+            # Earlier pages finish last so out-of-order completion would be visible.
+            time.sleep(0.02 * (5 - page_num))
+            response = mock_gc_rankings_response(
+                HOSTNAME, 200, WORLD_NAME, page_rankings[page_num], page_num
+            )
+            return 200, {}, response.body
+
+        responses.add_callback(
+            responses.GET,
+            re.compile(f"https://{HOSTNAME}/lodestone/ranking/gc/weekly"),
+            callback=delayed_page,
+        )
+
+        self.assertEqual(
+            scraper.get_grand_company_rankings(WORLD_NAME),
+            [ranking for page_num in range(1, 6) for ranking in page_rankings[page_num]],
+        )
+
     @responses.activate
     def test_error_states(self):
         for status_code in [400, 404, 429, 500]:
@@ -136,6 +271,233 @@ class TestGetGrandCompanyRankings(LodestoneScraperTestCase):
             )
 
 
+class TestGetGrandCompanyRankingPages(LodestoneScraperTestCase):
+
+    @responses.activate
+    def test_failed_pages_are_reported_as_missing(self):
+        rankings = [GrandCompanyRanking("id", "Kiryuin Satsuki", 1, 22000000)]
+        register_gc_page(HOSTNAME, WORLD_NAME, rankings, page_num=1)
+        register_empty_gc_pages(HOSTNAME, WORLD_NAME, start_page=2, pages=3)
+        register_gc_page(HOSTNAME, WORLD_NAME, [], page_num=4, status=500)
+        register_gc_page(HOSTNAME, WORLD_NAME, [], page_num=5)
+
+        with self.assertLogs("ffxivbot", level="WARNING"):
+            result = self.scraper.get_grand_company_ranking_pages(WORLD_NAME)
+        self.assertEqual(result.rankings, rankings)
+        self.assertEqual(result.missing_pages, [4])
+        self.assertFalse(result.complete)
+        self.assertEqual(result.missing_ranks(), [range(301, 401)])
+
+    @responses.activate
+    def test_missing_page_raises(self):
+        rankings = [GrandCompanyRanking("id", "Kiryuin Satsuki", 1, 22000000)]
+        register_gc_page(HOSTNAME, WORLD_NAME, rankings, page_num=1)
+        register_empty_gc_pages(HOSTNAME, WORLD_NAME, start_page=2, pages=3)
+        register_gc_page(HOSTNAME, WORLD_NAME, [], page_num=4, status=404)
+        register_gc_page(HOSTNAME, WORLD_NAME, [], page_num=5)
+
+        with self.assertRaises(LodestoneScraperException) as context:
+            self.scraper.get_grand_company_ranking_pages(WORLD_NAME)
+        self.assertEqual(context.exception.status_code, 404)
+
+    @responses.activate
+    def test_world_not_found_raises(self):
+        register_empty_gc_pages(HOSTNAME, WORLD_NAME, start_page=1, status=404)
+
+        with self.assertRaises(LodestoneScraperException) as context:
+            self.scraper.get_grand_company_ranking_pages(WORLD_NAME)
+        self.assertEqual(context.exception.status_code, 404)
+
+    @responses.activate
+    def test_no_page_fetched_raises(self):
+        register_empty_gc_pages(HOSTNAME, WORLD_NAME, start_page=1, status=503)
+
+        with self.assertLogs("ffxivbot", level="WARNING"):
+            with self.assertRaises(LodestoneScraperException):
+                self.scraper.get_grand_company_ranking_pages(WORLD_NAME)
+
+    @responses.activate
+    def test_page_missing_from_the_replayed_archive_raises(self):
+        archive = TrafficArchive(":memory:")
+        recorder = LodestoneScraper("https://" + HOSTNAME, archive=archive)
+        register_gc_pages(HOSTNAME, WORLD_NAME, [], pages=4)
+        for page_num in range(1, 5):
+            recorder._fetch_gc_rankings_page(WORLD_NAME, page_num)
+
+        archive.replay = True
+        with self.assertRaises(LodestoneScraperException) as context:
+            recorder.get_grand_company_ranking_pages(WORLD_NAME)
+        self.assertIn("not in the traffic archive", str(context.exception))
+
+    @responses.activate
+    def test_rate_limited_page_is_reported_as_missing(self):
+        register_gc_pages(HOSTNAME, WORLD_NAME, [], pages=4)
+        register_gc_page(HOSTNAME, WORLD_NAME, [], page_num=5, status=429)
+
+        with self.assertLogs("ffxivbot", level="WARNING"):
+            result = self.scraper.get_grand_company_ranking_pages(WORLD_NAME)
+        self.assertEqual(result.missing_pages, [5])
+
+    @responses.activate
+    def test_retry_fetches_only_the_requested_pages(self):
+        partial = GrandCompanyRankingPages(
+            [GrandCompanyRanking("id", "Kiryuin Satsuki", 1, 22000000)], [4]
+        )
+        page4_rankings = [GrandCompanyRanking("id4", "GC Ranking 301", 301, 1000)]
+        register_gc_page(HOSTNAME, WORLD_NAME, page4_rankings, page_num=4)
+
+        retried = self.scraper.get_grand_company_ranking_pages(WORLD_NAME, [4])
+        self.assertEqual(len(responses.calls), 1)
+        merged = partial.merge(retried)
+        self.assertTrue(merged.complete)
+        self.assertEqual(merged.rankings, partial.rankings + page4_rankings)
+
+
+def full_gc_page(page_num):
+    first_rank = (page_num - 1) * GC_RANKINGS_PER_PAGE + 1
+    return [
+        GrandCompanyRanking(f"id{rank}", f"Ranked Player{rank}", rank, 1000000 - rank)
+        for rank in range(first_rank, first_rank + GC_RANKINGS_PER_PAGE)
+    ]
+
+
+class TestBatchScrapes(LodestoneScraperTestCase):
+
+    @responses.activate
+    def test_grand_company_rankings_for_worlds(self):
+        siren = [GrandCompanyRanking("id1", "Kiryuin Satsuki", 1, 22000000)]
+        gilgamesh = [GrandCompanyRanking("id2", "Aia Merry", 1, 10000000)]
+        register_gc_pages(HOSTNAME, "Siren", siren)
+        register_gc_pages(HOSTNAME, "Gilgamesh", gilgamesh)
+
+        self.assertEqual(
+            self.scraper.get_grand_company_rankings_for_worlds(
+                ["Siren", "Gilgamesh", "Siren"]
+            ),
+            {"Siren": siren, "Gilgamesh": gilgamesh},
+        )
+        self.assertEqual(len(responses.calls), 10)
+
+    @responses.activate
+    def test_free_company_rankings_for_data_centers(self):
+        aether = [FreeCompanyRanking("1234", "Free Company 1", 1, 5000000)]
+        primal = [FreeCompanyRanking("5678", "Free Company 2", 1, 4000000)]
+        register_fc_rankings(HOSTNAME, "Aether", aether)
+        register_fc_rankings(HOSTNAME, "Primal", primal)
+
+        self.assertEqual(
+            self.scraper.get_top_100_free_company_rankings_for_data_centers(
+                ["Aether", "Primal"]
+            ),
+            {"Aether": aether, "Primal": primal},
+        )
+
+    @responses.activate
+    def test_a_failing_target_raises(self):
+        register_fc_rankings(HOSTNAME, "Aether", [])
+        register_fc_rankings(HOSTNAME, "Primal", [], status=404)
+
+        with self.assertRaises(LodestoneScraperException):
+            self.scraper.get_top_100_free_company_rankings_for_data_centers(
+                ["Aether", "Primal"]
+            )
+
+    @responses.activate
+    def test_a_failing_target_raises_once_every_target_has_finished(self):
+        finished = []
+
+        def slow_page(request):
+            time.sleep(0.05)
+            finished.append(request.url)
+            return 200, {}, fake_fc_rankings_page([])
+
+        register_fc_rankings(HOSTNAME, "Aether", [], status=404)
+        responses.add_callback(
+            responses.GET,
+            re.compile(f"https://{HOSTNAME}/lodestone/ranking/fc/weekly.*Primal.*"),
+            callback=slow_page,
+        )
+
+        with self.assertRaises(LodestoneScraperException):
+            self.scraper.get_top_100_free_company_rankings_for_data_centers(
+                ["Aether", "Primal"]
+            )
+        self.assertEqual(len(finished), 1)
+
+
+class TestFindGrandCompanyRankings(LodestoneScraperTestCase):
+
+    @responses.activate
+    def test_stops_once_every_character_is_found(self):
+        for page_num in range(1, 6):
+            register_gc_page(HOSTNAME, WORLD_NAME, full_gc_page(page_num), page_num)
+
+        rankings = self.scraper.find_grand_company_rankings(WORLD_NAME, ["id5", "id150"])
+        self.assertEqual([r.rank for r in rankings], [5, 150])
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_stops_after_a_page_that_is_not_full(self):
+        register_gc_page(HOSTNAME, WORLD_NAME, full_gc_page(1), 1)
+        register_gc_page(HOSTNAME, WORLD_NAME, full_gc_page(2)[:10], 2)
+
+        rankings = self.scraper.find_grand_company_rankings(WORLD_NAME, ["missing"])
+        self.assertEqual(rankings, [])
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_scans_every_page_for_unranked_characters(self):
+        for page_num in range(1, 6):
+            register_gc_page(HOSTNAME, WORLD_NAME, full_gc_page(page_num), page_num)
+
+        rankings = self.scraper.find_grand_company_rankings(WORLD_NAME, ["id7", "nope"])
+        self.assertEqual([r.rank for r in rankings], [7])
+        self.assertEqual(len(responses.calls), 5)
+
+
+class TestStreamingScrapes(LodestoneScraperTestCase):
+
+    @responses.activate
+    def test_iter_free_company_members_over_three_pages(self):
+        pages = [
+            [FCMember("id1", "Kiryuin Satsuki", "Big Boss")],
+            [FCMember("id2", "Aia Merry", "The Boss")],
+            [FCMember("id3", "Cirina Qalli", "Officer")],
+        ]
+        for page_num, page_members in enumerate(pages, start=1):
+            register_fc_members(HOSTNAME, FC_ID, page_members, page=page_num, max_pages=3)
+
+        self.assertListEqual(
+            list(self.scraper.iter_free_company_members(FC_ID)),
+            [member for page_members in pages for member in page_members],
+        )
+
+    @responses.activate
+    def test_iter_grand_company_rankings_in_rank_order(self):
+        page1_rankings = [GrandCompanyRanking("id", "Kiryuin Satsuki", 1, 22000000)]
+        page2_rankings = [GrandCompanyRanking("id2", "Vespertine Celeano", 2, 10000000)]
+        register_gc_page(HOSTNAME, WORLD_NAME, page1_rankings, page_num=1)
+        register_gc_page(HOSTNAME, WORLD_NAME, page2_rankings, page_num=2)
+        register_empty_gc_pages(HOSTNAME, WORLD_NAME, start_page=3, pages=5)
+
+        self.assertEqual(
+            list(self.scraper.iter_grand_company_rankings(WORLD_NAME)),
+            page1_rankings + page2_rankings,
+        )
+
+    @responses.activate
+    def test_error_states(self):
+        for status_code in [400, 404, 429, 500]:
+            responses.add(mock_fc_members_response(HOSTNAME, status_code, FC_ID))
+            responses.add(
+                mock_gc_rankings_response(HOSTNAME, status_code, WORLD_NAME, None, 1)
+            )
+            with self.assertRaises(LodestoneScraperException):
+                list(self.scraper.iter_free_company_members(FC_ID))
+            with self.assertRaises(LodestoneScraperException):
+                list(self.scraper.iter_grand_company_rankings(WORLD_NAME))
+
+
 class TestSearchFreeCompanies(LodestoneScraperTestCase):
 
     @responses.activate
@@ -161,6 +523,158 @@ class TestSearchFreeCompanies(LodestoneScraperTestCase):
                 lambda: self.scraper.search_free_companies(WORLD_NAME),
             )
 
+    @responses.activate
+    def test_every_page_is_crawled(self):
+        pages = [
+            [FreeCompany(f"{page}{i}", f"Free Company {page}{i}") for i in range(3)]
+            for page in range(1, 4)
+        ]
+        for page_num, page in enumerate(pages, start=1):
+            responses.add(
+                mock_free_companies_response(
+                    HOSTNAME, 200, WORLD_NAME, page, page=page_num, max_pages=3
+                )
+            )
+
+        self.assertEqual(
+            self.scraper.search_free_companies(WORLD_NAME),
+            [free_company for page in pages for free_company in page],
+        )
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_names_are_looked_up_in_the_index(self):
+        free_companies = [
+            FreeCompany("1", "Ül & Friends"),
+            FreeCompany("2", "Seventh Heaven"),
+            FreeCompany("3", "Seventh Dawn"),
+            FreeCompany("4", "Scions"),
+        ]
+        responses.add(
+            mock_free_companies_response(HOSTNAME, 200, WORLD_NAME, free_companies)
+        )
+
+        self.assertEqual(
+            self.scraper.complete_free_company_names(WORLD_NAME, "seventh"),
+            [free_companies[2], free_companies[1]],
+        )
+        self.assertEqual(
+            self.scraper.find_free_companies(WORLD_NAME, "ül & friends"),
+            [free_companies[0]],
+        )
+        self.assertEqual(self.scraper.find_free_companies(WORLD_NAME, "Seventh"), [])
+        self.assertEqual(len(responses.calls), 1)
+
+
+class TestGetCharacterProfiles(LodestoneScraperTestCase):
+    PROFILES = [
+        CharacterProfile(f"id{i}", f"Character Number{i}", WORLD_NAME, DATA_CENTER, FC_ID)
+        for i in range(6)
+    ]
+
+    @responses.activate
+    def test_profiles_are_fetched_concurrently(self):
+        scraper = LodestoneScraper("https://" + HOSTNAME, max_concurrency=3)
+        in_flight = 0
+        max_in_flight = 0
+        lock = threading.Lock()
+
+        def delayed_page(request):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            profile = next(p for p in self.PROFILES if p.ffxiv_id in request.url)
+            return 200, {}, fake_character_page(profile)
+
+        responses.add_callback(
+            responses.GET,
+            re.compile(f"https://{HOSTNAME}/lodestone/character/.*"),
+            callback=delayed_page,
+        )
+
+        ids = [profile.ffxiv_id for profile in self.PROFILES]
+        profiles = scraper.get_character_profiles(ids + ids[:2])
+        self.assertEqual(profiles, {p.ffxiv_id: p for p in self.PROFILES})
+        self.assertEqual(len(responses.calls), 6)
+        self.assertGreater(max_in_flight, 1)
+        self.assertLessEqual(max_in_flight, 3)
+
+    @responses.activate
+    def test_profiles_are_cached(self):
+        register_character_page(HOSTNAME, self.PROFILES[0])
+        self.scraper.get_character_profile("id0")
+        self.assertEqual(
+            self.scraper.get_character_profiles(["id0"]), {"id0": self.PROFILES[0]}
+        )
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_missing_character(self):
+        register_character_page(HOSTNAME, self.PROFILES[0], status=404)
+        with self.assertRaises(LodestoneScraperException):
+            self.scraper.get_character_profile("id0")
+
+    @responses.activate
+    def test_missing_character_is_left_out_of_the_batch(self):
+        register_character_page(HOSTNAME, self.PROFILES[0])
+        register_character_page(HOSTNAME, self.PROFILES[1], status=404)
+        register_character_page(HOSTNAME, self.PROFILES[2])
+
+        with self.assertLogs("ffxivbot", level="WARNING"):
+            profiles = self.scraper.get_character_profiles(["id0", "id1", "id2"])
+        self.assertEqual(profiles, {"id0": self.PROFILES[0], "id2": self.PROFILES[2]})
+
+
+class TestGetFreeCompanyStanding(LodestoneScraperTestCase):
+    RANKINGS = [
+        FreeCompanyRanking("other", "Other FC", 1, 5000),
+        FreeCompanyRanking(FC_ID, "Our FC", 2, 4000),
+    ]
+
+    @responses.activate
+    def test_ranked_fc_is_found_by_rank(self):
+        register_fc_page(HOSTNAME, FC_ID, 2)
+        register_fc_rankings(HOSTNAME, DATA_CENTER, self.RANKINGS)
+        self.assertEqual(
+            self.scraper.get_free_company_standing(FC_ID, DATA_CENTER), self.RANKINGS[1]
+        )
+
+    @responses.activate
+    def test_rank_out_of_step_with_the_table_falls_back_to_a_scan(self):
+        register_fc_page(HOSTNAME, FC_ID, 1)
+        register_fc_rankings(HOSTNAME, DATA_CENTER, self.RANKINGS)
+        self.assertEqual(
+            self.scraper.get_free_company_standing(FC_ID, DATA_CENTER), self.RANKINGS[1]
+        )
+
+    @responses.activate
+    def test_unranked_fc_does_not_need_the_table(self):
+        for weekly_rank in [None, 101]:
+            register_fc_page(HOSTNAME, f"{FC_ID}{weekly_rank}", weekly_rank)
+            self.assertIsNone(
+                self.scraper.get_free_company_standing(
+                    f"{FC_ID}{weekly_rank}", DATA_CENTER
+                )
+            )
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_weekly_rank_is_cached(self):
+        register_fc_page(HOSTNAME, FC_ID, 7)
+        self.assertEqual(self.scraper.get_free_company_weekly_rank(FC_ID), 7)
+        self.assertEqual(self.scraper.get_free_company_weekly_rank(FC_ID), 7)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_missing_fc(self):
+        register_fc_page(HOSTNAME, FC_ID, None, status=404)
+        with self.assertRaises(LodestoneScraperException):
+            self.scraper.get_free_company_weekly_rank(FC_ID)
+
 
 class TestGetTop100FreeCompanyRankings(LodestoneScraperTestCase):
 
@@ -183,3 +697,223 @@ class TestGetTop100FreeCompanyRankings(LodestoneScraperTestCase):
                 LodestoneScraperException,
                 lambda: self.scraper.get_top_100_free_company_rankings(DATA_CENTER),
             )
+
+
+class TestHttpCaching(unittest.TestCase):
+    def setUp(self):
+        self.http_cache = HttpCache(":memory:", max_age=300)
+
+    def scraper(self):
+        # A new scraper each time, so the in-memory result caches don't hide requests.
+        return LodestoneScraper("https://" + HOSTNAME, http_cache=self.http_cache)
+
+    @responses.activate
+    def test_fresh_pages_are_served_without_a_request(self):
+        members = [FCMember("id", "Kiryuin Satsuki", "Big Boss")]
+        register_fc_members(HOSTNAME, FC_ID, members)
+
+        self.assertListEqual(self.scraper().get_free_company_members(FC_ID), members)
+        self.assertListEqual(self.scraper().get_free_company_members(FC_ID), members)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_stale_pages_are_revalidated(self):
+        self.http_cache = HttpCache(":memory:", max_age=0)
+        members = [FCMember("id", "Kiryuin Satsuki", "Big Boss")]
+        response = mock_fc_members_response(HOSTNAME, 200, FC_ID, members=members)
+        response.headers = {"ETag": '"v1"'}
+        responses.add(response)
+        responses.add(
+            responses.GET,
+            response.url,
+            status=304,
+            match=[matchers.header_matcher({"If-None-Match": '"v1"'})],
+        )
+
+        self.assertListEqual(self.scraper().get_free_company_members(FC_ID), members)
+        self.assertListEqual(self.scraper().get_free_company_members(FC_ID), members)
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(responses.calls[1].response.status_code, 304)
+
+    @responses.activate
+    def test_refresh_revalidates_fresh_pages(self):
+        scraper = self.scraper()
+        register_gc_pages(HOSTNAME, WORLD_NAME, [])
+        scraper.get_grand_company_ranking_pages(WORLD_NAME)
+        self.assertEqual(len(responses.calls), 5)
+
+        scraper.refresh("get_grand_company_ranking_pages", WORLD_NAME)
+        self.assertEqual(len(responses.calls), 10)
+
+        # The pages the refresh stored serve the next lookup without a request.
+        scraper.get_grand_company_ranking_pages(WORLD_NAME)
+        self.assertEqual(len(responses.calls), 10)
+
+    @responses.activate
+    def test_invalidated_rankings_are_requested_again(self):
+        scraper = self.scraper()
+        register_fc_rankings(
+            HOSTNAME, DATA_CENTER, [FreeCompanyRanking(FC_ID, "Our FC", 1, 500)]
+        )
+        register_fc_rankings(
+            HOSTNAME, DATA_CENTER, [FreeCompanyRanking(FC_ID, "Our FC", 1, 800)]
+        )
+
+        self.assertEqual(
+            scraper.get_top_100_free_company_rankings(DATA_CENTER)[0].seals_earned, 500
+        )
+        scraper.invalidate_rankings()
+        self.assertEqual(
+            scraper.get_top_100_free_company_rankings(DATA_CENTER)[0].seals_earned, 800
+        )
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_errors_are_not_cached(self):
+        responses.add(mock_fc_members_response(HOSTNAME, 500, FC_ID))
+        register_fc_members(HOSTNAME, FC_ID, [])
+
+        with self.assertRaises(LodestoneScraperException):
+            self.scraper().get_free_company_members(FC_ID)
+        self.assertListEqual(self.scraper().get_free_company_members(FC_ID), [])
+
+
+class TestRateLimiting(unittest.TestCase):
+    def setUp(self):
+        # A high rate and no backoff so that the retries happen straight away.
+        self.rate_limiter = AdaptiveRateLimiter(rate=1000, max_backoff=0)
+        self.scraper = LodestoneScraper(
+            "https://" + HOSTNAME, rate_limiter=self.rate_limiter
+        )
+
+    @responses.activate
+    def test_throttled_requests_are_retried(self):
+        members = [FCMember("id", "Kiryuin Satsuki", "Big Boss")]
+        response = mock_fc_members_response(HOSTNAME, 429, FC_ID)
+        response.headers = {"Retry-After": "3"}
+        responses.add(response)
+        register_fc_members(HOSTNAME, FC_ID, members)
+
+        self.assertListEqual(self.scraper.get_free_company_members(FC_ID), members)
+        self.assertEqual(len(responses.calls), 2)
+        self.assertLess(self.rate_limiter.rate, 1000)
+
+    @responses.activate
+    def test_persistent_throttling_still_raises(self):
+        for _ in range(4):
+            responses.add(mock_fc_members_response(HOSTNAME, 429, FC_ID))
+
+        with self.assertRaises(LodestoneScraperException):
+            self.scraper.get_free_company_members(FC_ID)
+        self.assertEqual(len(responses.calls), 4)
+
+
+class TestCircuitBreaking(unittest.TestCase):
+    def setUp(self):
+        self.http_cache = HttpCache(":memory:", max_age=0)
+
+    def scraper(self, http_cache=None):
+        # The reset timeout keeps the background probe from firing during the test.
+        return LodestoneScraper(
+            "https://" + HOSTNAME,
+            http_cache=http_cache,
+            failure_threshold=2,
+            reset_timeout=3600,
+        )
+
+    @responses.activate
+    def test_repeated_server_errors_open_the_circuit(self):
+        scraper = self.scraper()
+        responses.add(mock_fc_members_response(HOSTNAME, 500, FC_ID))
+        for _ in range(2):
+            with self.assertRaises(LodestoneScraperException):
+                scraper.get_free_company_members(FC_ID)
+
+        with self.assertRaises(CircuitOpenException):
+            scraper.get_free_company_members(FC_ID)
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(scraper.circuit_states()["members"], CircuitState.OPEN)
+        self.assertEqual(scraper.circuit_states()["gc-rankings"], CircuitState.CLOSED)
+
+    @responses.activate
+    def test_open_circuit_serves_last_good_page(self):
+        members = [FCMember("id", "Kiryuin Satsuki", "Big Boss")]
+        register_fc_members(HOSTNAME, FC_ID, members)
+        self.scraper(self.http_cache).get_free_company_members(FC_ID)
+
+        responses.replace(mock_fc_members_response(HOSTNAME, 500, FC_ID))
+        scraper = self.scraper(self.http_cache)
+        for _ in range(2):
+            with self.assertRaises(LodestoneScraperException):
+                scraper.get_free_company_members(FC_ID)
+        self.assertListEqual(scraper.get_free_company_members(FC_ID), members)
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_timeouts_are_reported_as_scraper_errors(self):
+        responses.add(
+            responses.GET,
+            f"https://{HOSTNAME}/lodestone/freecompany/{FC_ID}/member",
+            body=requests.Timeout(),
+        )
+        with self.assertRaises(LodestoneScraperException):
+            self.scraper().get_free_company_members(FC_ID)
+
+
+class TestAsyncLodestoneScraper(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.scraper = AsyncLodestoneScraper(LodestoneScraper("https://" + HOSTNAME))
+
+    def tearDown(self):
+        self.scraper.close()
+
+    @responses.activate
+    async def test_get_free_company_members(self):
+        members = [FCMember("id", "Kiryuin Satsuki", "Big Boss")]
+        register_fc_members(HOSTNAME, FC_ID, members)
+        self.assertListEqual(await self.scraper.get_free_company_members(FC_ID), members)
+
+    @responses.activate
+    async def test_get_grand_company_rankings(self):
+        rankings = [GrandCompanyRanking("id", "Kiryuin Satsuki", 1, 22000000)]
+        register_gc_pages(HOSTNAME, WORLD_NAME, rankings)
+        self.assertEqual(
+            await self.scraper.get_grand_company_rankings(WORLD_NAME), rankings
+        )
+
+    @responses.activate
+    async def test_search_free_companies(self):
+        single_fc = [FreeCompany("1234", "Free Company 1")]
+        responses.add(mock_free_companies_response(HOSTNAME, 200, WORLD_NAME, single_fc))
+        self.assertEqual(await self.scraper.search_free_companies(WORLD_NAME), single_fc)
+
+    @responses.activate
+    async def test_get_top_100_free_company_rankings(self):
+        rankings = [FreeCompanyRanking("1234", "Free Company 1", 1, 5000000)]
+        register_fc_rankings(HOSTNAME, DATA_CENTER, rankings)
+        self.assertEqual(
+            await self.scraper.get_top_100_free_company_rankings(DATA_CENTER), rankings
+        )
+
+    @responses.activate
+    async def test_iter_grand_company_rankings(self):
+        rankings = [GrandCompanyRanking("id", "Kiryuin Satsuki", 1, 22000000)]
+        register_gc_pages(HOSTNAME, WORLD_NAME, rankings)
+        self.assertEqual(
+            [r async for r in self.scraper.iter_grand_company_rankings(WORLD_NAME)],
+            rankings,
+        )
+
+    @responses.activate
+    async def test_iter_free_company_members(self):
+        members = [FCMember("id", "Kiryuin Satsuki", "Big Boss")]
+        register_fc_members(HOSTNAME, FC_ID, members)
+        self.assertEqual(
+            [m async for m in self.scraper.iter_free_company_members(FC_ID)], members
+        )
+
+    @responses.activate
+    async def test_errors_are_raised_from_awaitables(self):
+        responses.add(mock_fc_members_response(HOSTNAME, 500, FC_ID))
+        with self.assertRaises(LodestoneScraperException):
+            await self.scraper.get_free_company_members(FC_ID)
@@ -0,0 +1,250 @@
+from test.fake_pages import *
+import unittest
+
+from domain import (
+    CharacterProfile,
+    FCMember,
+    FreeCompany,
+    FreeCompanyRanking,
+    GrandCompanyRanking,
+)
+from parsing import *
+
+MEMBERS = [
+    FCMember("1", "Kiryuin Satsuki", "Big Boss"),
+    FCMember("2", "Y'shtola Rhul", "Officer"),
+    FCMember("3", "Émile Lùcas", "Member"),
+]
+GC_RANKINGS = [
+    GrandCompanyRanking("1", "Kiryuin Satsuki", 1, 22000000),
+    GrandCompanyRanking("2", "Y'shtola Rhul", 2, 10000000),
+    GrandCompanyRanking("3", "Émile Lùcas", 3, 5000),
+]
+FREE_COMPANIES = [
+    FreeCompany("1234", "Free Company 1"),
+    FreeCompany("5678", "Ül & Friends"),
+]
+FC_RANKINGS = [
+    FreeCompanyRanking("1234", "Free Company 1", 1, 5000000),
+    FreeCompanyRanking("5678", "Ül & Friends", 2, 1000000),
+]
+
+
+class TestPageParserBackends(unittest.TestCase):
+    def setUp(self):
+        self.parsers = [get_page_parser(name) for name in PARSER_BACKENDS]
+
+    def test_members_page(self):
+        body = fake_members_page(MEMBERS, page=2, max_pages=12).encode()
+        for parser in self.parsers:
+            with self.subTest(parser=parser.name):
+                self.assertEqual(parser.parse_members_page(body), (MEMBERS, 12))
+
+    def test_members_page_without_pager(self):
+        body = "".join(fake_member_entry(member) for member in MEMBERS).encode()
+        for parser in self.parsers:
+            with self.subTest(parser=parser.name):
+                self.assertEqual(parser.parse_members_page(body), (MEMBERS, None))
+
+    def test_invalid_character_link(self):
+        body = fake_members_page([FCMember("", "Nobody", "Member")]).encode()
+        for parser in self.parsers:
+            with self.subTest(parser=parser.name):
+                with self.assertRaises(LodestoneScraperException):
+                    parser.parse_members_page(body)
+
+    def test_gc_rankings_page(self):
+        body = fake_gc_rankings_page(GC_RANKINGS).encode()
+        for parser in self.parsers:
+            with self.subTest(parser=parser.name):
+                self.assertEqual(parser.parse_gc_rankings_page(body), GC_RANKINGS)
+
+    def test_free_companies_page(self):
+        body = fake_free_companies_page(FREE_COMPANIES, "Siren", max_pages=7).encode()
+        for parser in self.parsers:
+            with self.subTest(parser=parser.name):
+                self.assertEqual(
+                    parser.parse_free_companies_page(body), (FREE_COMPANIES, 7)
+                )
+
+    def test_free_companies_page_without_pager(self):
+        body = fake_free_companies_page(FREE_COMPANIES, "Siren").encode()
+        for parser in self.parsers:
+            with self.subTest(parser=parser.name):
+                self.assertEqual(
+                    parser.parse_free_companies_page(body), (FREE_COMPANIES, None)
+                )
+
+    def test_fc_rankings_page(self):
+        body = fake_fc_rankings_page(FC_RANKINGS).encode()
+        for parser in self.parsers:
+            with self.subTest(parser=parser.name):
+                self.assertEqual(parser.parse_fc_rankings_page(body), FC_RANKINGS)
+
+    def test_fc_weekly_rank(self):
+        for weekly_rank in [None, 1, 1234]:
+            body = fake_lodestone_document(
+                fake_free_company_page("Free Company 1", weekly_rank, monthly_rank=7)
+            ).encode()
+            for parser in self.parsers:
+                with self.subTest(parser=parser.name, weekly_rank=weekly_rank):
+                    self.assertEqual(parser.parse_fc_weekly_rank(body), weekly_rank)
+
+    def test_fc_page_without_ranking(self):
+        for parser in self.parsers:
+            with self.subTest(parser=parser.name):
+                with self.assertRaises(LodestoneScraperException):
+                    parser.parse_fc_weekly_rank(fake_lodestone_document("").encode())
+
+    def test_character_page(self):
+        profiles = [
+            CharacterProfile("1", "Kiryuin Satsuki", "Siren", "Aether", "1234"),
+            CharacterProfile("2", "Émile Lùcas", "Cactuar", "Aether", None),
+        ]
+        for profile in profiles:
+            body = fake_lodestone_document(fake_character_page(profile)).encode()
+            for parser in self.parsers:
+                with self.subTest(parser=parser.name, profile=profile.name):
+                    self.assertEqual(
+                        parser.parse_character_page(body), CharacterPage(*profile[1:])
+                    )
+
+    def test_character_page_without_a_character(self):
+        for parser in self.parsers:
+            with self.subTest(parser=parser.name):
+                with self.assertRaises(LodestoneScraperException):
+                    parser.parse_character_page(fake_lodestone_document("").encode())
+
+    def test_surrounding_page_markup_is_ignored(self):
+        pages = {
+            "parse_members_page": (fake_members_page(MEMBERS), (MEMBERS, 1)),
+            "parse_gc_rankings_page": (fake_gc_rankings_page(GC_RANKINGS), GC_RANKINGS),
+            "parse_free_companies_page": (
+                fake_free_companies_page(FREE_COMPANIES, "Siren", max_pages=2),
+                (FREE_COMPANIES, 2),
+            ),
+            "parse_fc_rankings_page": (fake_fc_rankings_page(FC_RANKINGS), FC_RANKINGS),
+        }
+        for method, (content, expected) in pages.items():
+            body = fake_lodestone_document(content).encode()
+            for parser in self.parsers:
+                with self.subTest(parser=parser.name, method=method):
+                    self.assertEqual(getattr(parser, method)(body), expected)
+
+    def test_empty_pages(self):
+        for parser in self.parsers:
+            with self.subTest(parser=parser.name):
+                self.assertEqual(parser.parse_members_page(b""), ([], None))
+                self.assertEqual(parser.parse_gc_rankings_page(b""), [])
+                self.assertEqual(parser.parse_free_companies_page(b""), ([], None))
+                with self.assertRaises(LodestoneScraperException):
+                    parser.parse_fc_rankings_page(b"")
+                with self.assertRaises(LodestoneScraperException):
+                    parser.parse_fc_rankings_page(fake_lodestone_document("").encode())
+                self.assertEqual(
+                    parser.parse_fc_rankings_page(fake_fc_rankings_page([]).encode()), []
+                )
+
+
+def chunked(body: bytes, chunk_size: int):
+    return [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+
+
+class TestIncrementalParsing(unittest.TestCase):
+    def setUp(self):
+        self.parsers = [get_page_parser(name) for name in PARSER_BACKENDS]
+
+    def test_records_do_not_depend_on_chunk_boundaries(self):
+        members_body = fake_members_page(MEMBERS, max_pages=3).encode()
+        gc_body = fake_gc_rankings_page(GC_RANKINGS).encode()
+        for parser in self.parsers:
+            for chunk_size in [1, 7, 4096]:
+                with self.subTest(parser=parser.name, chunk_size=chunk_size):
+                    rows = parser.iter_members_page(chunked(members_body, chunk_size))
+                    members = []
+                    while True:
+                        try:
+                            members.append(next(rows))
+                        except StopIteration as stop:
+                            num_pages = stop.value
+                            break
+                    self.assertEqual((members, num_pages), (MEMBERS, 3))
+                    self.assertEqual(
+                        list(parser.iter_gc_rankings_page(chunked(gc_body, chunk_size))),
+                        GC_RANKINGS,
+                    )
+
+    def test_lxml_yields_rows_before_the_body_is_complete(self):
+        parser = get_page_parser("lxml")
+        chunks = chunked(fake_gc_rankings_page(GC_RANKINGS).encode(), 256)
+        consumed = 0
+
+        def feed():
+            nonlocal consumed
+            for chunk in chunks:
+                consumed += 1
+                yield chunk
+
+        next(parser.iter_gc_rankings_page(feed()))
+        self.assertLess(consumed, len(chunks))
+
+
+class TestMemoizedPageParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = MemoizedPageParser(get_page_parser("lxml"), maxsize=2)
+
+    def test_identical_bodies_are_parsed_once(self):
+        body = fake_gc_rankings_page(GC_RANKINGS).encode()
+        self.assertEqual(self.parser.parse_gc_rankings_page(body), GC_RANKINGS)
+        self.assertEqual(self.parser.parse_gc_rankings_page(body), GC_RANKINGS)
+        self.assertEqual(self.parser.stats(), MemoStats(hits=1, misses=1, size=1))
+
+    def test_changed_bodies_are_parsed_again(self):
+        self.parser.parse_fc_rankings_page(fake_fc_rankings_page(FC_RANKINGS).encode())
+        self.parser.parse_fc_rankings_page(
+            fake_fc_rankings_page(FC_RANKINGS[:1]).encode()
+        )
+        self.assertEqual(self.parser.stats(), MemoStats(hits=0, misses=2, size=2))
+
+    def test_members_page_keeps_the_page_count(self):
+        body = fake_members_page(MEMBERS, page=1, max_pages=3).encode()
+        self.parser.parse_members_page(body)
+        self.assertEqual(self.parser.parse_members_page(body), (MEMBERS, 3))
+
+    def test_returned_lists_are_copies(self):
+        body = fake_free_companies_page(FREE_COMPANIES, "Cactuar").encode()
+        self.parser.parse_free_companies_page(body).free_companies.clear()
+        self.assertEqual(
+            self.parser.parse_free_companies_page(body).free_companies, FREE_COMPANIES
+        )
+
+
+class TestProcessPoolPageParser(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = ProcessPoolPageParser("lxml", processes=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.parser.close()
+
+    def test_pages_are_parsed_in_a_worker(self):
+        members = fake_members_page(MEMBERS, page=1, max_pages=4).encode()
+        self.assertEqual(self.parser.parse_members_page(members), (MEMBERS, 4))
+        rankings = fake_gc_rankings_page(GC_RANKINGS).encode()
+        self.assertEqual(self.parser.parse_gc_rankings_page(rankings), GC_RANKINGS)
+
+    def test_parse_errors_reach_the_caller(self):
+        body = fake_members_page([FCMember("", "Nobody", "Member")]).encode()
+        with self.assertRaises(LodestoneScraperException):
+            self.parser.parse_members_page(body)
+
+
+class TestGetPageParser(unittest.TestCase):
+    def test_known_backends(self):
+        for name in PARSER_BACKENDS:
+            self.assertEqual(get_page_parser(name).name, name)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_page_parser("regex")
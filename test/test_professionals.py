@@ -1,16 +1,20 @@
 from test.request_mocking import (
+    register_empty_gc_pages,
     register_fc_member_for,
     register_fc_member_for_participant,
     register_fc_members,
+    register_fc_page,
     register_fc_rankings,
+    register_gc_page,
     register_gc_pages,
 )
 import unittest
 
 import responses
 
+from deadlines import deadline
 from domain import GrandCompanyRanking, HonorableMention, WinReason
-from lodestone import LodestoneScraper
+from lodestone import AsyncLodestoneScraper, LodestoneScraper
 import professionals
 from professionals import *
 
@@ -183,7 +187,9 @@ class TestValidateContractInput(unittest.TestCase):
 class TestParticipation(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         self.db = SqlLiteClient(":memory:")
-        self.lodestone = LodestoneScraper("https://fake.lodestone.test")
+        self.lodestone = AsyncLodestoneScraper(
+            LodestoneScraper("https://fake.lodestone.test")
+        )
         initialize(self.db, self.lodestone)
 
     @responses.activate
@@ -247,6 +253,18 @@ class TestParticipation(unittest.IsolatedAsyncioTestCase):
                 default_discord_id, default_first_name, default_last_name
             )
 
+    @responses.activate
+    async def test_nothing_is_stored_past_the_deadline(self):
+        participant = default_participant()
+        register_fc_member_for_participant("fake.lodestone.test", participant)
+        with deadline(0):
+            with self.assertRaises(DeadlineExceededException):
+                await participate_as_player(
+                    participant.discord_id, participant.first_name, participant.last_name
+                )
+        self.assertIsNone(self.db.get_participant(participant.discord_id))
+        self.assertEqual(len(responses.calls), 0)
+
     @responses.activate
     async def test_should_end_participation(self):
         participant = default_participant()
@@ -262,7 +280,9 @@ class TestParticipation(unittest.IsolatedAsyncioTestCase):
 class TestCreateContract(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         self.db = SqlLiteClient(":memory:")
-        self.lodestone = LodestoneScraper("https://fake.lodestone.test")
+        self.lodestone = AsyncLodestoneScraper(
+            LodestoneScraper("https://fake.lodestone.test")
+        )
         initialize(self.db, self.lodestone)
 
     @responses.activate
@@ -381,7 +401,7 @@ class TestGetCompetitionResults(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
         self.db = SqlLiteClient(":memory:")
-        self.lodestone = LodestoneScraper(self.BASE_URL)
+        self.lodestone = AsyncLodestoneScraper(LodestoneScraper(self.BASE_URL))
         initialize(self.db, self.lodestone)
 
     def setup_gc_rankings(self, rankings=[]):
@@ -714,6 +734,225 @@ class TestGetCompetitionResults(unittest.IsolatedAsyncioTestCase):
         )
         self.assertEqual(playerB_entry.seals_earned, 30)
 
+    @responses.activate
+    async def test_should_mark_unverified_ranks_and_retry_only_missing_pages(self):
+        ranked = default_participant()
+        unranked = default_participant(
+            discord_id=987654321098765432, first_name="Another", last_name="Player"
+        )
+        for participant in [ranked, unranked]:
+            self.db.insert_participant(participant)
+        self.db.insert_contract(default_contract(discord_id=unranked.discord_id))
+        register_fc_members(
+            self.HOSTNAME,
+            professionals._config.free_company_id,
+            [
+                FCMember("123", f"{ranked.first_name} {ranked.last_name}", "Member"),
+                FCMember("456", f"{unranked.first_name} {unranked.last_name}", "Member"),
+            ],
+        )
+        # The first request for page 3 fails; the retry gets the page registered after.
+        register_gc_page(self.HOSTNAME, "Siren", [], page_num=3, status=500)
+        register_gc_pages(
+            self.HOSTNAME,
+            "Siren",
+            [GrandCompanyRanking("123", "Juhdu Khigbaa", 1, 500000)],
+        )
+
+        results = await self.wait_for_results()
+        self.assertEqual(results.unverified_ranks, [range(201, 301)])
+        scores = {p.discord_id: p for p in results.player_scores}
+        self.assertTrue(scores[ranked.discord_id].rank_verified)
+        self.assertFalse(scores[unranked.discord_id].rank_verified)
+        self.assertIsNone(results.competition_winner)
+        self.assertIsNone(results.drawing_winner)
+        self.assertEqual(results.competition_win_reason, WinReason.RANKINGS_INCOMPLETE)
+        self.assertEqual(results.drawing_win_reason, WinReason.RANKINGS_INCOMPLETE)
+        self.assertTrue(results.contract_results[0].is_pending)
+
+        results = await self.wait_for_results()
+        self.assertEqual(results.unverified_ranks, [])
+        scores = {p.discord_id: p for p in results.player_scores}
+        self.assertEqual(scores[ranked.discord_id].seals_earned, 500000)
+        self.assertTrue(scores[unranked.discord_id].rank_verified)
+        self.assertEqual(results.competition_winner.discord_id, ranked.discord_id)
+        self.assertFalse(results.contract_results[0].is_pending)
+        requested_pages = [
+            call.request.params.get("page")
+            for call in responses.calls
+            if "/ranking/gc/" in call.request.url
+        ]
+        self.assertEqual(sorted(requested_pages), ["1", "2", "3", "3", "4", "5"])
+
+    @responses.activate
+    async def test_should_refetch_every_page_once_partial_rankings_are_old(self):
+        participant = default_participant()
+        self.db.insert_participant(participant)
+        register_fc_members(
+            self.HOSTNAME,
+            professionals._config.free_company_id,
+            [FCMember("123", "Juhdu Khigbaa", "Member")],
+        )
+        register_gc_page(
+            self.HOSTNAME, "Siren", [GrandCompanyRanking("123", "Juhdu Khigbaa", 1, 500)]
+        )
+        register_empty_gc_pages(self.HOSTNAME, "Siren", start_page=2, pages=2)
+        register_gc_page(self.HOSTNAME, "Siren", [], page_num=3, status=500)
+        register_empty_gc_pages(self.HOSTNAME, "Siren", start_page=4)
+        results = await self.wait_for_results()
+        self.assertEqual(results.unverified_ranks, [range(201, 301)])
+
+        # By the retry, the player has dropped from page 1 to page 3.
+        professionals._partial_gc_rankings_fetched_at -= (
+            professionals.PARTIAL_GC_RANKINGS_MAX_AGE + 1
+        )
+        register_empty_gc_pages(self.HOSTNAME, "Siren", start_page=1, pages=2)
+        register_gc_page(
+            self.HOSTNAME,
+            "Siren",
+            [GrandCompanyRanking("123", "Juhdu Khigbaa", 201, 500)],
+            page_num=3,
+        )
+        register_empty_gc_pages(self.HOSTNAME, "Siren", start_page=4)
+
+        results = await self.wait_for_results()
+        self.assertEqual(results.unverified_ranks, [])
+        self.assertEqual(results.player_scores[0].rank, 201)
+        self.assertEqual(results.player_scores[0].seals_earned, 500)
+
+
+class TestGetWeeklyStanding(unittest.IsolatedAsyncioTestCase):
+    HOSTNAME = "fake.lodestone.test"
+
+    def setUp(self):
+        self.db = SqlLiteClient(":memory:")
+        self.lodestone = AsyncLodestoneScraper(
+            LodestoneScraper(f"https://{self.HOSTNAME}")
+        )
+        initialize(self.db, self.lodestone)
+
+    @responses.activate
+    async def test_should_return_ranking_of_participant(self):
+        participant = default_participant()
+        register_fc_members(
+            self.HOSTNAME,
+            professionals._config.free_company_id,
+            [FCMember("123", default_name, "Member")],
+        )
+        register_gc_pages(
+            self.HOSTNAME,
+            "Siren",
+            [
+                GrandCompanyRanking("456", "Someone Else", 1, 900000),
+                GrandCompanyRanking("123", default_name, 2, 500000),
+            ],
+        )
+
+        standing = await get_weekly_standing(participant)
+        self.assertEqual(standing, GrandCompanyRanking("123", default_name, 2, 500000))
+
+    @responses.activate
+    async def test_should_return_none_when_unranked(self):
+        register_fc_members(
+            self.HOSTNAME,
+            professionals._config.free_company_id,
+            [FCMember("123", default_name, "Member")],
+        )
+        register_gc_pages(self.HOSTNAME, "Siren", [])
+        self.assertIsNone(await get_weekly_standing(default_participant()))
+
+    @responses.activate
+    async def test_should_raise_when_not_an_fc_member(self):
+        register_fc_members(
+            self.HOSTNAME,
+            professionals._config.free_company_id,
+            [FCMember("456", "Someone Else", "Member")],
+        )
+        with self.assertRaises(professionals.UserException):
+            await get_weekly_standing(default_participant())
+        self.assertFalse(
+            any("/ranking/gc/" in call.request.url for call in responses.calls)
+        )
+
+
+class TestRosterDiff(unittest.TestCase):
+    def test_joined_left_and_rank_changed(self):
+        stays = FCMember("1", "Kiryuin Satsuki", "Big Boss")
+        promoted = FCMember("2", "Y'shtola Rhul", "Member")
+        leaves = FCMember("3", "Émile Lùcas", "Member")
+        joins = FCMember("4", "Thancred Waters", "Member")
+
+        diff = RosterDiff.between(
+            [stays, promoted, leaves], [joins, promoted._replace(rank="Officer"), stays]
+        )
+        self.assertEqual(diff.joined, [joins])
+        self.assertEqual(diff.left, [leaves])
+        self.assertEqual(
+            diff.rank_changed, [RankChange(promoted._replace(rank="Officer"), "Member")]
+        )
+        self.assertEqual(diff.renamed, [])
+        self.assertTrue(diff.changed)
+        self.assertFalse(RosterDiff.between([stays], [stays]).changed)
+
+    def test_renamed(self):
+        member = FCMember("1", "Kiryuin Satsuki", "Big Boss")
+        renamed = member._replace(name="Kiryuin Ragyo")
+
+        diff = RosterDiff.between([member], [renamed])
+        self.assertEqual(diff.renamed, [NameChange(renamed, "Kiryuin Satsuki")])
+        self.assertEqual(diff.rank_changed, [])
+        self.assertTrue(diff.changed)
+
+
+class TestSyncRoster(unittest.IsolatedAsyncioTestCase):
+    HOSTNAME = "fake.lodestone.test"
+
+    def setUp(self):
+        self.db = SqlLiteClient(":memory:")
+        self.fc_id = professionals._config.free_company_id
+        self.member = FCMember("1", f"{default_first_name} {default_last_name}", "Member")
+        self.leader = FCMember("2", "Kiryuin Satsuki", "Big Boss")
+
+    async def sync(self, members):
+        # A new scraper each time, so the cached roster doesn't hide the change.
+        initialize(
+            self.db, AsyncLodestoneScraper(LodestoneScraper(f"https://{self.HOSTNAME}"))
+        )
+        register_fc_members(self.HOSTNAME, self.fc_id, members)
+        return await sync_roster()
+
+    @responses.activate
+    async def test_should_drop_participants_who_left(self):
+        self.db.insert_participant(default_participant())
+        self.db.insert_contract(default_contract())
+        await self.sync([self.member, self.leader])
+
+        diff, dropped = await self.sync([self.leader])
+        self.assertEqual(diff.left, [self.member])
+        self.assertEqual(dropped, [default_participant()])
+        self.assertEqual(self.db.get_all_participants(), [])
+        self.assertEqual(self.db.get_all_contracts(), [])
+        self.assertEqual(self.db.get_fc_roster(self.fc_id), [self.leader])
+
+    @responses.activate
+    async def test_should_drop_participants_who_left_after_a_rename(self):
+        self.db.insert_participant(default_participant())
+        await self.sync([self.member._replace(name="Old Name"), self.leader])
+        await self.sync([self.member, self.leader])
+        self.assertIn(self.member, self.db.get_fc_roster(self.fc_id))
+
+        diff, dropped = await self.sync([self.leader])
+        self.assertEqual(diff.left, [self.member])
+        self.assertEqual(dropped, [default_participant()])
+
+    @responses.activate
+    async def test_unchanged_roster_writes_nothing(self):
+        await self.sync([self.member])
+        diff, dropped = await self.sync([self.member])
+        self.assertFalse(diff.changed)
+        self.assertEqual(dropped, [])
+        self.assertEqual(len(self.db.get_roster_changes(self.fc_id)), 1)
+
 
 class TestStartCompetition(unittest.IsolatedAsyncioTestCase):
     HOSTNAME = "fake.lodestone.test"
@@ -721,11 +960,12 @@ class TestStartCompetition(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
         self.db = SqlLiteClient(":memory:")
-        self.lodestone = LodestoneScraper(self.BASE_URL)
+        self.lodestone = AsyncLodestoneScraper(LodestoneScraper(self.BASE_URL))
         initialize(self.db, self.lodestone)
 
     @responses.activate
     async def test_happy_path(self):
+        register_fc_page(self.HOSTNAME, professionals._config.free_company_id, 2)
         register_fc_rankings(
             "fake.lodestone.test",
             "Aether",
@@ -749,3 +989,26 @@ class TestStartCompetition(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(last_week_seals, 900)
         self.assertEqual(self.db.get_all_contracts(), [])
         self.assertEqual(self.db.get_all_participants(), [])
+
+    @responses.activate
+    async def test_should_not_reuse_rankings_cached_last_week(self):
+        our_fc_id = professionals._config.free_company_id
+        register_fc_rankings(
+            self.HOSTNAME, "Aether", [FreeCompanyRanking(our_fc_id, "FC", 1, 500)]
+        )
+        register_fc_rankings(
+            self.HOSTNAME, "Aether", [FreeCompanyRanking(our_fc_id, "FC", 1, 900)]
+        )
+        register_fc_page(self.HOSTNAME, our_fc_id, 1)
+        await self.lodestone.get_top_100_free_company_rankings("Aether")
+
+        self.assertEqual(await professionals.start_new_competition(), 900)
+
+    @responses.activate
+    async def test_fc_outside_the_top_100_skips_the_ranking_table(self):
+        register_fc_page(self.HOSTNAME, professionals._config.free_company_id, 312)
+        self.db.insert_participant(default_participant())
+
+        self.assertEqual(await professionals.start_new_competition(), 0)
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(self.db.get_all_participants(), [])
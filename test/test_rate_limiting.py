@@ -0,0 +1,127 @@
+from datetime import datetime, timezone
+import io
+import unittest
+
+import requests
+
+from rate_limiting import *
+
+
+class FakeClock:
+    """Timer whose sleep() simply advances time, recording every sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def timer(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def fake_response(status_code: int, headers: dict = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(b"")
+    return response
+
+
+class RateLimiterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def limiter(self, **kwargs) -> AdaptiveRateLimiter:
+        kwargs.setdefault("timer", self.clock.timer)
+        kwargs.setdefault("sleep", self.clock.sleep)
+        kwargs.setdefault("jitter", lambda low, high: high)
+        return AdaptiveRateLimiter(**kwargs)
+
+    def send_all(self, limiter, responses):
+        pending = iter(responses)
+        return limiter.send(lambda: next(pending))
+
+
+class TestTokenBucket(RateLimiterTestCase):
+    def test_burst_is_sent_without_waiting(self):
+        limiter = self.limiter(rate=2, burst=3)
+        for _ in range(3):
+            limiter.acquire()
+        self.assertEqual(self.clock.now, 0)
+
+    def test_requests_past_the_burst_are_spaced_by_the_rate(self):
+        limiter = self.limiter(rate=2, burst=1)
+        for _ in range(5):
+            limiter.acquire()
+        self.assertAlmostEqual(self.clock.now, 2.0)
+
+    def test_throttling_halves_the_rate_down_to_the_minimum(self):
+        limiter = self.limiter(rate=4, min_rate=1.5)
+        limiter.throttled()
+        self.assertEqual(limiter.rate, 2)
+        limiter.throttled()
+        self.assertEqual(limiter.rate, 1.5)
+
+    def test_successes_recover_the_rate_up_to_the_maximum(self):
+        limiter = self.limiter(rate=4, rate_increase=1)
+        limiter.throttled()
+        for _ in range(5):
+            limiter.succeeded()
+        self.assertEqual(limiter.rate, 4)
+
+    def test_pause_holds_back_every_request(self):
+        limiter = self.limiter(max_backoff=10)
+        limiter.pause(4)
+        limiter.acquire()
+        self.assertEqual(self.clock.now, 4)
+        limiter.pause(60)
+        limiter.acquire()
+        self.assertEqual(self.clock.now, 14)
+
+
+class TestSend(RateLimiterTestCase):
+    def test_success_is_returned_immediately(self):
+        response = self.send_all(self.limiter(), [fake_response(200)])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_client_errors_are_not_retried(self):
+        response = self.send_all(self.limiter(), [fake_response(404)])
+        self.assertEqual(response.status_code, 404)
+
+    def test_retry_after_is_honored(self):
+        limiter = self.limiter(rate=4)
+        response = self.send_all(
+            limiter, [fake_response(429, {"Retry-After": "7"}), fake_response(200)]
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(self.clock.now, 7)
+        self.assertLess(limiter.rate, 4)
+
+    def test_server_errors_back_off_exponentially(self):
+        limiter = self.limiter(max_retries=3, backoff_base=0.5)
+        response = self.send_all(limiter, [fake_response(500)] * 3 + [fake_response(200)])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.clock.sleeps, [0.5, 1.0, 2.0])
+
+    def test_last_response_is_returned_when_retries_run_out(self):
+        response = self.send_all(
+            self.limiter(max_retries=2), [fake_response(502)] * 2 + [fake_response(503)]
+        )
+        self.assertEqual(response.status_code, 503)
+
+
+class TestParseRetryAfter(unittest.TestCase):
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after("120"), 120)
+
+    def test_http_date(self):
+        now = datetime(2024, 10, 1, 12, 0, 0, tzinfo=timezone.utc)
+        self.assertEqual(parse_retry_after("Tue, 01 Oct 2024 12:00:30 GMT", now), 30)
+
+    def test_missing_or_invalid(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
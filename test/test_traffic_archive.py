@@ -0,0 +1,69 @@
+from test.request_mocking import *
+import unittest
+
+import requests
+import responses
+
+from domain import FCMember, GrandCompanyRanking, LodestoneScraperException
+from lodestone import LodestoneScraper
+from traffic_archive import *
+
+HOSTNAME = "some.lodestone.url.com"
+MEMBERS = [FCMember("1", "Kiryuin Satsuki", "Big Boss")]
+RANKINGS = [GrandCompanyRanking("1", "Kiryuin Satsuki", 1, 22000000)]
+
+
+class TestTrafficArchive(unittest.TestCase):
+    def setUp(self):
+        self.archive = TrafficArchive(":memory:")
+
+    def scraper(self) -> LodestoneScraper:
+        return LodestoneScraper("https://" + HOSTNAME, archive=self.archive)
+
+    @responses.activate
+    def test_recorded_pages_are_replayed_without_the_network(self):
+        register_fc_members(HOSTNAME, "fc", MEMBERS)
+        register_gc_pages(HOSTNAME, "Siren", RANKINGS)
+        self.assertEqual(self.scraper().get_free_company_members("fc"), MEMBERS)
+        self.assertEqual(
+            list(self.scraper().iter_grand_company_rankings("Siren")), RANKINGS
+        )
+        calls = len(responses.calls)
+
+        self.archive.replay = True
+        self.assertEqual(self.scraper().get_free_company_members("fc"), MEMBERS)
+        self.assertEqual(
+            list(self.scraper().iter_grand_company_rankings("Siren")), RANKINGS
+        )
+        self.assertEqual(len(responses.calls), calls)
+
+    @responses.activate
+    def test_status_headers_and_timing_are_recorded(self):
+        register_fc_members(HOSTNAME, "fc", MEMBERS)
+        self.scraper().get_free_company_members("fc")
+
+        archived = self.archive.get(f"https://{HOSTNAME}/lodestone/freecompany/fc/member")
+        self.assertEqual(archived.status, 200)
+        self.assertIn("Content-Type", archived.headers)
+        self.assertIn(b"Kiryuin Satsuki", archived.body)
+        self.assertGreaterEqual(archived.elapsed, 0)
+
+    def test_replaying_an_unrecorded_page_fails(self):
+        self.archive.replay = True
+        with self.assertRaises(LodestoneScraperException):
+            self.scraper().get_free_company_members("fc")
+
+    def test_replay_can_take_as_long_as_the_recording(self):
+        sleeps = []
+        archive = TrafficArchive(
+            ":memory:", replay=True, simulate_latency=True, sleep=sleeps.append
+        )
+        response = requests.Response()
+        response.status_code = 503
+        response._content = b""
+        archive.record("https://lodestone/page", response, elapsed=1.5)
+
+        self.assertEqual(
+            archive.replay_response("https://lodestone/page").status_code, 503
+        )
+        self.assertEqual(sleeps, [1.5])
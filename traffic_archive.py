@@ -0,0 +1,128 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+import zlib
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from domain import LodestoneScraperException
+
+ARCHIVE_DB_FILE = "lodestone_archive.db"
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS archived_responses (
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    elapsed REAL NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (url)
+);
+"""
+
+
+class ArchivedResponse(NamedTuple):
+    url: str
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    elapsed: float
+    recorded_at: float
+
+    def to_response(self) -> requests.Response:
+        response = requests.Response()
+        response.url = self.url
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response._content_consumed = True
+        return response
+
+
+class TrafficArchive:
+    """Local archive of the pages the scraper fetched, for debugging and benchmarks.
+
+    While recording, every page handed to the parser is stored along with its status,
+    headers and how long it took to get. While replaying, the scraper is served from
+    the archive alone and never touches the network, so a past run, such as the
+    competition results of an earlier week, can be reproduced exactly. Bodies are
+    stored zlib-compressed; a URL fetched more than once keeps its latest response.
+    """
+
+    def __init__(
+        self,
+        source: str = ARCHIVE_DB_FILE,
+        replay: bool = False,
+        simulate_latency: bool = False,
+        timer=time.time,
+        sleep=time.sleep,
+    ):
+        self.connection = sqlite3.connect(source, check_same_thread=False)
+        self.cursor = self.connection.cursor()
+        self.cursor.executescript(SCHEMA)
+        self.connection.commit()
+        self.replay = replay
+        self._simulate_latency = simulate_latency
+        self._timer = timer
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> ArchivedResponse | None:
+        with self._lock:
+            self.cursor.execute(
+                """
+                SELECT url, status, headers, body, elapsed, recorded_at
+                FROM archived_responses
+                WHERE url = ?
+                """,
+                (url,),
+            )
+            row = self.cursor.fetchone()
+        if row is None:
+            return None
+        url, status, headers, body, elapsed, recorded_at = row
+        return ArchivedResponse(
+            url, status, json.loads(headers), zlib.decompress(body), elapsed, recorded_at
+        )
+
+    def record(self, url: str, response: requests.Response, elapsed: float) -> None:
+        # Reading the content buffers a streamed body; requests then streams it from
+        # memory, so the parser still gets it in chunks.
+        body = response.content
+        with self._lock:
+            self.cursor.execute(
+                """
+                INSERT OR REPLACE INTO archived_responses
+                    (url, status, headers, body, elapsed, recorded_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    url,
+                    response.status_code,
+                    json.dumps(dict(response.headers)),
+                    zlib.compress(body),
+                    elapsed,
+                    self._timer(),
+                ),
+            )
+            self.connection.commit()
+
+    def replay_response(self, url: str) -> requests.Response:
+        archived = self.get(url)
+        if archived is None:
+            raise LodestoneScraperException(f"{url} is not in the traffic archive")
+        if self._simulate_latency:
+            self._sleep(archived.elapsed)
+        return archived.to_response()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.cursor.execute(
+                """
+                DELETE FROM archived_responses
+                """
+            )
+            self.connection.commit()